@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from protocol import FrameDecoder, encode_frame
+from .log_config import kv
+
+logger = logging.getLogger(__name__)
+
+
+def socket_path(bus_dir, worker_id):
+    """워커 하나가 메시지를 받는 Unix 소켓 경로"""
+    return os.path.join(bus_dir, f"worker-{worker_id}.sock")
+
+
+class PeerLink:
+    """다른 워커 하나로 보내는 연결 (큐에 넣고 바로 반환, 전송은 백그라운드 작업이 순서대로)"""
+    __slots__ = ("path", "queue", "ready", "task", "writer")
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = deque()
+        self.ready = asyncio.Event()
+        self.task = None
+        self.writer = None
+
+
+class LocalBus:
+    """같은 호스트의 워커 프로세스끼리 메시지를 주고받는 버스
+
+    워커마다 Unix 소켓을 하나 열고, 보내는 쪽이 다른 모든 워커의 소켓으로 같은 메시지를 보낸다.
+    메시지는 {"type": ..., 필드...} JSON 을 클라이언트와 같은 길이 접두 프레임으로 인코딩한다.
+    """
+    def __init__(self, bus_dir, worker_id, workers, max_pending=10000, retry_interval=0.2):
+        self.worker_id = worker_id
+        self.path = socket_path(bus_dir, worker_id)
+        self.max_pending = max_pending        # 워커 하나당 보내지 못하고 쌓아둘 최대 메시지 수
+        self.retry_interval = retry_interval  # 상대 워커가 아직 뜨지 않았거나 끊겼을 때 재접속 간격
+        self.links = {i: PeerLink(socket_path(bus_dir, i)) for i in range(workers) if i != worker_id}
+        self.handlers = {}  # 메시지 type -> 처리 함수 (필드를 키워드 인자로 받음)
+        self.server = None
+        self.metrics = {
+            "sent": 0,        # 다른 워커로 보낸 메시지 수
+            "received": 0,    # 받은 메시지 수
+            "dropped": 0,     # 큐가 가득 차서 버린 수
+            "reconnects": 0,  # 다시 연결한 수
+        }
+
+    def subscribe(self, message_type, handler):
+        self.handlers[message_type] = handler
+
+    async def start(self):
+        """받는 소켓 열기 (이전 실행에서 남은 소켓 파일은 지움)"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._handle_peer, path=self.path)
+        logger.info("bus started", extra=kv(worker=self.worker_id, path=self.path))
+
+    def publish(self, message_type, **fields):
+        """다른 모든 워커로 메시지 전송 (기다리지 않음)"""
+        data = encode_frame(json.dumps({"type": message_type, **fields}, ensure_ascii=False))
+        for link in self.links.values():
+            if len(link.queue) >= self.max_pending:
+                link.queue.popleft()
+                self.metrics["dropped"] += 1
+            link.queue.append(data)
+            if link.task is None:
+                link.task = asyncio.create_task(self._run(link))
+            link.ready.set()
+
+    async def _run(self, link):
+        """워커 하나로 큐의 메시지를 순서대로 전송 (연결이 끊기면 다시 연결)"""
+        while True:
+            await link.ready.wait()
+            link.ready.clear()
+            while link.queue:
+                try:
+                    if link.writer is None:
+                        _, link.writer = await asyncio.open_unix_connection(link.path)
+                    data = link.queue[0]
+                    link.writer.write(data)
+                    await link.writer.drain()
+                except OSError:
+                    # 상대 워커가 아직 시작 전이거나 재시작 중: 잠시 뒤 같은 메시지부터 다시 보냄
+                    if link.writer is not None:
+                        link.writer.close()
+                        link.writer = None
+                    self.metrics["reconnects"] += 1
+                    await asyncio.sleep(self.retry_interval)
+                    continue
+                link.queue.popleft()
+                self.metrics["sent"] += 1
+
+    async def _handle_peer(self, reader, writer):
+        """다른 워커에서 들어오는 메시지를 받아 type 별 처리 함수 호출"""
+        decoder = FrameDecoder()
+        try:
+            while data := await reader.read(65536):
+                for message in decoder.feed(data):
+                    fields = json.loads(message)
+                    handler = self.handlers.get(fields.pop("type", None))
+                    self.metrics["received"] += 1
+                    if handler is None:
+                        continue
+                    try:
+                        handler(**fields)
+                    except Exception:
+                        logger.exception("bus 메시지 처리 실패", extra=kv(message=message))
+        except Exception as e:
+            logger.warning("bus 연결 오류", extra=kv(worker=self.worker_id, error=e))
+        finally:
+            writer.close()
+
+    async def close(self):
+        for link in self.links.values():
+            if link.task is not None:
+                link.task.cancel()
+                await asyncio.gather(link.task, return_exceptions=True)
+            if link.writer is not None:
+                link.writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def get_stats(self):
+        return {**self.metrics, "queued": sum(len(link.queue) for link in self.links.values())}
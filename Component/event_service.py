@@ -1,162 +1,312 @@
 import asyncio
-from DB.db import AsyncDatabaseConnector  # AsyncDatabaseConnector 클래스 import
+import base64
+import struct
+from datetime import datetime
+from DB.db import AsyncDatabaseConnector, Transaction  # AsyncDatabaseConnector 클래스 import
+from .lock_manager import EventLockManager
+from .seat_cache import SEAT_AVAILABLE, SEAT_RESERVED, SeatBitmap, SeatMapCache
+from .venue_layout import VenueLayout
+from .waitlist import WaitlistStore
+from .notifier import Notifier
+from .log_config import kv
 import logging
 
+logger = logging.getLogger(__name__)
+
+# 매진이라 대기열에 등록했을 때의 응답 (프레임 연결에는 뒤에 대기 순번을 붙임)
+WAITLIST_JOINED = "대기자로 갔어"
+# reserve_tickets 한 번에 예약할 수 있는 최대 좌석 수
+MAX_GROUP_SEATS = 50
+# check_log 한 페이지 기본/최대 로그 수, stream 모드에서 한 번에 보내는 로그 수
+LOG_PAGE_SIZE = 100
+MAX_LOG_PAGE_SIZE = 1000
+LOG_STREAM_PAGE_SIZE = 500
+LOG_TIME_MAX = "9999-12-31 23:59:59"  # until 을 주지 않았을 때의 상한
+CHECK_LOG_USAGE = ("사용법: check_log <사용자> [since=<시각>] [until=<시각>] [event=<이벤트 ID>] "
+                   "[limit=<개수>] [cursor=<next 값>] [stream]")
+# 조건을 준 view_events 한 페이지 기본/최대 이벤트 수
+EVENT_PAGE_SIZE = 50
+MAX_EVENT_PAGE_SIZE = 500
+VIEW_EVENTS_USAGE = ("사용법: view_events [since=<날짜>] [until=<날짜>] [available] [name=<이름 앞부분>] "
+                     "[limit=<개수>] [cursor=<next 값>]")
+NAME_PREFIX_END = chr(0x10FFFF)  # name >= 앞부분 AND name < 앞부분 + 이 문자 == 앞부분으로 시작
+
+
+def encode_cursor(key, row_id):
+    """마지막으로 보낸 줄의 (정렬 키, id) 를 공백 없는 문자열로"""
+    return base64.urlsafe_b64encode(f"{key}|{row_id}".encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """encode_cursor 의 반대 (형식이 틀리면 ValueError)"""
+    try:
+        key, _, row_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').rpartition("|")
+    except UnicodeError as e:
+        raise ValueError(cursor) from e
+    return key, int(row_id)
+
+
+def parse_time(value):
+    """2024-05-01 또는 2024-05-01T10:00:00 형식을 DB 에 저장된 형식으로"""
+    datetime.fromisoformat(value)  # 형식이 틀리면 ValueError
+    return value.replace("T", " ")
+
+
+class SeatConflict(Exception):
+    """트랜잭션 안에서 좌석이 이미 예약된 것을 발견 (트랜잭션을 롤백하고 메시지를 그대로 응답)"""
+
+
 class AsyncEventService:
-    def __init__(self, db_connector: AsyncDatabaseConnector, clients):
+    def __init__(self, db_connector: AsyncDatabaseConnector, clients, notifier=None, shared=False, user_directory=None):
         self.db_connector = db_connector
-        self.locks = {}
-        self.locks_lock = asyncio.Lock()
+        self.user_directory = user_directory  # 메모리의 사용자 목록 (session.UserDirectory, 없으면 DB 로 확인)
+        # 이벤트별 락 (쓰지 않는 락은 자동 삭제)
+        # 같은 프로세스 안의 요청만 줄 세움: 워커가 여러 개일 때 좌석 정합성은 DB 쓰기 락(BEGIN IMMEDIATE)과
+        # 조건부 UPDATE 가 보장하고, 락은 같은 워커 안에서 트랜잭션이 서로 기다리지 않게 하는 역할만 함
+        self.locks = EventLockManager()
         self.clients = clients
+        self.notifier = notifier or Notifier(clients)  # 알림은 연결별 큐에 넣고 바로 반환
+        self.shared = shared  # 다른 워커 프로세스와 같은 DB 를 쓰면 True (트랜잭션 안에서 캐시를 DB 와 맞춤)
+        self.seat_cache = SeatMapCache()  # 이벤트별 좌석 상태 캐시 (이벤트 락을 잡고 갱신)
+        self.waitlists = WaitlistStore(db_connector, shared)  # 이벤트별 대기열 (waitlist 테이블에 기록)
+        self.on_change = None  # 좌석/대기열을 바꾼 뒤 호출 (event_id, full): 다른 워커에 캐시 갱신을 알림
+        self.catalog_version = None  # 캐시된 이벤트 목록의 버전
+        self.catalog_text = None     # 캐시된 이벤트 목록 문자열
 
-    async def get_event_lock(self, event_id):
-        """이벤트 ID별 비동기 락 반환"""
-        async with self.locks_lock:
-            if event_id not in self.locks:
-                self.locks[event_id] = asyncio.Lock()
-            return self.locks[event_id]
-    
     async def reserve_ticket(self, user_id, event_id, seat_number=None):
         """티켓 예약"""
-        event_lock = await self.get_event_lock(event_id)
-        async with event_lock:
+        async with self.locks.hold(event_id):
             # 좌석 번호가 입력되지 않으면 좌석을 예약할 수 없다.
             if not seat_number:
                 return f"좌석을 선택 안했어 다시 해"
-            # logging.debug(f"[cancel_reservation] 티켓 예약 처음: {event_id}")
-            available_tickets_info = await self.db_connector.execute_query(
-                "SELECT name,available_tickets FROM events WHERE id = ?", 
-                params=(event_id,), 
-                fetch_one=True
-            )
-            #event에서 잘 가져왔는지 확인
-            if available_tickets_info:
-                event_name, available_tickets = available_tickets_info
-            else:    
-                return f"티켓 예약중인데 event에서 {event_id}를 찾을 수가 없어"
-            # logging.debug(f"[cancel_reservation] 티켓 예약 처음: {event_name}")
-            if not available_tickets or available_tickets <= 0:
-                await self.db_connector.execute_query(
-                "INSERT INTO waitlist (user_id, event_id, event_name) VALUES (?, ?, ?)", 
-                params=(user_id, event_id, event_name)
-            )
-                return f"대기자로 갔어"
-            # logging.debug(f"[cancel_reservation] 티켓개수 확인 뒤: {user_id}")
-            seat_exists = await self.db_connector.execute_query(
-                "SELECT status FROM seats WHERE event_id = ? AND seat_number = ?",
-                params=(event_id, seat_number),
-                fetch_one=True
-            )
-            # logging.debug(f"[cancel_reservation] 빈좌석확인: {seat_exists}")
-            
-            if not seat_exists:
-                return f"좌석을 찾을 수 없습니다."
-            elif seat_exists[0] == '예약 불가능':
-                return f"{seat_number} 자리는 예약돼있어"
-
-            # 예약 처리
-            await self.db_connector.execute_query( # 예약
-                "INSERT INTO reservations (user_id, event_id,event_name,seat_number) VALUES (?, ?, ?, ?)", 
-                params=(user_id, event_id, event_name, seat_number)
-            )
-            #좌석 예약 불가능 변경
-            await self.db_connector.execute_query( 
-                "UPDATE seats SET status = '예약 불가능' WHERE event_id = ? AND seat_number = ?", 
-                params=(event_id,seat_number)
-            )
-            await self.db_connector.execute_query(
-                "UPDATE events SET available_tickets = available_tickets - 1 WHERE id = ?", 
-                params=(event_id,)
-            )
-            
-            # 로그 기록
             try:
-                await log_action(self.db_connector, user_id, f"{event_name} 티켓 예약 성공", event_id)
+                # 좌석 상태 확인은 메모리의 비트맵으로 (O(1))
+                seat_state = await self.load_seat_state(event_id)
+                # 조회부터 로그 기록까지 하나의 트랜잭션으로 처리 (커밋 1회)
+                async with self.db_connector.transaction() as tx:
+                    event_info = await tx.execute_query(
+                        "SELECT name FROM events WHERE id = ?", 
+                        params=(event_id,), 
+                        fetch_one=True
+                    )
+                    #event에서 잘 가져왔는지 확인
+                    if event_info:
+                        event_name = event_info[0]
+                    else:    
+                        return f"티켓 예약중인데 event에서 {event_id}를 찾을 수가 없어"
+                    if seat_state is None:
+                        return f"좌석을 찾을 수 없습니다."
+                    seat_state = await self.sync_seat_state(tx, event_id, seat_state)
+                    waitlisted = None
+                    if seat_state.available() <= 0:
+                        # 매진이면 대기열에 등록 (이미 대기 중이면 다시 넣지 않음)
+                        position, row_id = await self.waitlists.join(tx, event_id, event_name, user_id)
+                        if row_id is None:
+                            return f"이미 대기 중이야 (대기 순번 {position})"
+                        waitlisted = position
+                    elif seat_number not in seat_state:
+                        return f"좌석을 찾을 수 없습니다."
+                    elif seat_state.is_reserved(seat_number):
+                        return f"{seat_number} 자리는 예약돼있어"
+                    else:
+                        #좌석 예약 불가능 변경 (예약 가능한 좌석일 때만, 다른 워커가 먼저 예약했으면 0행)
+                        claimed = await tx.execute_query(
+                            "UPDATE seats SET status = '예약 불가능' WHERE event_id = ? AND seat_number = ? AND status = '예약 가능'",
+                            params=(event_id, seat_number)
+                        )
+                        if claimed != 1:
+                            raise SeatConflict(f"{seat_number} 자리는 예약돼있어")
+                        # 예약 처리
+                        await tx.execute_query( # 예약
+                            "INSERT INTO reservations (user_id, event_id,event_name,seat_number) VALUES (?, ?, ?, ?)", 
+                            params=(user_id, event_id, event_name, seat_number)
+                        )
+                        await self.save_seat_bitmap(tx, event_id, seat_state.bitmap_with(seat_number, SEAT_RESERVED))
+                        # 로그 기록
+                        await log_action(tx, user_id, f"{event_name} 티켓 예약 성공", event_id)
+                self.publish_change(event_id)
+                if waitlisted is not None:
+                    # 커밋된 대기열 등록을 메모리에 반영
+                    self.waitlists.commit_join(event_id, user_id, row_id)
+                    return f"{WAITLIST_JOINED} (대기 순번 {waitlisted})"
+                # 커밋된 좌석 상태를 캐시에 반영
+                self.seat_cache.set_status(event_id, seat_number, SEAT_RESERVED)
                 return f"티켓 예약 성공"
-            except Exception as e:
+            except SeatConflict as e:
+                # 캐시가 DB 와 달랐음: 다음 조회 때 DB 에서 다시 읽음
+                self.seat_cache.invalidate(event_id)
+                return str(e)
+            except Exception:
+                logger.exception("reserve_ticket 실패", extra=kv(user=user_id, event=event_id, seat=seat_number))
                 return f"티켓 예약 최고 에러"
         
+    async def reserve_tickets(self, user_id, event_id, seat_numbers=None):
+        """여러 좌석을 한 번에 예약 (락 한 번, 트랜잭션 한 번, 전부 예약되거나 하나도 예약되지 않음)"""
+        # "A1,A2,A3" 형식, 같은 좌석을 두 번 적으면 한 번만
+        seats = list(dict.fromkeys(seat.strip() for seat in (seat_numbers or "").split(",") if seat.strip()))
+        if not seats:
+            return f"좌석을 선택 안했어 다시 해"
+        if len(seats) > MAX_GROUP_SEATS:
+            return f"한 번에 최대 {MAX_GROUP_SEATS}석까지 예약할 수 있습니다."
+        async with self.locks.hold(event_id):
+            try:
+                # 좌석 검증은 락을 잡은 상태에서 메모리의 비트맵으로
+                seat_state = await self.load_seat_state(event_id)
+                if seat_state is None:
+                    return f"좌석을 찾을 수 없습니다."
+                missing = [seat for seat in seats if seat not in seat_state]
+                if missing:
+                    return f"좌석을 찾을 수 없습니다: {', '.join(missing)}"
+                taken = [seat for seat in seats if seat_state.is_reserved(seat)]
+                if taken:
+                    return f"{', '.join(taken)} 자리는 예약돼있어"
+
+                async with self.db_connector.transaction() as tx:
+                    event_info = await tx.execute_query(
+                        "SELECT name FROM events WHERE id = ?",
+                        params=(event_id,),
+                        fetch_one=True
+                    )
+                    if not event_info:
+                        return f"티켓 예약중인데 event에서 {event_id}를 찾을 수가 없어"
+                    event_name = event_info[0]
+                    seat_state = await self.sync_seat_state(tx, event_id, seat_state)
+                    # 예약 가능한 좌석만 바꾸고, 바뀐 행 수가 모자라면 전부 롤백
+                    claimed = await tx.execute_many(
+                        "UPDATE seats SET status = '예약 불가능' WHERE event_id = ? AND seat_number = ? AND status = '예약 가능'",
+                        [(event_id, seat) for seat in seats]
+                    )
+                    if claimed != len(seats):
+                        taken = [seat for seat in seats if seat in seat_state and seat_state.is_reserved(seat)] or seats
+                        raise SeatConflict(f"{', '.join(taken)} 자리는 예약돼있어")
+                    await tx.execute_many(
+                        "INSERT INTO reservations (user_id, event_id, event_name, seat_number) VALUES (?, ?, ?, ?)",
+                        [(user_id, event_id, event_name, seat) for seat in seats]
+                    )
+                    await self.save_seat_bitmap(tx, event_id, seat_state.bitmap_with_seats(seats, SEAT_RESERVED))
+                    await log_action(tx, user_id, f"{event_name} 티켓 {len(seats)}장 예약 성공 ({','.join(seats)})", event_id)
+                # 커밋된 좌석 상태를 캐시에 반영
+                for seat in seats:
+                    self.seat_cache.set_status(event_id, seat, SEAT_RESERVED)
+                self.publish_change(event_id)
+                return f"티켓 {len(seats)}장 예약 성공"
+            except SeatConflict as e:
+                self.seat_cache.invalidate(event_id)
+                return str(e)
+            except Exception:
+                logger.exception("reserve_tickets 실패", extra=kv(user=user_id, event=event_id, seats=seat_numbers))
+                return f"티켓 예약 최고 에러"
+
     async def cancel_reservation(self, user_id, event_id):
         """예약 취소"""
-        event_lock = await self.get_event_lock(event_id)
-        async with event_lock:
-            reservation_exists = await self.db_connector.execute_query(
-                "SELECT id, seat_number FROM reservations WHERE user_id = ? AND event_id = ?",
-                params=(user_id, event_id),
-                fetch_one=True
-            )
-            id_exists,seat = reservation_exists
-            if not id_exists:
-                return f"No reservation found for user {user_id} on event {event_id}."
-            else:
-                await self.db_connector.execute_query(
-                "UPDATE seats SET status = '예약 가능' WHERE event_id = ? AND seat_number = ?",
-                params=(event_id, seat)
-            )
-            #event_name 조회
-            event_name = await self.db_connector.execute_query(
-                "SELECT name FROM events WHERE id = ?", 
-                params=(event_id,), 
-                fetch_one=True
-            )
-            # 예약 취소 처리
-            await self.db_connector.execute_query(
-                "DELETE FROM reservations WHERE user_id = ? AND event_id = ?",
-                params=(user_id, event_id)
-            )
-            await self.db_connector.execute_query(
-                "UPDATE events SET available_tickets = available_tickets + 1 WHERE id = ?",
-                params=(event_id,)
-            )
+        async with self.locks.hold(event_id):
+            # 취소와 대기자 자동 예약을 하나의 트랜잭션으로 처리
+            try:
+                seat_state = await self.load_seat_state(event_id)
+                async with self.db_connector.transaction() as tx:
+                    reservations = await tx.execute_query(
+                        "SELECT id, seat_number FROM reservations WHERE user_id = ? AND event_id = ?",
+                        params=(user_id, event_id),
+                        fetch_all=True
+                    )
+                    if not reservations:
+                        return f"No reservation found for user {user_id} on event {event_id}."
+                    # 단체 예약 등으로 좌석이 여러 개면 모두 취소
+                    seats = [seat for _, seat in reservations]
+                    #event_name 조회
+                    event_info = await tx.execute_query(
+                        "SELECT name FROM events WHERE id = ?", 
+                        params=(event_id,), 
+                        fetch_one=True
+                    )
+                    if not event_info:
+                        return f"이벤트 {event_id}를 찾을 수 없습니다."
+                    event_name = event_info[0]
+                    # 예약 취소 처리
+                    await tx.execute_query(
+                        "DELETE FROM reservations WHERE user_id = ? AND event_id = ?",
+                        params=(user_id, event_id)
+                    )
+                    await log_action(tx, user_id, f"{event_name} 예약 취소 성공", event_id)
+                    if seat_state is not None:
+                        seat_state = await self.sync_seat_state(tx, event_id, seat_state)
 
-            available_tickets = await self.db_connector.execute_query(
-                "SELECT available_tickets FROM events WHERE id = ?",
-                params=(event_id,),
-                fetch_one=True
-            )
-            await log_action(self.db_connector, user_id, f"{event_name} 예약 취소 성공", event_id)
-            # logging.debug(f"[cancel_reservation] after wait: {available_tickets[0]}")
+                    # 빈 좌석은 대기자에게 먼저 넘기고, 대기자에게 가지 않은 좌석만 예약 가능으로 변경
+                    promoted = await self.handle_waitlist(tx, event_id, event_name, seat_state, seats)
+                    promoted_seats = {seat for _, seat in promoted}
+                    released = [seat for seat in seats if seat not in promoted_seats]
+                    if released:
+                        await tx.execute_many(
+                            "UPDATE seats SET status = '예약 가능' WHERE event_id = ? AND seat_number = ?",
+                            [(event_id, seat) for seat in released]
+                        )
+                    if seat_state is not None:
+                        await self.save_seat_bitmap(
+                            tx, event_id,
+                            seat_state.bitmap_with_seats([seat for seat in released if seat in seat_state], SEAT_AVAILABLE)
+                        )
+            except SeatConflict as e:
+                # 캐시가 DB 와 달랐음: 롤백하고 다음 조회 때 DB 에서 다시 읽음
+                self.seat_cache.invalidate(event_id)
+                return str(e)
+            except Exception:
+                logger.exception("cancel_reservation 실패", extra=kv(user=user_id, event=event_id))
+                return f"예약 취소 에러"
 
-            if available_tickets and available_tickets[0] > 0:
-                await self.handle_waitlist(event_id,seat)
+            # 커밋된 좌석 상태를 캐시에 반영 (대기자에게 넘어간 좌석은 계속 예약 불가능)
+            for seat in released:
+                self.seat_cache.set_status(event_id, seat, SEAT_AVAILABLE)
 
+            # 커밋이 끝난 뒤에 대기열에서 빼고 대기자에게 알림
+            await self.apply_promotion(event_id, event_name, promoted)
+            self.publish_change(event_id)
             return f"Reservation canceled for user {user_id} on event {event_id}"
 
     async def transfer_ticket(self, current_user_id, event_id, seat_number, target_user_id):
         """티켓 양도"""
-        event_lock = await self.get_event_lock(event_id)
-        async with event_lock:
+        async with self.locks.hold(event_id):
+            async with self.db_connector.transaction() as tx:
+                # 현재 예약 상태 확인
+                reservation_exists = await tx.execute_query(
+                    "SELECT user_id FROM reservations WHERE user_id = ? AND event_id = ? AND seat_number = ?",
+                    params=(current_user_id, event_id, seat_number),
+                    fetch_one=True
+                )
+                if not reservation_exists:
+                    return f"양도하려는 티켓이 없거나 예약하지 않았습니다"
 
-            # 현재 예약 상태 확인
-            reservation_exists = await self.db_connector.execute_query(
-                "SELECT user_id FROM reservations WHERE user_id = ? AND event_id = ? AND seat_number = ?",
-                params=(current_user_id, event_id, seat_number),
-                fetch_one=True
-            )
-            if not reservation_exists:
-                return f"양도하려는 티켓이 없거나 예약하지 않았습니다"
+                # 예약 업데이트: 예약자 변경
+                await tx.execute_query(
+                    "UPDATE reservations SET user_id = ? WHERE user_id = ? AND event_id = ? AND seat_number = ?",
+                    params=(target_user_id, current_user_id, event_id, seat_number)
+                )
 
-            # 예약 업데이트: 예약자 변경
-            await self.db_connector.execute_query(
-                "UPDATE reservations SET user_id = ? WHERE user_id = ? AND event_id = ? AND seat_number = ?",
-                params=(target_user_id, current_user_id, event_id, seat_number)
+                # 로그 기록
+                await log_action(tx, current_user_id, f"티켓 {event_id}-{seat_number} 양도 -> {target_user_id}", event_id)
+                await log_action(tx, target_user_id, f"티켓 {event_id}-{seat_number} 양도 받음 <- {current_user_id}", event_id)
+
+            # 알림 처리
+            self.notify_user(
+                target_user_id, f"notify:이벤트 {event_id}-{seat_number} 티켓이 {current_user_id}로부터 양도되었습니다."
             )
+            return f"티켓 {event_id}-{seat_number}이 {target_user_id}에게 성공적으로 양도되었습니다."
 
-            # 로그 기록
-            await log_action(self.db_connector, current_user_id, f"티켓 {event_id}-{seat_number} 양도 -> {target_user_id}", event_id)
-            await log_action(self.db_connector, target_user_id, f"티켓 {event_id}-{seat_number} 양도 받음 <- {current_user_id}", event_id)
+    def notify_user(self, user_id, message, key=None):
+        """접속 중인 사용자에게 알림 (연결별 큐에 넣기만 하고 전송을 기다리지 않음)"""
+        self.notifier.notify(user_id, message, key)
 
-            # 알림 처리
-            if target_user_id in self.clients:
-                target_writer = self.clients[target_user_id]
-                message = f"notify:이벤트 {event_id}-{seat_number} 티켓이 {current_user_id}로부터 양도되었습니다."
-                try:
-                    target_writer.write(message.encode('utf-8'))
-                    await target_writer.drain()
-                except Exception as e:
-                    print(f"알림 전송 실패: {e}")
+    def publish_change(self, event_id, full=False):
+        """커밋한 변경을 다른 워커에 알림 (full 이면 대기열/배치도까지 다시 읽게 함)"""
+        if self.on_change is not None:
+            self.on_change(event_id, full)
 
-            return f"티켓 {event_id}-{seat_number}이 {target_user_id}에게 성공적으로 양도되었습니다."
+    def apply_remote_change(self, event_id, full=False):
+        """다른 워커가 이벤트를 바꿨다는 알림 처리 (좌석은 다음 조회 때 DB 비트맵과 맞춤)"""
+        if full:
+            self.seat_cache.invalidate(event_id)
+            self.waitlists.invalidate(event_id)
+        else:
+            self.seat_cache.mark_stale(event_id)
 
     async def validate_event(self, event_id):
         """이벤트 ID 유효성 검사"""
@@ -176,137 +326,359 @@ class AsyncEventService:
         )
         return "유효하지 않은 좌석 번호입니다." if not seat_exists else "유효한 좌석 번호입니다."
 
-    async def validate_user(self, user_id):
-        """사용자 ID 유효성 검사"""
-        user_exists = await self.db_connector.execute_query(
-            "SELECT userid FROM users WHERE userid = ?", 
-            params=(user_id,), 
-            fetch_one=True
-        )
-        return "유효하지 않은 사용자 ID입니다." if not user_exists else "유효한 사용자 ID입니다."
-
-
-        
-    async def handle_waitlist(self, event_id,seat_number):
-        """대기자 목록 처리"""
-        try:
-            # 대기자 조회
-            # logging.debug(f"[cancel_reservation] handle: {seat_number}")
-
-            waitlist_user = await self.db_connector.execute_query(
-                "SELECT user_id FROM waitlist WHERE event_id = ? ORDER BY id ASC LIMIT 1",
-                params=(event_id,),
-                fetch_one=True
-            )
-            if not waitlist_user:
-                print(f"No waitlist user found for event {event_id}.")
-                return  # 대기자가 없으면 종료
-
-            waitlist_user_id = waitlist_user[0]
-            # event 이름 조회
-            event_name1 = await self.db_connector.execute_query( 
-                "SELECT name FROM events WHERE id = ?",
-                params=(event_id,),
+    async def validate(self, *args):
+        """이벤트/좌석/사용자를 한 번에 검사: validate event=1 seat=A1 user=bob (필요한 것만, 쿼리 최대 1회)"""
+        fields = {}
+        for arg in args:
+            key, sep, value = arg.partition("=")
+            if not sep or key not in ("event", "seat", "user") or not value:
+                return "사용법: validate event=<이벤트 ID> seat=<좌석 번호> user=<사용자 ID>"
+            fields[key] = value
+        if not fields:
+            return "사용법: validate event=<이벤트 ID> seat=<좌석 번호> user=<사용자 ID>"
+        if "seat" in fields and "event" not in fields:
+            return "좌석을 확인하려면 event 도 함께 입력해야 합니다."
+        event_id, seat_number, user_id = fields.get("event"), fields.get("seat"), fields.get("user")
+        # 사용자는 메모리의 사용자 목록으로 확인하고, 목록으로 판단할 수 없을 때만 (Bloom filter 오탐 등) DB 로 확인
+        user_ok = None
+        if user_id is not None and self.user_directory is not None:
+            user_ok = self.user_directory.lookup(user_id)
+        db_user_id = user_id if user_ok is None else None
+        event_ok = seat_ok = False
+        if event_id is not None or db_user_id is not None:
+            # 없는 항목은 NULL 로 바인딩 (EXISTS 가 0 이 되고 결과에서 제외)
+            row = await self.db_connector.execute_query(
+                """SELECT EXISTS(SELECT 1 FROM events WHERE id = ?),
+                          EXISTS(SELECT 1 FROM seats WHERE event_id = ? AND seat_number = ?),
+                          EXISTS(SELECT 1 FROM users WHERE userid = ?)""",
+                params=(event_id, event_id, seat_number, db_user_id),
                 fetch_one=True
             )
-            event_name = event_name1[0]
-            #예약을 다시 하니까 좌석 불가능으로
-            await self.db_connector.execute_query(
-                "UPDATE seats SET status = '예약 불가능' WHERE event_id = ? AND seat_number = ?",
-                params=(event_id, seat_number)
-            )
-            # logging.debug(f"[cancel_reservation] 대기자: {waitlist_user_id}")
-            #대기자를 예약자에 추가
-            await self.db_connector.execute_query( 
-                "INSERT INTO reservations (user_id, event_id,event_name,seat_number) VALUES (?, ?, ?, ?)", 
-                params=(waitlist_user_id, event_id, event_name, seat_number)
+            if row is None:
+                return "Error: 유효성 검사 실패"
+            event_ok, seat_ok, db_user_ok = row
+            if user_ok is None:
+                user_ok = db_user_ok
+                if user_ok and self.user_directory is not None and self.user_directory.loaded:
+                    self.user_directory.add(user_id)  # 다른 워커에서 가입한 사용자: 다음부터는 메모리에서 확인
+        errors = []
+        if event_id is not None and not event_ok:
+            errors.append("유효하지 않은 이벤트 ID입니다.")
+        elif seat_number is not None and not seat_ok:
+            errors.append("유효하지 않은 좌석 번호입니다.")  # 이벤트가 없으면 좌석은 따로 알리지 않음
+        if user_id is not None and not user_ok:
+            errors.append("유효하지 않은 사용자 ID입니다.")
+        return "\n".join(errors) if errors else "유효합니다."
+
+    async def handle_waitlist(self, tx, event_id, event_name, seat_state, seats):
+        """빈 좌석 수만큼 맨 앞 대기자를 한 번에 자동 예약 (트랜잭션 안에서 실행, [(사용자, 좌석)] 반환)"""
+        promoted = await self.waitlists.promote(tx, event_id, event_name, seats)
+        if not promoted:
+            return []  # 대기자가 없으면 종료
+        # 취소된 좌석은 예약 불가능 상태 그대로 두고, 비어있던 좌석만 예약 불가능으로 변경
+        opened = [
+            (event_id, seat) for _, seat in promoted
+            if seat_state is None or seat_state.status(seat) != SEAT_RESERVED
+        ]
+        if opened:
+            claimed = await tx.execute_many(
+                "UPDATE seats SET status = '예약 불가능' WHERE event_id = ? AND seat_number = ? AND status = '예약 가능'",
+                opened
             )
-            #현재 티켓 개수 다시 줄이기
-            await self.db_connector.execute_query( 
-                "UPDATE events SET available_tickets = available_tickets - 1 WHERE id = ?",
-                params=(event_id,)
+            if claimed != len(opened):
+                raise SeatConflict(f"이벤트 {event_id}의 좌석 상태가 바뀌었습니다. 다시 시도해 주세요.")
+        # 로그 기록
+        for waitlist_user_id, _ in promoted:
+            await log_action(tx, waitlist_user_id, f"{event_name} 대기자에서 자동 예약", event_id)
+        return promoted
+
+    async def apply_promotion(self, event_id, event_name, promoted):
+        """커밋된 자동 예약을 대기열과 좌석 캐시에 반영하고 대기자에게 알림"""
+        if not promoted:
+            return
+        self.waitlists.commit_promote(event_id, len(promoted))
+        for _, seat in promoted:
+            self.seat_cache.set_status(event_id, seat, SEAT_RESERVED)
+        for waitlist_user_id, _ in promoted:
+            self.notify_user(
+                waitlist_user_id, f"notify:예약하신 이벤트 {event_name}에서 좌석이 확보되었습니다.",
+                key=f"waitlist:{event_id}"
             )
-            # logging.debug(f"[cancel_reservation] 온라인: {self.clients}")
-            # 클라이언트 연결 상태 확인
-            if waitlist_user_id in self.clients:
-                target_writer = self.clients[waitlist_user_id]
-                message = f"notify:예약하신 이벤트 {event_name}에서 좌석이 확보되었습니다."
+
+    async def get_waitlist_position(self, user_id, event_id):
+        """대기 순번 조회 (대기열이 메모리에 있으면 O(1))"""
+        waitlist = self.waitlists.get(event_id)
+        if waitlist is None or self.shared:
+            async with self.locks.hold(event_id):
+                waitlist = await self.waitlists.load(event_id)
+        position = waitlist.position(user_id)
+        if position is None:
+            return f"사용자 {user_id}는 이벤트 {event_id}의 대기자 명단에 없습니다."
+        return f"대기 순번 {position} / 전체 {len(waitlist)}"
+
+    async def refresh_event(self, event_id):
+        """관리장에서 이벤트를 바꾼 뒤 호출: 캐시를 DB 에서 다시 읽고, 빈 좌석이 있으면 대기자를 한 번에 자동 예약"""
+        async with self.locks.hold(event_id):
+            self.seat_cache.invalidate(event_id)
+            self.waitlists.invalidate(event_id)
+            seat_state = await self.load_seat_state(event_id)
+            if seat_state is None:
+                return f"이벤트 {event_id}의 좌석을 찾을 수 없습니다."
+            waitlist = await self.waitlists.load(event_id)
+            promoted = []
+            event_name = None
+            if len(waitlist) and seat_state.available() > 0:
                 try:
-                    target_writer.write(message.encode('utf-8'))
-                    await target_writer.drain()
-                    # logging.info(f"Message sent to user {waitlist_user_id}: {message}")
-                except Exception as e:
-                    # logging.error(f"Error sending message to user {waitlist_user_id}: {e}")
-                    return f"handle 실패"
-
-            # 대기자 목록에서 삭제
-            await self.db_connector.execute_query(
-                "DELETE FROM waitlist WHERE user_id = ? AND event_id = ?",
-                params=(waitlist_user_id, event_id)
-            )
+                    async with self.db_connector.transaction() as tx:
+                        event_info = await tx.execute_query(
+                            "SELECT name FROM events WHERE id = ?",
+                            params=(event_id,),
+                            fetch_one=True
+                        )
+                        if not event_info:
+                            return f"이벤트 {event_id}를 찾을 수 없습니다."
+                        event_name = event_info[0]
+                        seat_state = await self.sync_seat_state(tx, event_id, seat_state)
+                        # 배치도 순서(앞 구역, 앞 열 먼저)로 빈 좌석을 대기자 수만큼 고름
+                        free_seats = [
+                            seat for seat in seat_state.layout.seat_numbers()
+                            if seat in seat_state and not seat_state.is_reserved(seat)
+                        ][:len(waitlist)]
+                        promoted = await self.handle_waitlist(tx, event_id, event_name, seat_state, free_seats)
+                        await self.save_seat_bitmap(
+                            tx, event_id, seat_state.bitmap_with_seats([seat for _, seat in promoted], SEAT_RESERVED)
+                        )
+                except SeatConflict as e:
+                    self.seat_cache.invalidate(event_id)
+                    return str(e)
+            await self.apply_promotion(event_id, event_name, promoted)
+            self.publish_change(event_id, full=True)
+            return f"이벤트 {event_id} 새로고침 완료 (대기자 {len(promoted)}명 자동 예약, 남은 대기자 {len(waitlist)}명)"
+
+    async def save_seat_bitmap(self, tx, event_id, bitmap):
+        """좌석 비트맵과 비트맵에서 계산한 잔여 티켓 수를 트랜잭션 안에서 저장"""
+        await tx.execute_query(
+            "INSERT OR REPLACE INTO seat_bitmaps (event_id, bitmap) VALUES (?, ?)",
+            params=(event_id, bitmap.to_bytes())
+        )
+        # available_tickets 는 따로 더하고 빼지 않고 항상 비트맵 기준으로 덮어씀
+        await tx.execute_query(
+            "UPDATE events SET available_tickets = ? WHERE id = ?",
+            params=(bitmap.available(), event_id)
+        )
 
-            # 로그 기록
-            await log_action(self.db_connector, waitlist_user_id, f"{event_name} 대기자에서 자동 예약", event_id)
-        except Exception as e:
-            print(f"Error in handle_waitlist: {e}")
-            raise  # 디버깅을 위해 예외 재발생
+    async def get_seat_state(self, event_id):
+        """이벤트 좌석 상태 캐시 반환 (없으면 이벤트 락을 잡고 DB 에서 한 번만 읽음)"""
+        seat_state = self.seat_cache.get(event_id)
+        if seat_state is None or seat_state.stale:
+            async with self.locks.hold(event_id):
+                seat_state = await self.load_seat_state(event_id)
+                if seat_state is not None and seat_state.stale:
+                    try:
+                        seat_state = await self.sync_seat_state(self.db_connector, event_id, seat_state)
+                    except SeatConflict:
+                        seat_state = None  # 좌석이 모두 지워진 경우
+        return seat_state
 
-    async def get_seat_availability(self, event_id):
-        """이벤트의 좌석 상태 조회"""
-        # 해당 이벤트의 좌석을 가져옴
-        seats = await self.db_connector.execute_query(
-            "SELECT seat_number, status FROM seats WHERE event_id = ?",
+    async def sync_seat_state(self, db, event_id, seat_state):
+        """다른 워커가 바꾼 좌석을 반영하도록 DB 에 저장된 비트맵으로 캐시를 맞춤 (shared 일 때만, 이벤트 락을 잡은 상태에서 호출)
+
+        트랜잭션 안에서 부르면 DB 쓰기 락을 잡은 뒤에 읽으므로 커밋할 때까지 다른 워커가 바꿀 수 없다.
+        """
+        if not self.shared and not seat_state.stale:
+            return seat_state
+        row = await db.execute_query(
+            "SELECT bitmap FROM seat_bitmaps WHERE event_id = ?",
+            params=(event_id,),
+            fetch_one=True
+        )
+        if row is None:
+            seat_state.stale = False  # 아직 저장된 비트맵이 없으면 seats 테이블에서 만든 캐시 그대로
+            return seat_state
+        try:
+            bitmap = SeatBitmap.from_bytes(row[0])
+        except (ValueError, struct.error):
+            bitmap = None
+        if bitmap is None or not seat_state.sync(bitmap):
+            # 좌석이 추가된 경우 등: seats 테이블 기준으로 캐시를 다시 만들고,
+            # 트랜잭션 안이면 저장된 비트맵도 같은 트랜잭션에서 고쳐 씀 (다음 요청부터는 크기가 맞음)
+            seat_state = await self.rebuild_seat_state(db, event_id)
+            if seat_state is None:
+                raise SeatConflict(f"이벤트 {event_id}의 좌석을 찾을 수 없습니다.")
+            if isinstance(db, Transaction):
+                await self.save_seat_bitmap(db, event_id, seat_state.bitmap)
+        return seat_state
+
+    async def rebuild_seat_state(self, db, event_id):
+        """seats 테이블과 좌석 배치를 다시 읽어 캐시를 새로 만듦 (저장된 비트맵은 쓰지 않음)"""
+        seats = await db.execute_query(
+            "SELECT seat_number, status FROM seats WHERE event_id = ? ORDER BY id",
             params=(event_id,),
             fetch_all=True
         )
+        if not seats:
+            self.seat_cache.invalidate(event_id)
+            return None
+        layout = await db.execute_query(
+            "SELECT layout FROM venue_layouts WHERE event_id = ?",
+            params=(event_id,),
+            fetch_one=True
+        )
+        return self.seat_cache.put(event_id, seats, None, VenueLayout.from_json(layout[0]) if layout else None)
 
+    async def load_seat_state(self, event_id):
+        """캐시에 없으면 DB 에서 좌석을 읽어 캐시에 넣음 (이벤트 락을 잡은 상태에서 호출)"""
+        seat_state = self.seat_cache.get(event_id)
+        if seat_state is not None:
+            return seat_state
+        seats = await self.db_connector.execute_query(
+            "SELECT seat_number, status FROM seats WHERE event_id = ? ORDER BY id",
+            params=(event_id,),
+            fetch_all=True
+        )
         if not seats:
+            return None
+        snapshot = await self.db_connector.execute_query(
+            "SELECT bitmap FROM seat_bitmaps WHERE event_id = ?",
+            params=(event_id,),
+            fetch_one=True
+        )
+        layout = await self.db_connector.execute_query(
+            "SELECT layout FROM venue_layouts WHERE event_id = ?",
+            params=(event_id,),
+            fetch_one=True
+        )
+        return self.seat_cache.put(
+            event_id, seats,
+            snapshot[0] if snapshot else None,
+            VenueLayout.from_json(layout[0]) if layout else None
+        )
+
+    async def get_seat_availability(self, event_id):
+        """이벤트의 좌석 상태 조회 (캐시된 좌석 상태와 배치도를 사용, 상태가 바뀐 줄만 다시 그림)"""
+        seat_state = await self.get_seat_state(event_id)
+        if seat_state is None:
             return f"이벤트를 잘못 선택하셨습니다."
-        
-        # 좌석을 2D 배열로 그룹화하기 위해 행렬 크기 설정 (예시: 3x3)
-        rows = 3  # 행의 수
-        cols = 3  # 열의 수
-        seat_matrix = [['' for _ in range(cols)] for _ in range(rows)]  # 2D 배열 초기화
-
-        # 좌석 번호를 행렬에 배치
-        for seat in seats:
-            seat_number = seat[0]  # 좌석 번호 (예: C1, C2, C3)
-            status = seat[1]  # 좌석 상태 (예: "available", "reserved")
-            
-            try:
-                # 좌석 번호에서 행, 열 추출
-                row = int(seat_number[1]) - 1  # C1 -> row 0, C2 -> row 1, etc.
-                col = ord(seat_number[0]) - ord('A')  # A -> column 0, B -> column 1, etc.
-                
-                # 좌석 상태 업데이트
-                seat_matrix[row][col] = f"{seat_number}({status})"
-            except Exception as e:
-                print(f"Error extracting row/column for seat {seat_number}: {e}")
-                # 오류가 발생하면 해당 좌석을 건너뛰고 계속 진행
-                return f"좌석현황에러"
-
-        # 좌석을 2D 배열 형식으로 포맷팅하여 출력
-        seat_info = ""
-        for row in seat_matrix:
-            seat_info += " | ".join([seat if seat else "Empty" for seat in row]) + "\n"
-
-        return f"Event {event_id} Seat Availability:\n{seat_info}"    
-            
-    async def get_all_events(self):
-        """모든 이벤트 조회"""
-        events = await self.db_connector.execute_query(
-            "SELECT * FROM events", 
-            fetch_all=True
+        return seat_state.render()
+
+    async def get_catalog_version(self):
+        """이벤트 목록 버전 조회 (events 테이블이 바뀌면 트리거가 증가시킴, 관리장에서 바꾼 것도 포함)"""
+        row = await self.db_connector.execute_query(
+            "SELECT version FROM catalog_version WHERE id = 1",
+            fetch_one=True
         )
-        if events:
-            # 이벤트를 문자열로 변환하여 반환
-            events_list = "\n".join(
-                f"ID: {event[0]}, Name: {event[1]}, Description: {event[2]}, Date: {event[3]}, Available Tickets: {event[4]}"
-                for event in events
+        return row[0] if row else None
+
+    async def get_all_events(self, client_version=None):
+        """모든 이벤트 조회 (버전을 주면 변경이 없을 때 목록 대신 not modified 응답)"""
+        version = await self.get_catalog_version()
+        if client_version is not None:
+            if version is not None and str(version) == str(client_version):
+                return f"not modified:{version}"
+
+        if version is None or version != self.catalog_version:
+            events = await self.db_connector.execute_query(
+                "SELECT * FROM events", 
+                fetch_all=True
             )
-            return events_list  # 이제 문자열로 반환
-        return "No events available."
+            if events:
+                # 이벤트를 문자열로 변환하여 캐시
+                self.catalog_text = "\n".join(
+                    f"ID: {event[0]}, Name: {event[1]}, Description: {event[2]}, Date: {event[3]}, Available Tickets: {event[4]}"
+                    for event in events
+                )
+            else:
+                self.catalog_text = "No events available."
+            self.catalog_version = version
+
+        if client_version is not None:
+            return f"version:{version}\n{self.catalog_text}"
+        return self.catalog_text  # 이제 문자열로 반환
     
+    async def view_events(self, *args):
+        """view_events 명령: 인자가 없거나 버전 하나면 전체 목록, 조건(key=value, available)을 주면 조건 검색"""
+        if len(args) == 1 and "=" not in args[0] and args[0] != "available":
+            return await self.get_all_events(args[0])
+        if args:
+            return await self.query_events(*args)
+        return await self.get_all_events()
+
+    async def query_events(self, *options):
+        """조건으로 이벤트 검색 (날짜, id 순으로 한 페이지씩, 다음 페이지는 마지막 줄의 next: 값을 cursor= 로 전달)
+
+        since 는 포함, until 은 미포함, name 은 이름 앞부분, available 은 남은 티켓이 있는 이벤트만.
+        """
+        since = until = name = after = None
+        available, limit = False, EVENT_PAGE_SIZE
+        try:
+            for option in options:
+                if option == "available":
+                    available = True
+                    continue
+                key, sep, value = option.partition("=")
+                if not sep or not value:
+                    raise ValueError(option)
+                if key == "since":
+                    since = parse_time(value)
+                elif key == "until":
+                    until = parse_time(value)
+                elif key == "name":
+                    name = value
+                elif key == "limit":
+                    limit = int(value)
+                    if not 0 < limit <= MAX_EVENT_PAGE_SIZE:
+                        raise ValueError(option)
+                elif key == "cursor":
+                    after = decode_cursor(value)
+                else:
+                    raise ValueError(option)
+        except ValueError:
+            return VIEW_EVENTS_USAGE
+
+        start = (since or "", 0)
+        if after is not None and after > start:
+            start = after
+        # 한 줄 더 읽어서 다음 페이지가 있는지 확인
+        params = (start[0], start[1], until or LOG_TIME_MAX, limit + 1)
+        if name is not None:
+            # 이름 앞부분은 범위 검색 (LIKE 는 대소문자 규칙 때문에 인덱스를 쓰지 못함)
+            events = await self.db_connector.execute_query(
+                """SELECT id, name, description, date, available_tickets FROM events INDEXED BY idx_events_name
+                   WHERE name >= ? AND name < ? AND available_tickets >= ? AND (date, id) > (?, ?) AND date < ?
+                   ORDER BY date, id LIMIT ?""",
+                params=(name, name + NAME_PREFIX_END, 1 if available else 0, *params),
+                fetch_all=True
+            )
+        elif available:
+            # 남은 티켓이 있는 이벤트만 담은 부분 인덱스 사용 (매진된 지난 이벤트는 읽지 않음)
+            events = await self.db_connector.execute_query(
+                """SELECT id, name, description, date, available_tickets FROM events
+                   WHERE available_tickets > 0 AND (date, id) > (?, ?) AND date < ?
+                   ORDER BY date, id LIMIT ?""",
+                params=params,
+                fetch_all=True
+            )
+        else:
+            events = await self.db_connector.execute_query(
+                """SELECT id, name, description, date, available_tickets FROM events
+                   WHERE (date, id) > (?, ?) AND date < ?
+                   ORDER BY date, id LIMIT ?""",
+                params=params,
+                fetch_all=True
+            )
+        if events is None:
+            return "Error: 이벤트 조회 실패"
+        if not events:
+            return "No events available."
+        lines = "\n".join(
+            f"ID: {event[0]}, Name: {event[1]}, Description: {event[2]}, Date: {event[3]}, Available Tickets: {event[4]}"
+            for event in events[:limit]
+        )
+        if len(events) > limit:
+            last = events[limit - 1]
+            lines += f"\nnext:{encode_cursor(last[3], last[0])}"
+        return lines
+
     async def get_all_reservations_for_user(self, user_id):
         """사용자가 예약한 모든 이벤트와 해당 좌석 상태 조회"""
         # 사용자가 예약한 모든 이벤트를 가져옴
@@ -327,22 +699,120 @@ class AsyncEventService:
         return f"사용자 {user_id}의 예약 내역:\n{reservation_info}"
    
 
-    async def get_user_logs(self, user_id):
-        """사용자의 로그 기록 조회"""
-        logs = await self.db_connector.execute_query(
-            "SELECT action, timestamp FROM logs WHERE user_id = ? ORDER BY timestamp ASC", 
-            params=(user_id,),
+    async def get_user_logs(self, user_id, *options):
+        """사용자의 로그 기록 조회 (한 페이지씩, 다음 페이지는 마지막 줄의 next: 값을 cursor= 로 전달)
+
+        stream 을 주면 문자열 대신 페이지 단위 문자열을 내보내는 async generator 를 반환한다
+        (서버가 페이지마다 chunk 로 보냄).
+        """
+        try:
+            filters, limit, after, stream = self.parse_log_options(options)
+        except ValueError:
+            return CHECK_LOG_USAGE
+        if self.db_connector.log_sink is not None:
+            # 아직 버퍼에 있는 로그까지 보이도록 먼저 기록
+            await self.db_connector.log_sink.flush()
+        if stream:
+            return self.stream_user_logs(user_id, after, **filters)
+
+        # 한 줄 더 읽어서 다음 페이지가 있는지 확인
+        rows = await self.fetch_log_page(user_id, after, limit + 1, **filters)
+        if rows is None:
+            return "Error: 로그 조회 실패"
+        if not rows:
+            return f"No logs found for user ID {user_id}."
+        lines = self.format_logs(user_id, rows[:limit])
+        if len(rows) > limit:
+            last_id, _, last_timestamp = rows[limit - 1]
+            lines += f"\nnext:{encode_cursor(last_timestamp, last_id)}"
+        return lines
+
+    def parse_log_options(self, options):
+        """check_log 옵션 파싱: (필터, 페이지 크기, 시작 커서, stream 여부) 반환 (잘못되면 ValueError)"""
+        filters = {"since": None, "until": None, "event_id": None}
+        limit, after, stream = LOG_PAGE_SIZE, None, False
+        for option in options:
+            if option == "stream":
+                stream = True
+                continue
+            key, sep, value = option.partition("=")
+            if not sep or not value:
+                raise ValueError(option)
+            if key in ("since", "until"):
+                filters[key] = parse_time(value)
+            elif key == "event":
+                filters["event_id"] = int(value)
+            elif key == "limit":
+                limit = int(value)
+                if not 0 < limit <= MAX_LOG_PAGE_SIZE:
+                    raise ValueError(option)
+            elif key == "cursor":
+                after = decode_cursor(value)
+            else:
+                raise ValueError(option)
+        return filters, limit, after, stream
+
+    async def stream_user_logs(self, user_id, after=None, **filters):
+        """로그를 페이지 단위 문자열로 내보냄 (전체를 메모리에 모으지 않음)"""
+        found = False
+        async for rows in self.iter_user_logs(user_id, after, **filters):
+            found = True
+            yield self.format_logs(user_id, rows)
+        if not found:
+            yield f"No logs found for user ID {user_id}."
+
+    async def iter_user_logs(self, user_id, after=None, since=None, until=None, event_id=None,
+                             page_size=LOG_STREAM_PAGE_SIZE):
+        """(timestamp, id) 순서로 로그를 page_size 개씩 읽는 async generator (OFFSET 없이 마지막 위치부터)"""
+        while True:
+            rows = await self.fetch_log_page(user_id, after, page_size, since, until, event_id)
+            if rows is None:
+                raise RuntimeError("로그 조회 실패")
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            last_id, _, last_timestamp = rows[-1]
+            after = (last_timestamp, last_id)
+
+    async def fetch_log_page(self, user_id, after, limit, since=None, until=None, event_id=None):
+        """after=(timestamp, id) 다음부터 limit 개 조회 (실패하면 None)
+
+        since 는 포함, until 은 미포함. 시작 위치는 (since, 0) 과 커서 중 뒤쪽이라
+        (user_id, timestamp) 인덱스 범위 검색 한 번으로 끝난다.
+        """
+        start = (since or "", 0)
+        if after is not None and after > start:
+            start = after
+        params = (start[0], start[1], until or LOG_TIME_MAX, limit)
+        if event_id is None:
+            return await self.db_connector.execute_query(
+                """SELECT id, action, timestamp FROM logs
+                   WHERE user_id = ? AND (timestamp, id) > (?, ?) AND timestamp < ?
+                   ORDER BY timestamp, id LIMIT ?""",
+                params=(user_id, *params),
+                fetch_all=True
+            )
+        return await self.db_connector.execute_query(
+            """SELECT id, action, timestamp FROM logs
+               WHERE user_id = ? AND event_id = ? AND (timestamp, id) > (?, ?) AND timestamp < ?
+               ORDER BY timestamp, id LIMIT ?""",
+            params=(user_id, event_id, *params),
             fetch_all=True
         )
-        if logs:
-            logs_list = "\n".join(
-                f"User ID: {user_id}, Action: {log[0]}, Timestamp: {log[1]}" for log in logs
-            )
-            return logs_list
-        return "No logs found for user ID {user_id}."
-    
+
+    def format_logs(self, user_id, rows):
+        return "\n".join(
+            f"User ID: {user_id}, Action: {action}, Timestamp: {timestamp}" for _, action, timestamp in rows
+        )
+
 async def log_action(db_connector: AsyncDatabaseConnector, user_id, action, event_id=None):
     """사용자 활동 로그 기록"""
+    log_sink = getattr(db_connector, "log_sink", None)
+    if log_sink is not None:
+        # 백그라운드 writer 가 있으면 버퍼에 넣고 바로 반환 (커밋은 모아서 한 번에)
+        await log_sink.submit(user_id, action, event_id)
+        return
     try:
         if event_id:
             # event_id가 제공된 경우
@@ -357,5 +827,5 @@ async def log_action(db_connector: AsyncDatabaseConnector, user_id, action, even
                 params=(user_id, action),
             )
     except Exception as e:
-        print(f"Error logging action: {e}")
+        logger.warning("로그 기록 실패", extra=kv(user=user_id, action=action, error=e))
 
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+
+def normalize_event_id(event_id):
+    """이벤트 ID 정규화 ("1", 1, " 01 " 을 같은 키로)"""
+    key = str(event_id).strip()
+    if key.isascii() and key.isdigit():
+        return str(int(key))
+    return key
+
+
+class _LockEntry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0  # 락을 잡고 있거나 기다리는 작업 수
+
+
+class EventLockManager:
+    """이벤트별 락 관리: 사용 중인 락만 보관하고(참조 카운트), 이벤트별 경합 통계를 모음"""
+    def __init__(self, max_stats=1024):
+        self._locks = {}
+        self.max_stats = max_stats  # 통계를 보관할 최대 이벤트 수 (오래 안 쓰인 것부터 삭제)
+        self.stats = OrderedDict()
+
+    def __len__(self):
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, event_id):
+        """이벤트 락을 잡고 실행 (단일 이벤트 루프라 락 조회/생성에 전역 락이 필요 없음)"""
+        key = normalize_event_id(event_id)
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = _LockEntry()
+        entry.users += 1
+        try:
+            if entry.lock.locked():
+                # 경합: 대기 시간과 대기열 길이 기록
+                queue_depth = entry.users - 1
+                started = time.perf_counter()
+                await entry.lock.acquire()
+                self._record(key, time.perf_counter() - started, queue_depth)
+            else:
+                await entry.lock.acquire()
+                self._record(key, 0.0, 0)
+            try:
+                yield
+            finally:
+                entry.lock.release()
+        finally:
+            entry.users -= 1
+            if entry.users == 0 and self._locks.get(key) is entry:
+                # 아무도 쓰지 않는 락은 바로 삭제
+                del self._locks[key]
+
+    def _record(self, key, waited, queue_depth):
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = {"acquired": 0, "contended": 0, "wait_time": 0.0, "max_wait": 0.0, "max_queue": 0}
+            if len(self.stats) > self.max_stats:
+                self.stats.popitem(last=False)
+        else:
+            self.stats.move_to_end(key)
+        stat["acquired"] += 1
+        if queue_depth:
+            stat["contended"] += 1
+            stat["wait_time"] += waited
+            stat["max_wait"] = max(stat["max_wait"], waited)
+            stat["max_queue"] = max(stat["max_queue"], queue_depth)
+
+    def get_stats(self):
+        """현재 보관 중인 락 수와 이벤트별 경합 통계 (현재 대기열 길이 포함)"""
+        return {
+            "active_locks": len(self._locks),
+            "events": {
+                key: {**stat, "queue": self._locks[key].users if key in self._locks else 0}
+                for key, stat in self.stats.items()
+            },
+        }
@@ -0,0 +1,102 @@
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+
+# 모듈별 로그 레벨 기본값 (환경변수 EVENT_LOG_LEVELS="server=DEBUG,Component.event_service=INFO" 로 덮어씀)
+DEFAULT_LEVELS = {
+    "": "INFO",          # 루트
+    "aiosqlite": "WARNING",
+    "asyncio": "WARNING",
+}
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+_listener = None
+
+
+class KeyValueFormatter(logging.Formatter):
+    """메시지 뒤에 extra 로 넘긴 필드를 key=value 로 붙이는 포매터"""
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={format_value(value)}" for key, value in fields.items())
+        return line
+
+
+def format_value(value):
+    """공백이나 따옴표가 있는 값은 따옴표로 감쌈"""
+    text = str(value)
+    if not text or any(ch in text for ch in ' "='):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+
+def kv(**fields):
+    """logger.info("...", extra=kv(user=..., event=...)) 형태로 필드 전달"""
+    return {"fields": fields}
+
+
+class LogSampler:
+    """빈번한 로그를 every 번에 한 번만 남기기 위한 카운터"""
+    __slots__ = ("every", "_counter")
+
+    def __init__(self, every):
+        self.every = max(1, every)
+        self._counter = itertools.count()
+
+    def hit(self):
+        return next(self._counter) % self.every == 0
+
+
+def parse_levels(spec):
+    """"모듈=레벨,모듈=레벨" 형식 문자열을 딕셔너리로 변환"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.strip().partition("=")
+        if not sep:
+            if name:
+                levels[""] = name  # 모듈 없이 레벨만 주면 루트
+            continue
+        levels[name.strip()] = level.strip()
+    return levels
+
+
+def setup_logging(log_file="server.log", levels=None, console=True):
+    """로그는 QueueHandler 로 큐에 넣기만 하고 별도 스레드(QueueListener)가 파일/콘솔에 기록"""
+    global _listener
+    if _listener is not None:
+        return _listener
+    formatter = KeyValueFormatter(LOG_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    merged = {**DEFAULT_LEVELS, **parse_levels(os.environ.get("EVENT_LOG_LEVELS")), **(levels or {})}
+    for name, level in merged.items():
+        logging.getLogger(name or None).setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 기록하고 writer 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
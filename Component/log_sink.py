@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from DB.db import AsyncDatabaseConnector
+from .log_config import kv
+
+logger = logging.getLogger(__name__)
+
+
+def log_timestamp():
+    """datetime('now') 와 같은 형식(UTC)의 타임스탬프"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
+class AsyncLogSink:
+    """감사 로그를 버퍼에 모았다가 executemany 로 한 번에 기록하는 백그라운드 writer"""
+    def __init__(self, db_connector: AsyncDatabaseConnector, max_buffer=10000, batch_size=500, flush_interval=0.2):
+        self.db_connector = db_connector
+        self.max_buffer = max_buffer          # 버퍼가 가득 차면 submit 이 대기 (backpressure)
+        self.batch_size = batch_size          # 이만큼 쌓이면 바로 기록
+        self.flush_interval = flush_interval  # 첫 로그가 들어온 뒤 최대 대기 시간(초)
+        self.queue = None
+        self._batch_ready = None
+        self._task = None
+        self.metrics = {
+            "submitted": 0,   # 버퍼에 들어온 로그 수
+            "written": 0,     # DB 에 기록된 로그 수
+            "batches": 0,     # 기록(커밋) 횟수
+            "blocked": 0,     # 버퍼가 가득 차서 대기한 횟수
+            "failed": 0,      # 기록에 실패한 로그 수
+        }
+
+    def start(self):
+        """백그라운드 writer 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None:
+            self.queue = asyncio.Queue(maxsize=self.max_buffer)
+            self._batch_ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, user_id, action, event_id=None, timestamp=None):
+        """로그 한 건을 버퍼에 추가"""
+        entry = (user_id, action, event_id, timestamp or log_timestamp())
+        if self.queue.full():
+            self.metrics["blocked"] += 1
+        await self.queue.put(entry)
+        self.metrics["submitted"] += 1
+        if self.queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self):
+        """지금까지 들어온 로그가 모두 기록될 때까지 대기"""
+        if self._task is not None:
+            self._batch_ready.set()
+            await self.queue.join()
+
+    async def close(self):
+        """남은 로그를 모두 기록하고 writer 종료"""
+        if self._task is None:
+            return
+        await self.queue.put(None)  # 종료 표시
+        self._batch_ready.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        """첫 로그가 들어오면 batch_size 만큼 쌓이거나 flush_interval 이 지날 때까지 모아서 기록"""
+        closing = False
+        while not closing:
+            batch = []
+            entry = await self.queue.get()
+            if entry is None:
+                closing = True
+            else:
+                batch.append(entry)
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_ready.clear()
+            processed = 1
+            while len(batch) < self.batch_size and not self.queue.empty():
+                entry = self.queue.get_nowait()
+                processed += 1
+                if entry is None:
+                    closing = True
+                else:
+                    batch.append(entry)
+            if batch:
+                await self._write(batch)
+            for _ in range(processed):
+                self.queue.task_done()
+            if closing and not self.queue.empty():
+                # 종료 표시 뒤에 들어온 로그도 마저 기록
+                closing = False
+                await self.queue.put(None)
+
+    async def _write(self, batch):
+        """모은 로그를 트랜잭션 하나로 기록"""
+        try:
+            async with self.db_connector.transaction() as tx:
+                await tx.execute_many(
+                    "INSERT INTO logs (user_id, action, event_id, timestamp) VALUES (?, ?, ?, ?)",
+                    batch
+                )
+            self.metrics["written"] += len(batch)
+            self.metrics["batches"] += 1
+        except Exception as e:
+            self.metrics["failed"] += len(batch)
+            logger.error("감사 로그 기록 실패", extra=kv(rows=len(batch), error=e))
@@ -0,0 +1,216 @@
+import asyncio
+import bisect
+import json
+import os
+import logging
+import time
+from DB.db import query_stats
+from .log_config import kv
+
+logger = logging.getLogger(__name__)
+
+# 명령 처리 시간 히스토그램 구간 상한(초), 마지막 구간은 +Inf
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# command_map 에 없는 명령은 한 이름으로 모음 (임의 문자열로 항목이 늘어나지 않도록)
+UNKNOWN_COMMAND = "unknown"
+# 에러로 세는 응답 (서비스는 예외 대신 에러 문자열을 반환함)
+# 부분 문자열로 찾으면 이벤트 이름 등에 "에러" 가 들어간 정상 응답도 세므로 접두어로만 판단
+ERROR_PREFIXES = ("Error", "TypeError", "인증이 필요", "그냥 에러", "티켓 예약 최고 에러", "예약 취소 에러")
+
+
+def is_error_response(response):
+    return response.startswith(ERROR_PREFIXES)
+
+
+class Histogram:
+    """고정 구간 히스토그램 (observe 는 이분 탐색 한 번)"""
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(구간 상한, 누적 개수) 목록 (Prometheus 형식, 마지막은 +Inf)"""
+        total = 0
+        buckets = []
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def quantile(self, q):
+        """q 분위수가 들어있는 구간의 상한 (근사값, +Inf 구간이면 가장 큰 상한: JSON 으로 쓸 수 있도록)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+
+class CommandStats:
+    """명령 하나의 호출 수, 에러 수, 처리 시간, DB 쿼리 수/시간"""
+    __slots__ = ("calls", "errors", "latency", "db_queries", "db_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.db_queries = 0
+        self.db_time = 0.0
+
+    def add_query(self, elapsed):
+        """DB.db.record_query 에서 호출"""
+        self.db_queries += 1
+        self.db_time += elapsed
+
+
+class ServerMetrics:
+    """서버 지표: 명령별 통계, 연결 수, 다른 컴포넌트의 지표(게이지)"""
+    def __init__(self):
+        self.commands = {}
+        self.connections = 0         # 현재 연결 수
+        self.connections_total = 0   # 서버 시작 후 연결 수
+        self.started = time.time()
+        self.gauges = {}             # 이름 -> 숫자 딕셔너리를 반환하는 함수
+
+    def add_gauges(self, name, collect):
+        """스냅샷을 만들 때 호출할 지표 함수 등록 (예: 커넥션 풀 get_pool_stats)"""
+        self.gauges[name] = collect
+
+    def command(self, name):
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = CommandStats()
+        return stats
+
+    def begin(self, name):
+        """명령 처리 시작: 이후 실행되는 쿼리를 이 명령의 통계에 기록"""
+        stats = self.command(name)
+        return stats, query_stats.set(stats), time.perf_counter()
+
+    def end(self, begun, error=False):
+        """명령 처리 끝: 처리 시간과 에러 기록 (처리 시간 반환)"""
+        stats, token, started = begun
+        elapsed = time.perf_counter() - started
+        stats.latency.observe(elapsed)
+        stats.calls += 1
+        if error:
+            stats.errors += 1
+        query_stats.reset(token)
+        return elapsed
+
+    def connection_opened(self):
+        self.connections += 1
+        self.connections_total += 1
+
+    def connection_closed(self):
+        self.connections -= 1
+
+    def collect_gauges(self):
+        gauges = {}
+        for name, collect in self.gauges.items():
+            try:
+                gauges[name] = {key: value for key, value in collect().items() if isinstance(value, (int, float))}
+            except Exception as e:
+                logger.warning("지표 수집 실패", extra=kv(gauge=name, error=e))
+        return gauges
+
+    def snapshot(self):
+        """현재 지표를 딕셔너리로 반환"""
+        return {
+            "uptime_s": time.time() - self.started,
+            "connections": self.connections,
+            "connections_total": self.connections_total,
+            "commands": {
+                name: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "latency_sum_s": stats.latency.sum,
+                    "p50_le_s": stats.latency.quantile(0.5),
+                    "p99_le_s": stats.latency.quantile(0.99),
+                    "buckets": {str(bound): count for bound, count in stats.latency.cumulative()},
+                    "db_queries": stats.db_queries,
+                    "db_time_s": stats.db_time,
+                }
+                for name, stats in sorted(self.commands.items())
+            },
+            **self.collect_gauges(),
+        }
+
+    def format_text(self):
+        """metrics 명령 응답용 표"""
+        lines = [f"connections {self.connections} (total {self.connections_total}), "
+                 f"uptime {time.time() - self.started:.0f}s",
+                 f"{'command':<26}{'calls':>8}{'errors':>8}{'avg ms':>9}{'p50<=ms':>9}{'p99<=ms':>9}{'q/call':>8}{'db ms':>9}"]
+        for name, stats in sorted(self.commands.items()):
+            calls = stats.calls or 1
+            lines.append(
+                f"{name:<26}{stats.calls:>8}{stats.errors:>8}{stats.latency.sum / calls * 1000:>9.2f}"
+                f"{stats.latency.quantile(0.5) * 1000:>9.1f}{stats.latency.quantile(0.99) * 1000:>9.1f}"
+                f"{stats.db_queries / calls:>8.1f}{stats.db_time / calls * 1000:>9.2f}"
+            )
+        for name, values in self.collect_gauges().items():
+            lines.append(f"{name}: " + ", ".join(f"{key}={value:g}" for key, value in values.items()))
+        return "\n".join(lines)
+
+    def to_prometheus(self):
+        """Prometheus text exposition 형식으로 변환"""
+        lines = [
+            "# TYPE event_connections gauge",
+            f"event_connections {self.connections}",
+            "# TYPE event_connections_total counter",
+            f"event_connections_total {self.connections_total}",
+        ]
+        counters = [
+            ("event_command_calls_total", lambda s: s.calls),
+            ("event_command_errors_total", lambda s: s.errors),
+            ("event_command_db_queries_total", lambda s: s.db_queries),
+            ("event_command_db_seconds_total", lambda s: s.db_time),
+        ]
+        items = sorted(self.commands.items())
+        for metric, value in counters:
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{command="{name}"}} {value(stats)}' for name, stats in items)
+        lines.append("# TYPE event_command_latency_seconds histogram")
+        for name, stats in items:
+            for bound, count in stats.latency.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'event_command_latency_seconds_bucket{{command="{name}",le="{le}"}} {count}')
+            lines.append(f'event_command_latency_seconds_sum{{command="{name}"}} {stats.latency.sum}')
+            lines.append(f'event_command_latency_seconds_count{{command="{name}"}} {stats.latency.count}')
+        for group, values in self.collect_gauges().items():
+            for key, value in values.items():
+                metric = f"event_{group}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def write_prometheus(self, path):
+        """수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 교체"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    async def dump_periodically(self, path, interval):
+        """interval 초마다 Prometheus 텍스트 파일 갱신 (node_exporter textfile collector 등에서 수집)"""
+        while True:
+            try:
+                self.write_prometheus(path)
+            except OSError as e:
+                logger.warning("지표 파일 저장 실패", extra=kv(path=path, error=e))
+            await asyncio.sleep(interval)
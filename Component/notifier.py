@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from .log_config import kv
+
+logger = logging.getLogger(__name__)
+
+# 큐가 가득 찼을 때: 가장 오래된 알림을 버림 / 새 알림을 버림
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class Outbox:
+    """연결 하나의 알림 큐 (크기 제한, 같은 key 의 알림은 마지막 것만 남김)"""
+    __slots__ = ("connection", "queue", "keys", "ready", "task")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.queue = deque()   # [key, 메시지, 넣은 시각]
+        self.keys = {}         # key -> 큐에 있는 항목 (coalesce 용)
+        self.ready = asyncio.Event()
+        self.task = None
+
+
+class Notifier:
+    """사용자 알림 전송: 예약 처리 코드는 큐에 넣고 바로 반환, 연결마다 writer 작업이 따로 전송 (느린 클라이언트를 기다리지 않음)"""
+    def __init__(self, clients, max_queue=100, policy=DROP_OLDEST, send_timeout=5.0, bus=None):
+        self.clients = clients            # 사용자 -> 연결 (server.clients)
+        self.bus = bus                    # 워커가 여러 개면 다른 워커에 접속한 사용자에게 전달할 버스
+        self.max_queue = max_queue        # 연결당 쌓아둘 최대 알림 수
+        self.policy = policy
+        self.send_timeout = send_timeout  # 이 시간 안에 보내지 못하면 멈춘 연결로 보고 끊음
+        self.outboxes = {}                # 연결 -> Outbox
+        self.metrics = {
+            "enqueued": 0,       # 큐에 넣은 알림 수
+            "delivered": 0,      # 전송 완료한 알림 수
+            "coalesced": 0,      # 같은 key 의 이전 알림을 대체한 수
+            "dropped": 0,        # 큐가 가득 차서 버린 수
+            "offline": 0,        # 접속 중이 아니어서 보내지 않은 수
+            "forwarded": 0,      # 이 워커에 접속하지 않아서 다른 워커로 넘긴 수
+            "failed": 0,         # 전송 실패/연결 종료로 버린 수
+            "timeouts": 0,       # send_timeout 초과로 연결을 끊은 수
+            "delivery_time": 0.0,  # 큐에 넣은 뒤 전송까지 걸린 시간 합계(초)
+        }
+
+    def notify(self, user_id, message, key=None):
+        """알림을 큐에 넣음 (기다리지 않음, 큐에 들어갔으면 True)"""
+        if self.bus is not None and user_id not in self.clients:
+            # 다른 워커에 접속해 있을 수 있으므로 버스로 넘김 (받은 워커가 deliver_local 로 전달)
+            self.bus.publish("notify", user_id=user_id, message=message, key=key)
+            self.metrics["forwarded"] += 1
+            return True
+        return self.deliver_local(user_id, message, key)
+
+    def deliver_local(self, user_id, message, key=None):
+        """이 워커에 접속한 사용자에게만 알림 (버스로 받은 알림도 여기로, 다시 버스로 보내지 않음)"""
+        connection = self.clients.get(user_id)
+        if connection is None:
+            self.metrics["offline"] += 1
+            return False
+        outbox = self.outboxes.get(connection)
+        if outbox is None:
+            outbox = self.outboxes[connection] = Outbox(connection)
+            outbox.task = asyncio.create_task(self._run(outbox))
+
+        now = time.perf_counter()
+        if key is not None and key in outbox.keys:
+            # 아직 보내지 않은 같은 종류의 알림은 최신 내용으로 교체
+            entry = outbox.keys[key]
+            entry[1] = message
+            self.metrics["coalesced"] += 1
+            return True
+        if len(outbox.queue) >= self.max_queue:
+            self.metrics["dropped"] += 1
+            if self.policy == DROP_NEWEST:
+                return False
+            old_key, _, _ = outbox.queue.popleft()
+            if old_key is not None:
+                outbox.keys.pop(old_key, None)
+        entry = [key, message, now]
+        outbox.queue.append(entry)
+        if key is not None:
+            outbox.keys[key] = entry
+        self.metrics["enqueued"] += 1
+        outbox.ready.set()
+        return True
+
+    async def _run(self, outbox):
+        """연결 하나의 큐를 순서대로 전송"""
+        connection = outbox.connection
+        try:
+            while True:
+                await outbox.ready.wait()
+                outbox.ready.clear()
+                while outbox.queue:
+                    key, message, queued_at = outbox.queue.popleft()
+                    if key is not None:
+                        outbox.keys.pop(key, None)
+                    connection.write(message)
+                    try:
+                        await asyncio.wait_for(connection.writer.drain(), self.send_timeout)
+                    except asyncio.TimeoutError:
+                        # 받지 않는 클라이언트: 연결을 끊어서 서버 쪽 버퍼가 계속 쌓이지 않게 함
+                        self.metrics["timeouts"] += 1
+                        self.metrics["failed"] += 1 + len(outbox.queue)
+                        logger.warning("알림 전송 시간 초과로 연결 종료", extra=kv(user=connection.user_id))
+                        connection.writer.close()
+                        return
+                    self.metrics["delivered"] += 1
+                    self.metrics["delivery_time"] += time.perf_counter() - queued_at
+        except Exception as e:
+            self.metrics["failed"] += 1 + len(outbox.queue)
+            logger.warning("알림 전송 실패", extra=kv(user=connection.user_id, error=e))
+        finally:
+            if self.outboxes.get(connection) is outbox:
+                del self.outboxes[connection]
+
+    async def close(self, connection):
+        """연결이 끊어지면 남은 알림을 버리고 writer 작업 종료"""
+        outbox = self.outboxes.pop(connection, None)
+        if outbox is None:
+            return
+        self.metrics["failed"] += len(outbox.queue)
+        outbox.task.cancel()
+        await asyncio.gather(outbox.task, return_exceptions=True)
+
+    def get_stats(self):
+        return {
+            **self.metrics,
+            "connections": len(self.outboxes),
+            "queued": sum(len(outbox.queue) for outbox in self.outboxes.values()),
+        }
@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ALGORITHM = "pbkdf2_sha256"
+# 저장 형식: pbkdf2_sha256$반복횟수$salt(base64)$해시(base64)
+DEFAULT_ITERATIONS = int(os.environ.get("EVENT_PASSWORD_ITERATIONS", "200000"))
+SALT_BYTES = 16
+
+
+class HasherBusy(Exception):
+    """대기 중인 해시 작업이 max_pending 을 넘었을 때 발생"""
+
+
+def hash_password_sync(password, iterations=DEFAULT_ITERATIONS, salt=None):
+    """비밀번호를 PBKDF2-SHA256 으로 해시해서 저장 형식 문자열 반환 (이벤트 루프에서 직접 부르지 말 것)"""
+    salt = salt or secrets.token_bytes(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode('utf-8'), salt, iterations)
+    return f"{ALGORITHM}${iterations}${base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+
+
+def dummy_hash(iterations=DEFAULT_ITERATIONS):
+    """어떤 비밀번호와도 일치하지 않는 저장 형식 값 (없는 사용자도 같은 시간 동안 해시를 계산하게 할 때 사용)"""
+    salt = base64.b64encode(secrets.token_bytes(SALT_BYTES)).decode()
+    digest = base64.b64encode(bytes(hashlib.sha256().digest_size)).decode()
+    return f"{ALGORITHM}${iterations}${salt}${digest}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + "$")
+
+
+def verify_password_sync(password, stored, iterations=DEFAULT_ITERATIONS):
+    """저장된 값과 비교해서 (일치 여부, 다시 해시해야 하는지) 반환 (평문으로 저장된 예전 값도 확인)"""
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8')), True
+    try:
+        _, stored_iterations, salt, digest = stored.split("$")
+        stored_iterations = int(stored_iterations)
+        salt = base64.b64decode(salt)
+        digest = base64.b64decode(digest)
+    except ValueError:
+        return False, False
+    candidate = hashlib.pbkdf2_hmac("sha256", password.encode('utf-8'), salt, stored_iterations)
+    return hmac.compare_digest(candidate, digest), stored_iterations != iterations
+
+
+class PasswordHasher:
+    """비밀번호 해시/확인을 별도 스레드 풀에서 실행 (PBKDF2 는 GIL 을 풀고 계산하므로 이벤트 루프가 멈추지 않음)
+
+    동시에 계산하는 작업은 max_workers 개, 기다리는 작업은 max_pending 개까지:
+    로그인이 몰려도 풀 밖에서 줄을 서고, 넘치면 바로 HasherBusy 로 거절한다.
+    """
+    def __init__(self, max_workers=None, max_pending=64, iterations=DEFAULT_ITERATIONS):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_pending = max_pending
+        self.iterations = iterations
+        self.dummy_hash = dummy_hash(iterations)  # 없는 사용자로 로그인할 때 대신 확인
+        self.executor = None  # 처음 쓸 때 생성
+        self.slots = None
+        self.waiting = 0
+        self.running = 0
+        self.metrics = {
+            "hashed": 0,      # 새로 해시한 수
+            "verified": 0,    # 확인한 수
+            "rehashed": 0,    # 평문/예전 설정 값을 다시 해시한 수 (login 에서 증가)
+            "rejected": 0,    # 대기열이 가득 차서 거절한 수
+            "wait_time": 0.0,     # 스레드를 기다린 시간 합계(초)
+            "compute_time": 0.0,  # 해시 계산 시간 합계(초)
+            "max_wait": 0.0,
+        }
+
+    async def hash(self, password):
+        return await self._run(hash_password_sync, password, self.iterations)
+
+    async def verify(self, password, stored):
+        """(일치 여부, 다시 해시해야 하는지) 반환"""
+        if not is_hashed(stored):
+            # 평문으로 저장된 예전 값: 해시 계산이 없으므로 바로 비교
+            self.metrics["verified"] += 1
+            return verify_password_sync(password, stored, self.iterations)
+        return await self._run(verify_password_sync, password, stored, self.iterations)
+
+    async def _run(self, fn, *args):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password")
+            self.slots = asyncio.Semaphore(self.max_workers)
+        if self.waiting >= self.max_pending:
+            self.metrics["rejected"] += 1
+            raise HasherBusy("비밀번호 처리 대기열이 가득 찼습니다.")
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.perf_counter()
+        wait = started - queued_at
+        self.metrics["wait_time"] += wait
+        self.metrics["max_wait"] = max(self.metrics["max_wait"], wait)
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.slots.release()
+            self.metrics["compute_time"] += time.perf_counter() - started
+            self.metrics["hashed" if fn is hash_password_sync else "verified"] += 1
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def get_stats(self):
+        return {**self.metrics, "workers": self.max_workers, "waiting": self.waiting, "running": self.running}
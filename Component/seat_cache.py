@@ -0,0 +1,210 @@
+import struct
+from .lock_manager import normalize_event_id
+from .venue_layout import SeatMapTemplate, VenueLayout
+
+SEAT_AVAILABLE = '예약 가능'
+SEAT_RESERVED = '예약 불가능'
+
+
+class SeatBitmap:
+    """좌석 예약 상태 비트맵 (좌석 하나당 1비트, 1 = 예약됨)"""
+    # 저장 형식: 매직(4) + 형식 버전(2) + 좌석 수(4) + 비트 (little-endian, 좌석 인덱스 순서)
+    HEADER = struct.Struct("<4sHI")
+    MAGIC = b"SEAT"
+    FORMAT_VERSION = 1
+
+    __slots__ = ("size", "bits", "reserved")
+
+    def __init__(self, size, bits=None):
+        self.size = size
+        self.bits = bytearray(bits) if bits is not None else bytearray((size + 7) // 8)
+        self.reserved = self.popcount()  # 예약된 좌석 수 (reserve/release 에서 O(1) 로 유지)
+
+    def is_reserved(self, index):
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def reserve(self, index):
+        """좌석 예약 표시 (이미 예약된 좌석이면 False)"""
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            return False
+        self.bits[index >> 3] |= mask
+        self.reserved += 1
+        return True
+
+    def release(self, index):
+        """좌석 예약 해제 (이미 비어있으면 False)"""
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            return False
+        self.bits[index >> 3] &= ~mask
+        self.reserved -= 1
+        return True
+
+    def popcount(self):
+        """비트맵 전체에서 예약된 좌석 수를 다시 계산"""
+        return int.from_bytes(self.bits, 'little').bit_count()
+
+    def available(self):
+        return self.size - self.reserved
+
+    def copy(self):
+        return SeatBitmap(self.size, self.bits)
+
+    def to_bytes(self):
+        """DB 저장용 바이너리로 변환"""
+        return self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, self.size) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """저장된 바이너리에서 복원 (형식이 맞지 않으면 ValueError)"""
+        magic, format_version, size = cls.HEADER.unpack_from(data)
+        bits = data[cls.HEADER.size:]
+        if magic != cls.MAGIC or format_version != cls.FORMAT_VERSION or len(bits) != (size + 7) // 8:
+            raise ValueError("좌석 비트맵 형식이 올바르지 않습니다.")
+        return cls(size, bits)
+
+    @classmethod
+    def from_seats(cls, seats):
+        """seats 테이블에서 읽은 (좌석 번호, 상태) 목록으로 생성 (id 순서 = 좌석 인덱스)"""
+        bitmap = cls(len(seats))
+        for i, (_, status) in enumerate(seats):
+            if status == SEAT_RESERVED:
+                bitmap.reserve(i)
+        return bitmap
+
+
+class EventSeatState:
+    """이벤트 하나의 좌석 상태와 배치도 캐시"""
+    def __init__(self, event_id, seat_numbers, bitmap, layout=None):
+        self.event_id = event_id
+        self.seat_numbers = seat_numbers                          # 인덱스 -> 좌석 번호 (seats.id 순서)
+        self.index = {seat: i for i, seat in enumerate(seat_numbers)}  # 좌석 번호 -> 인덱스
+        self.bitmap = bitmap
+        self.layout = layout or VenueLayout.from_seat_numbers(seat_numbers)
+        self.version = 0          # 좌석 상태가 바뀔 때마다 증가
+        self._template = None     # 처음 렌더링할 때 생성
+        self._changed = set()     # 마지막 렌더링 이후 상태가 바뀐 좌석 인덱스
+        self._rendered = None
+        self._rendered_version = -1
+        self.stale = False        # 다른 워커가 좌석을 바꿨다는 알림을 받으면 True (다음 조회 때 DB 비트맵과 맞춤)
+
+    def __contains__(self, seat_number):
+        return seat_number in self.index
+
+    def status(self, seat_number):
+        """좌석 상태 문자열 반환 (없는 좌석이면 None)"""
+        index = self.index.get(seat_number)
+        if index is None:
+            return None
+        return self.status_of(index)
+
+    def is_reserved(self, seat_number):
+        return self.bitmap.is_reserved(self.index[seat_number])
+
+    def available(self):
+        return self.bitmap.available()
+
+    def set_status(self, seat_number, status):
+        """좌석 상태 변경 (실제로 바뀐 경우에만 버전 증가)"""
+        index = self.index.get(seat_number)
+        if index is None:
+            return
+        if status == SEAT_RESERVED:
+            changed = self.bitmap.reserve(index)
+        else:
+            changed = self.bitmap.release(index)
+        if changed:
+            self.version += 1
+            self._changed.add(index)
+
+    def sync(self, bitmap):
+        """DB 에 저장된 비트맵으로 맞춤 (다른 워커가 바꾼 좌석만 다시 그리도록 표시, 좌석 수가 다르면 False)"""
+        self.stale = False
+        if bitmap.size != self.bitmap.size:
+            return False
+        if bitmap.bits == self.bitmap.bits:
+            return True
+        diff = int.from_bytes(bitmap.bits, 'little') ^ int.from_bytes(self.bitmap.bits, 'little')
+        while diff:
+            low = diff & -diff
+            self._changed.add(low.bit_length() - 1)
+            diff ^= low
+        self.bitmap = bitmap
+        self.version += 1
+        return True
+
+    def bitmap_with(self, seat_number, status):
+        """좌석 하나를 바꿨을 때의 비트맵 사본 (커밋 전에 저장할 값 계산용)"""
+        return self.bitmap_with_seats([seat_number], status)
+
+    def bitmap_with_seats(self, seat_numbers, status):
+        """여러 좌석을 같은 상태로 바꿨을 때의 비트맵 사본"""
+        bitmap = self.bitmap.copy()
+        for seat_number in seat_numbers:
+            index = self.index[seat_number]
+            if status == SEAT_RESERVED:
+                bitmap.reserve(index)
+            else:
+                bitmap.release(index)
+        return bitmap
+
+    def status_of(self, index):
+        return SEAT_RESERVED if self.bitmap.is_reserved(index) else SEAT_AVAILABLE
+
+    def render(self):
+        """좌석 배치도 반환 (버전이 바뀐 경우에만 상태가 바뀐 좌석이 있는 줄을 다시 만듦)"""
+        if self._template is None:
+            self._template = SeatMapTemplate(self.event_id, self.layout, self.index)
+            self._rendered = self._template.render(self.status_of)
+        elif self._rendered_version != self.version:
+            self._rendered = self._template.render(self.status_of, self._changed)
+        self._changed.clear()
+        self._rendered_version = self.version
+        return self._rendered
+
+
+class SeatMapCache:
+    """이벤트별 좌석 상태 캐시 (처음 조회할 때 DB 에서 읽고, 이후에는 예약/취소가 직접 갱신)"""
+    def __init__(self):
+        self.events = {}
+
+    def get(self, event_id):
+        """캐시된 좌석 상태 반환 (없으면 None)"""
+        return self.events.get(normalize_event_id(event_id))
+
+    def put(self, event_id, seats, snapshot=None, layout=None):
+        """DB 에서 읽은 (좌석 번호, 상태) 목록, 저장된 비트맵, 좌석 배치로 캐시 생성"""
+        seat_numbers = [seat_number for seat_number, _ in seats]
+        bitmap = None
+        if snapshot is not None:
+            try:
+                bitmap = SeatBitmap.from_bytes(snapshot)
+            except (ValueError, struct.error):
+                bitmap = None
+            if bitmap is not None and bitmap.size != len(seat_numbers):
+                bitmap = None  # 좌석이 추가된 경우 등: seats 테이블 기준으로 다시 만듦
+        if bitmap is None:
+            bitmap = SeatBitmap.from_seats(seats)
+        seat_state = EventSeatState(event_id, seat_numbers, bitmap, layout)
+        self.events[normalize_event_id(event_id)] = seat_state
+        return seat_state
+
+    def set_status(self, event_id, seat_number, status):
+        """캐시된 이벤트가 있으면 좌석 상태 갱신"""
+        seat_state = self.get(event_id)
+        if seat_state is not None:
+            seat_state.set_status(seat_number, status)
+
+    def mark_stale(self, event_id):
+        """다른 워커가 좌석 상태를 바꿨을 때 호출 (다음 조회 때 DB 비트맵과 다시 맞춤)"""
+        seat_state = self.get(event_id)
+        if seat_state is not None:
+            seat_state.stale = True
+
+    def invalidate(self, event_id=None):
+        """이벤트 하나 (또는 전체) 캐시 삭제"""
+        if event_id is None:
+            self.events.clear()
+        else:
+            self.events.pop(normalize_event_id(event_id), None)
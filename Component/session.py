@@ -0,0 +1,154 @@
+import hashlib
+import math
+import secrets
+import time
+from collections import OrderedDict
+
+
+class SessionStore:
+    """로그인 세션 토큰 -> 사용자 (마지막으로 쓴 뒤 ttl 초가 지나면 만료)
+
+    마지막으로 쓴 순서대로 OrderedDict 에 두므로 만료된 세션은 항상 앞쪽에 모여 있고,
+    조회할 때 앞에서부터 만료된 것만 지운다 (별도 정리 작업 없음).
+    """
+    def __init__(self, ttl=1800.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = OrderedDict()  # 토큰 -> [사용자, 만료 시각]
+        self.metrics = {
+            "created": 0,   # 발급한 토큰 수
+            "resolved": 0,  # 토큰으로 사용자를 찾은 수
+            "rejected": 0,  # 없거나 만료된 토큰으로 요청한 수
+            "expired": 0,   # TTL 이 지나서 지운 세션 수
+        }
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def create(self, user_id):
+        """새 토큰 발급"""
+        self.evict_expired()
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = [user_id, self.clock() + self.ttl]
+        self.metrics["created"] += 1
+        return token
+
+    def resolve(self, token):
+        """토큰의 사용자 반환 (없거나 만료됐으면 None, 쓸 때마다 만료 시각 연장)"""
+        now = self.clock()
+        self.evict_expired(now)
+        session = self.sessions.get(token)
+        if session is None:
+            self.metrics["rejected"] += 1
+            return None
+        session[1] = now + self.ttl
+        self.sessions.move_to_end(token)
+        self.metrics["resolved"] += 1
+        return session[0]
+
+    def revoke(self, token):
+        self.sessions.pop(token, None)
+
+    def revoke_user(self, user_id):
+        """사용자의 모든 토큰 삭제 (로그아웃)"""
+        for token in [token for token, (owner, _) in self.sessions.items() if owner == user_id]:
+            del self.sessions[token]
+
+    def evict_expired(self, now=None):
+        now = self.clock() if now is None else now
+        while self.sessions:
+            token, (_, expires_at) = next(iter(self.sessions.items()))
+            if expires_at > now:
+                break
+            del self.sessions[token]
+            self.metrics["expired"] += 1
+
+    def get_stats(self):
+        return {**self.metrics, "active": len(self.sessions)}
+
+
+class BloomFilter:
+    """없는 값을 빠르게 걸러내는 Bloom filter (있다고 나오면 오탐일 수 있음)"""
+    __slots__ = ("capacity", "size", "hash_count", "bits")
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(1, capacity)
+        # 비트 수 m = -n ln p / (ln 2)^2, 해시 수 k = m/n ln 2
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, value):
+        # 해시 한 번으로 두 값을 만들어 k 개의 위치를 계산 (double hashing)
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for index in self._indexes(value):
+            self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(value))
+
+
+class UserDirectory:
+    """가입한 사용자 ID 목록 (시작할 때 users 테이블에서 한 번 읽고, 회원가입 때 추가)
+
+    Bloom filter 로 없는 ID 를 먼저 걸러내고, 통과한 ID 만 집합에서 확인한다 (오탐 없음).
+    """
+    def __init__(self, expected_users=10000, error_rate=0.01):
+        self.expected_users = expected_users
+        self.error_rate = error_rate
+        self.users = set()
+        self.bloom = BloomFilter(expected_users, error_rate)
+        self.loaded = False
+        self.metrics = {
+            "lookups": 0,
+            "fast_negatives": 0,   # Bloom filter 에서 바로 없다고 판단한 수
+            "false_positives": 0,  # Bloom filter 는 통과했지만 집합에 없던 수
+        }
+
+    def __len__(self):
+        return len(self.users)
+
+    def load(self, user_ids):
+        """전체 사용자 ID 로 다시 만듦"""
+        self.users = set(user_ids)
+        self._rebuild()
+        self.loaded = True
+
+    def add(self, user_id):
+        if user_id in self.users:
+            return
+        self.users.add(user_id)
+        if len(self.users) > self.bloom.capacity:
+            self._rebuild()  # 예상보다 많아지면 오탐률이 오르므로 두 배 크기로 다시 만듦
+        else:
+            self.bloom.add(user_id)
+
+    def _rebuild(self):
+        self.bloom = BloomFilter(max(self.expected_users, len(self.users) * 2), self.error_rate)
+        for user_id in self.users:
+            self.bloom.add(user_id)
+
+    def lookup(self, user_id):
+        """있으면 True, Bloom filter 에서 없다고 나오면 False, 판단할 수 없으면 None (DB 로 확인할 것)
+
+        Bloom filter 는 통과했는데 집합에 없는 경우는 오탐이거나 다른 워커에서 방금 가입해서
+        아직 알림이 오지 않은 경우라 None 을 반환한다.
+        """
+        if not self.loaded:
+            return None
+        self.metrics["lookups"] += 1
+        if user_id not in self.bloom:
+            self.metrics["fast_negatives"] += 1
+            return False
+        if user_id in self.users:
+            return True
+        self.metrics["false_positives"] += 1
+        return None
+
+    def get_stats(self):
+        return {**self.metrics, "users": len(self.users), "bloom_bytes": len(self.bloom.bits)}
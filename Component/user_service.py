@@ -1,57 +1,125 @@
 from DB.db import AsyncDatabaseConnector
 from .event_service import log_action
+from .log_config import kv
+from .session import SessionStore, UserDirectory
+from .passwords import HasherBusy, PasswordHasher
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOGIN_FAILED = "로그인 실패"
+# 비밀번호 해시 대기열이 가득 찼을 때의 응답 (Error 로 시작하므로 사용자 ID 로 오해할 수 없음)
+BUSY_REPLY = "Error: 요청이 많아 잠시 후 다시 시도해 주세요"
+
+
 class AsyncUserService:
-    def __init__(self, db_connector: AsyncDatabaseConnector,clients):
+    def __init__(self, db_connector: AsyncDatabaseConnector,clients, session_ttl=1800.0, hasher=None):
         self.db_connector = db_connector
         self.clients = clients
+        self.hasher = hasher or PasswordHasher()  # 비밀번호 해시는 별도 스레드 풀에서 (이벤트 루프를 막지 않음)
+        self.sessions = SessionStore(session_ttl)  # 로그인 토큰 -> 사용자
+        self.directory = UserDirectory()  # 가입한 사용자 ID (load_directory 로 읽은 뒤부터 사용)
+        self.on_register = None  # 회원가입 후 호출 (userid): 다른 워커의 사용자 목록에 추가
+
+    async def load_directory(self):
+        """users 테이블의 사용자 ID 를 메모리로 읽음 (서버 시작 시 한 번)"""
+        rows = await self.db_connector.execute_query("SELECT userid FROM users", fetch_all=True)
+        self.directory.load(userid for userid, in rows or [])
+        logger.info("user directory loaded", extra=kv(users=len(self.directory)))
+
+    async def user_exists(self, userid):
+        """사용자 ID 가 있는지 확인 (사용자 목록으로 판단할 수 있으면 DB 를 조회하지 않음)"""
+        found = self.directory.lookup(userid)
+        if found is not None:
+            return found
+        # 목록을 읽기 전이거나, 오탐/다른 워커에서 방금 가입한 경우는 DB 로 확인
+        user = await self.db_connector.execute_query(
+            "SELECT 1 FROM users WHERE userid = ?", (userid,), fetch_one=True
+        )
+        if user is not None and self.directory.loaded:
+            self.directory.add(userid)  # 다음부터는 메모리에서 확인
+        return user is not None
 
     async def register_user(self, userid, password):
         """사용자 등록"""
         try:
-            existing_user = await self.db_connector.execute_query(
-                'SELECT 1 FROM users WHERE userid = ?', (userid,), fetch_one=True
-            )
-            if existing_user:
+            if await self.user_exists(userid):
                 return f"Error: Username '{userid}' already exists"
-            
-            await self.db_connector.execute_query( 
-                'INSERT INTO users (userid, password) VALUES (?, ?)', (userid, password)
-            )
-            
+            password_hash = await self.hasher.hash(password)
+            async with self.db_connector.transaction() as tx:
+                inserted = await tx.execute_query(
+                    'INSERT OR IGNORE INTO users (userid, password) VALUES (?, ?)', (userid, password_hash)
+                )
+            if not inserted:
+                # 다른 워커에서 방금 가입한 경우 (userid 는 UNIQUE)
+                self.directory.add(userid)
+                return f"Error: Username '{userid}' already exists"
+            self.directory.add(userid)
+            if self.on_register is not None:
+                self.on_register(userid)
+
             # 사용자 등록 로그 기록
             await log_action(self.db_connector,userid, "회원가입 성공")
             return f"User '{userid}' registered successfully"
-        except Exception as e:
-            print(f"Unexpected error during registration: {e}")
+        except HasherBusy:
+            return BUSY_REPLY
+        except Exception:
+            logger.exception("회원가입 실패", extra=kv(user=userid))
             return "Error: Registration failed"
 
     async def login(self, userid, password):
-        """로그인"""
+        """로그인 (비밀번호 확인은 스레드 풀에서, 평문으로 저장된 예전 비밀번호는 이때 해시로 바꿈)"""
         try:
             user = await self.db_connector.execute_query(
-                "SELECT userid FROM users WHERE userid = ? AND password = ?",
-                (userid, password),
+                "SELECT userid, password FROM users WHERE userid = ?",
+                (userid,),
                 fetch_one=True
             )
-            
-            if user:
-                # 로그인 성공 로그 기록
-                await log_action(self.db_connector, userid, "로그인 성공")
-                return user[0]
-            else:
-                return "로그인 실패"
-        except Exception as e:
-            print(f"Unexpected error during login: {e}")
-            return "로그인 실패"
+            if not user:
+                # 없는 사용자도 해시를 계산해서 응답 시간으로 가입 여부를 알 수 없게 함
+                await self.hasher.verify(password, self.hasher.dummy_hash)
+                return LOGIN_FAILED
+            matched, needs_rehash = await self.hasher.verify(password, user[1])
+            if not matched:
+                return LOGIN_FAILED
+            if needs_rehash:
+                try:
+                    new_hash = await self.hasher.hash(password)
+                except HasherBusy:
+                    new_hash = None  # 비밀번호는 이미 확인됐으므로 다시 해시하는 것만 다음 로그인으로 미룸
+                if new_hash is not None:
+                    # 다른 요청이 먼저 바꿨으면 덮어쓰지 않음
+                    await self.db_connector.execute_query(
+                        "UPDATE users SET password = ? WHERE userid = ? AND password = ?",
+                        (new_hash, userid, user[1])
+                    )
+                    self.hasher.metrics["rehashed"] += 1
+
+            # 로그인 성공 로그 기록
+            await log_action(self.db_connector, userid, "로그인 성공")
+            # 예전처럼 사용자 ID 만 반환 (세션 토큰은 서버가 프레임 연결에만 create_session 으로 붙여줌)
+            return user[0]
+        except HasherBusy:
+            return BUSY_REPLY
+        except Exception:
+            logger.exception("로그인 실패", extra=kv(user=userid))
+            return LOGIN_FAILED
     
-    def logout(self,user_id):
-        """로그아웃 요청 처리"""
+    async def logout(self,user_id):
+        """로그아웃 요청 처리 (사용자의 세션 토큰도 모두 만료)"""
         if user_id in self.clients:
             del self.clients[user_id]
+        self.sessions.revoke_user(user_id)
         return f"{user_id}님이 로그아웃 하셨습니다."
 
-    
-
-
+    async def validate_user(self, user_id):
+        """사용자 ID 유효성 검사 (메모리의 사용자 목록으로 확인)"""
+        return "유효한 사용자 ID입니다." if await self.user_exists(user_id) else "유효하지 않은 사용자 ID입니다."
 
+    def create_session(self, user_id):
+        """세션 토큰 발급: 이후 명령에서 사용자 대신 @토큰 을 보내면 DB 조회 없이 확인"""
+        return self.sessions.create(user_id)
 
+    def resolve_session(self, token):
+        """세션 토큰의 사용자 반환 (없거나 만료됐으면 None)"""
+        return self.sessions.resolve(token)
@@ -0,0 +1,149 @@
+import json
+import re
+
+# 좌석 번호 형식: 열 이름(영문) + 번호 (예: A1, A10, AA3)
+SEAT_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)$")
+OTHER_ROW = "기타"
+
+
+def row_label_index(label):
+    """열 이름을 순번으로 변환 (A=0, Z=25, AA=26 ...)"""
+    index = 0
+    for ch in label.upper():
+        index = index * 26 + (ord(ch) - ord('A') + 1)
+    return index - 1
+
+
+def row_label(index):
+    """순번을 열 이름으로 변환 (0=A, 26=AA ...)"""
+    label = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        label = chr(ord('A') + rem) + label
+    return label
+
+
+def seat_sort_key(seat_number):
+    """좌석 번호 정렬 키 (A2 < A10, Z1 < AA1)"""
+    match = SEAT_PATTERN.match(seat_number)
+    if not match:
+        return (1, 0, 0, seat_number)
+    return (0, row_label_index(match.group(1)), int(match.group(2)), seat_number)
+
+
+class VenueLayout:
+    """공연장 좌석 배치: 구역 목록, 구역마다 (열 이름, 좌석 번호 목록) 순서대로"""
+    def __init__(self, sections):
+        self.sections = [(name, [(label, list(seats)) for label, seats in rows]) for name, rows in sections]
+
+    def seat_numbers(self):
+        """배치 순서대로 모든 좌석 번호"""
+        return [seat for _, rows in self.sections for _, seats in rows for seat in seats]
+
+    def to_json(self):
+        return json.dumps(
+            {"sections": [{"name": name, "rows": [{"label": label, "seats": seats} for label, seats in rows]}
+                          for name, rows in self.sections]},
+            ensure_ascii=False
+        )
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(
+            (section["name"], [(row["label"], row["seats"]) for row in section["rows"]])
+            for section in data["sections"]
+        )
+
+    @classmethod
+    def from_seat_numbers(cls, seat_numbers):
+        """배치 정보가 없는 이벤트: 예전 좌석 현황처럼 번호를 줄, 영문 부분을 칸으로 놓은 격자 (A1 | B1 | C1)
+
+        격자에서 비어 있는 칸은 좌석 번호만 있고 seats 테이블에 없어서 Empty 로 표시된다.
+        """
+        labels, numbers, other = set(), set(), []
+        for seat in seat_numbers:
+            match = SEAT_PATTERN.match(seat)
+            if match and str(int(match.group(2))) == match.group(2):
+                labels.add(match.group(1))
+                numbers.add(int(match.group(2)))
+            else:
+                other.append(seat)
+        labels = sorted(labels, key=lambda label: (row_label_index(label), label))
+        rows = [(str(number), [f"{label}{number}" for label in labels]) for number in sorted(numbers)]
+        if other:
+            rows.append((OTHER_ROW, sorted(other, key=seat_sort_key)))
+        return cls([("", rows)])
+
+    @classmethod
+    def from_spec(cls, spec):
+        """관리장 입력 형식으로 배치 생성: "구역:시작열-끝열:열당좌석수;..." (예: "1층:A-J:30;2층:AA-AF:40")"""
+        sections = []
+        for part in spec.split(";"):
+            part = part.strip()
+            if not part:
+                continue
+            name, row_range, seats_per_row = (item.strip() for item in part.split(":"))
+            start, _, end = row_range.partition("-")
+            first, last = row_label_index(start), row_label_index(end or start)
+            if first > last:
+                raise ValueError(f"열 범위가 잘못되었습니다: {row_range}")
+            rows = []
+            for index in range(first, last + 1):
+                label = row_label(index)
+                rows.append((label, [f"{label}{number}" for number in range(1, int(seats_per_row) + 1)]))
+            sections.append((name, rows))
+        if not sections:
+            raise ValueError("좌석 배치가 비어 있습니다.")
+        seat_numbers = [seat for _, rows in sections for _, seats in rows for seat in seats]
+        if len(seat_numbers) != len(set(seat_numbers)):
+            raise ValueError("구역 사이에 겹치는 좌석 번호가 있습니다.")
+        return cls(sections)
+
+
+class SeatMapTemplate:
+    """배치도 문자열 템플릿: 줄 단위로 미리 만들어 두고 상태가 바뀐 좌석이 있는 줄만 다시 만듦"""
+    ROW_SEPARATOR = " | "
+
+    def __init__(self, event_id, layout, seat_index):
+        self.header = f"Event {event_id} Seat Availability:\n"
+        self.lines = []       # 출력할 줄 (구역 제목 줄 포함)
+        self.row_seats = {}   # 줄 번호 -> [(좌석 번호, 비트맵 인덱스 또는 None)]
+        self.seat_line = {}   # 비트맵 인덱스 -> 줄 번호
+        named = len(layout.sections) > 1 or any(name for name, _ in layout.sections)
+        placed = set()
+        for name, rows in layout.sections:
+            if named:
+                self.lines.append(f"[{name}]")
+            for _, seats in rows:
+                self._add_row([(seat, seat_index.get(seat)) for seat in seats])
+                placed.update(seats)
+        # 배치에 없는 좌석도 빠지지 않도록 마지막 줄에 표시
+        extra = [seat for seat in seat_index if seat not in placed]
+        if extra:
+            self._add_row([(seat, seat_index[seat]) for seat in sorted(extra, key=seat_sort_key)])
+
+    def _add_row(self, seats):
+        line_no = len(self.lines)
+        self.lines.append(None)
+        self.row_seats[line_no] = seats
+        for _, index in seats:
+            if index is not None:
+                self.seat_line[index] = line_no
+
+    def render_line(self, line_no, status_of):
+        return self.ROW_SEPARATOR.join(
+            f"{seat}({status_of(index)})" if index is not None else "Empty"
+            for seat, index in self.row_seats[line_no]
+        )
+
+    def render(self, status_of, changed=None):
+        """배치도 문자열 생성 (changed 가 주어지면 해당 좌석이 있는 줄만 다시 만듦)"""
+        if changed is None:
+            line_nos = self.row_seats
+        else:
+            line_nos = {self.seat_line[index] for index in changed if index in self.seat_line}
+        for line_no in line_nos:
+            self.lines[line_no] = self.render_line(line_no, status_of)
+        return self.header + "\n".join(self.lines) + "\n"
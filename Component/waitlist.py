@@ -0,0 +1,145 @@
+import itertools
+from collections import deque
+from .lock_manager import normalize_event_id
+
+
+class EventWaitlist:
+    """이벤트 하나의 대기열: 들어온 순서대로 번호표를 주고, 맨 앞 번호표와의 차이로 순번을 바로 계산"""
+    __slots__ = ("queue", "tickets", "next_ticket", "head_ticket")
+
+    def __init__(self, rows=()):
+        self.queue = deque()   # (waitlist.id, 사용자) (먼저 온 순서)
+        self.tickets = {}      # 사용자 -> 번호표
+        self.next_ticket = 0   # 다음에 줄 번호표
+        self.head_ticket = 0   # 맨 앞 사용자의 번호표 (맨 앞에서만 빠지므로 번호표가 끊기지 않음)
+        for row_id, user_id in rows:
+            # waitlist.user_id 는 INTEGER 열이라 숫자 ID 는 int 로 읽힘: 명령으로 받는 사용자 ID 와 같은 str 로 맞춤
+            self.append(str(user_id), row_id)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __contains__(self, user_id):
+        return user_id in self.tickets
+
+    def bounds(self):
+        """맨 앞과 맨 뒤 행의 waitlist.id (비어있으면 (None, None))"""
+        if not self.queue:
+            return None, None
+        return self.queue[0][0], self.queue[-1][0]
+
+    def position(self, user_id):
+        """대기 순번 (1부터, 대기 중이 아니면 None)"""
+        ticket = self.tickets.get(user_id)
+        if ticket is None:
+            return None
+        return ticket - self.head_ticket + 1
+
+    def append(self, user_id, row_id=None):
+        """맨 뒤에 추가하고 순번 반환 (이미 있으면 기존 순번)"""
+        if user_id not in self.tickets:
+            self.tickets[user_id] = self.next_ticket
+            self.next_ticket += 1
+            self.queue.append((row_id, user_id))
+        return self.position(user_id)
+
+    def peek(self, count):
+        """맨 앞에서 count 명"""
+        return [user_id for _, user_id in itertools.islice(self.queue, count)]
+
+    def pop(self, count):
+        """맨 앞에서 count 명을 꺼냄"""
+        popped = []
+        for _ in range(min(count, len(self.queue))):
+            _, user_id = self.queue.popleft()
+            del self.tickets[user_id]
+            popped.append(user_id)
+        self.head_ticket += len(popped)
+        return popped
+
+
+class WaitlistStore:
+    """이벤트별 대기열 캐시
+
+    waitlist 테이블이 저널 역할을 한다: 처음 쓸 때 테이블에서 순서대로 복원하고,
+    변경은 호출한 쪽의 트랜잭션에 같이 기록한 뒤 커밋이 끝나면 메모리에 반영한다.
+    (모든 메서드는 이벤트 락을 잡은 상태에서 호출)
+
+    shared 이면 다른 워커 프로세스도 같은 테이블을 바꿀 수 있으므로, 캐시를 쓰기 전에 테이블의 맨 앞/맨 뒤 id 와
+    메모리의 것을 비교해서 다르면 다시 읽는다 (id 는 AUTOINCREMENT 이고 맨 앞에서 빼고 맨 뒤에 넣기만 함).
+    """
+    def __init__(self, db_connector, shared=False):
+        self.db_connector = db_connector
+        self.shared = shared  # 다른 워커 프로세스와 같은 DB 를 쓰면 True (캐시를 쓰기 전에 테이블과 비교)
+        self.events = {}
+
+    def get(self, event_id):
+        return self.events.get(normalize_event_id(event_id))
+
+    async def load(self, event_id, db=None):
+        """캐시에 없거나 테이블과 맞지 않으면 waitlist 테이블에서 대기열 복원 (db: 트랜잭션 또는 커넥터)"""
+        db = db or self.db_connector
+        waitlist = self.get(event_id)
+        if waitlist is not None:
+            if not self.shared:
+                return waitlist
+            bounds = await db.execute_query(
+                "SELECT MIN(id), MAX(id) FROM waitlist WHERE event_id = ?",
+                params=(event_id,),
+                fetch_one=True
+            )
+            if tuple(bounds) == waitlist.bounds():
+                return waitlist
+        rows = await db.execute_query(
+            "SELECT id, user_id FROM waitlist WHERE event_id = ? ORDER BY id",
+            params=(event_id,),
+            fetch_all=True
+        )
+        waitlist = EventWaitlist(rows or [])
+        self.events[normalize_event_id(event_id)] = waitlist
+        return waitlist
+
+    async def join(self, tx, event_id, event_name, user_id):
+        """대기열 등록을 트랜잭션에 기록하고 (예상 순번, 새 행 id) 반환 (이미 대기 중이면 행 id 는 None, 커밋 후 commit_join 호출)"""
+        waitlist = await self.load(event_id, tx)
+        position = waitlist.position(user_id)
+        if position is not None:
+            return position, None
+        row_id = await tx.execute_insert(
+            "INSERT INTO waitlist (user_id, event_id, event_name) VALUES (?, ?, ?)",
+            params=(user_id, event_id, event_name)
+        )
+        return len(waitlist) + 1, row_id
+
+    def commit_join(self, event_id, user_id, row_id):
+        waitlist = self.get(event_id)
+        if waitlist is not None:
+            waitlist.append(user_id, row_id)
+
+    async def promote(self, tx, event_id, event_name, seats):
+        """빈 좌석 수만큼 맨 앞 대기자를 한 번에 예약으로 옮기고 [(사용자, 좌석)] 반환 (커밋 후 commit_promote 호출)"""
+        waitlist = await self.load(event_id, tx)
+        promoted = list(zip(waitlist.peek(len(seats)), seats))
+        if not promoted:
+            return []
+        await tx.execute_many(
+            "INSERT INTO reservations (user_id, event_id, event_name, seat_number) VALUES (?, ?, ?, ?)",
+            [(user_id, event_id, event_name, seat) for user_id, seat in promoted]
+        )
+        await tx.execute_many(
+            "DELETE FROM waitlist WHERE event_id = ? AND user_id = ?",
+            [(event_id, user_id) for user_id, _ in promoted]
+        )
+        return promoted
+
+    def commit_promote(self, event_id, count):
+        waitlist = self.get(event_id)
+        if waitlist is not None:
+            waitlist.pop(count)
+
+    def invalidate(self, event_id=None):
+        """이벤트 하나 (또는 전체) 대기열 캐시 삭제 (다음에 쓸 때 테이블에서 다시 읽음)"""
+        if event_id is None:
+            self.events.clear()
+        else:
+            self.events.pop(normalize_event_id(event_id), None)
@@ -0,0 +1,91 @@
+import ast
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from db import initialize_database
+
+# 검사할 소스 파일 (프로젝트 루트 기준)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FILES = [
+    os.path.join(BASE_DIR, "Component", "event_service.py"),
+    os.path.join(BASE_DIR, "Component", "waitlist.py"),
+    os.path.join(BASE_DIR, "Component", "user_service.py"),
+]
+
+# 쿼리를 실행하는 메서드 이름
+QUERY_METHODS = {"execute_query", "execute_many", "execute_insert"}
+
+# 의도적으로 테이블 전체를 읽는 쿼리 (전체 목록 조회)
+FULL_SCAN_ALLOWED = {
+    "SELECT * FROM events",
+    "SELECT userid FROM users",  # 서버 시작 시 사용자 목록 읽기
+}
+
+
+def normalize(query):
+    """공백을 정리해서 쿼리 비교용 문자열로 변환"""
+    return " ".join(query.split())
+
+
+def extract_queries(path):
+    """소스 파일에서 execute_query 등에 넘기는 SQL 문자열 상수를 추출"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    queries = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        first = node.args[0]
+        if name in QUERY_METHODS and isinstance(first, ast.Constant) and isinstance(first.value, str):
+            queries.append((node.lineno, normalize(first.value)))
+    return sorted(queries)
+
+
+def explain(conn, query):
+    """EXPLAIN QUERY PLAN 결과에서 detail 컬럼만 반환 (파라미터는 NULL 로 바인딩)"""
+    params = [None] * query.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def check_query_plans(db_path, source_files=SOURCE_FILES):
+    """모든 쿼리의 실행 계획을 확인하고, 전체 테이블 스캔이 있는 쿼리 목록을 반환"""
+    failures = []
+    conn = sqlite3.connect(db_path)
+    try:
+        for path in source_files:
+            for lineno, query in extract_queries(path):
+                plan = explain(conn, query)
+                # FROM 없는 SELECT 의 "SCAN CONSTANT ROW" 는 테이블을 읽지 않음
+                scans = [detail for detail in plan if detail.startswith("SCAN") and detail != "SCAN CONSTANT ROW"]
+                status = "OK"
+                if scans and query in FULL_SCAN_ALLOWED:
+                    status = "ALLOWED"
+                elif scans:
+                    status = "SCAN"
+                    failures.append((path, lineno, query, scans))
+                print(f"[{status}] {os.path.basename(path)}:{lineno} {query}")
+                for detail in plan:
+                    print(f"    {detail}")
+    finally:
+        conn.close()
+    return failures
+
+
+if __name__ == "__main__":
+    # 실제 DB 를 건드리지 않도록 임시 DB 에 스키마와 마이그레이션을 적용해서 검사
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "plan_check.db")
+        asyncio.run(initialize_database(db_name=db_path))
+        failures = check_query_plans(db_path)
+
+    if failures:
+        print(f"\n전체 테이블 스캔 쿼리 {len(failures)}개 발견:")
+        for path, lineno, query, scans in failures:
+            print(f"- {os.path.basename(path)}:{lineno} {query} -> {', '.join(scans)}")
+        sys.exit(1)
+    print("\n모든 쿼리가 인덱스를 사용합니다.")
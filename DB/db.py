@@ -1,47 +1,401 @@
 import aiosqlite
 import asyncio
+import logging
 import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# 배포 환경별 SQLite 저장소 설정 (커넥션을 열 때마다 PRAGMA 로 적용)
+STORAGE_PROFILES = {
+    # 커밋마다 fsync: 장애가 나도 커밋된 예약은 사라지지 않음
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,      # 음수는 KiB 단위 (약 16MB)
+        "mmap_size": 0,
+        "busy_timeout": 5000,      # ms
+        "temp_store": "DEFAULT",
+    },
+    # WAL 체크포인트 때만 fsync: 전원 장애 시 마지막 커밋 몇 개는 유실될 수 있음
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,    # 256MB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+# 환경변수 EVENT_DB_PROFILE 로 배포별 기본 프로필 선택
+DEFAULT_STORAGE_PROFILE = os.environ.get("EVENT_DB_PROFILE", "durable")
+
+
+def resolve_storage_profile(profile=None):
+    """프로필 이름 또는 PRAGMA 딕셔너리를 실제 적용할 설정으로 변환 (딕셔너리는 기본 프로필 위에 덮어씀)"""
+    if profile is None:
+        profile = DEFAULT_STORAGE_PROFILE
+    if isinstance(profile, str):
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"알 수 없는 저장소 프로필: {profile}")
+        return dict(STORAGE_PROFILES[profile])
+    unknown = set(profile) - set(STORAGE_PROFILES["durable"])
+    if unknown:
+        raise ValueError(f"지원하지 않는 PRAGMA: {', '.join(sorted(unknown))}")
+    return {**STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE], **profile}
+
+
+async def apply_storage_profile(conn, profile):
+    """커넥션에 저장소 프로필 PRAGMA 적용"""
+    for pragma, value in profile.items():
+        await conn.execute(f"PRAGMA {pragma} = {value}")
+
+# 지금 처리 중인 명령의 쿼리 통계 (Component.metrics 가 명령마다 설정, 없으면 기록하지 않음)
+query_stats = ContextVar("query_stats", default=None)
+
+
+def record_query(started):
+    """쿼리 하나의 실행 시간을 현재 명령의 통계에 더함"""
+    stats = query_stats.get()
+    if stats is not None:
+        stats.add_query(time.perf_counter() - started)
+
+
+class Transaction:
+    """트랜잭션 하나에 고정된 커넥션 (execute_query 와 같은 방식으로 사용)"""
+    def __init__(self, connector, conn):
+        self.connector = connector
+        self.conn = conn
+        self.pending_logs = []  # 커밋 후 로그 writer 로 넘길 감사 로그
+
+    @property
+    def log_sink(self):
+        """로그 writer 가 있으면 커밋 전까지 로그를 모아두는 자기 자신을 반환"""
+        return self if self.connector.log_sink is not None else None
+
+    async def submit(self, user_id, action, event_id=None):
+        """트랜잭션이 커밋되면 기록할 로그 추가 (롤백되면 버려짐)"""
+        self.pending_logs.append((user_id, action, event_id, time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())))
+
+    async def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
+        """트랜잭션 안에서 쿼리 실행 (커밋은 트랜잭션 종료 시 한 번만, 에러는 롤백되도록 그대로 전달)"""
+        started = time.perf_counter()
+        try:
+            async with self.conn.cursor() as cursor:
+                await cursor.execute(query, params or [])
+                if fetch_one:
+                    return await cursor.fetchone()
+                if fetch_all:
+                    return await cursor.fetchall()
+                return cursor.rowcount
+        finally:
+            record_query(started)
+
+    async def execute_insert(self, query, params=None):
+        """INSERT 실행 후 새 행의 rowid 반환"""
+        started = time.perf_counter()
+        try:
+            async with self.conn.cursor() as cursor:
+                await cursor.execute(query, params or [])
+                return cursor.lastrowid
+        finally:
+            record_query(started)
+
+    async def execute_many(self, query, params_list):
+        """같은 쿼리를 여러 파라미터로 한 번에 실행"""
+        started = time.perf_counter()
+        try:
+            async with self.conn.cursor() as cursor:
+                await cursor.executemany(query, params_list)
+                return cursor.rowcount
+        finally:
+            record_query(started)
+
 
 class AsyncDatabaseConnector:
-    def __init__(self, db_name="event_system.db"):
+    def __init__(self, db_name="event_system.db", pool_size=5, health_check_interval=30.0, storage_profile=None):
         # server 디렉토리의 절대경로를 기준으로 데이터베이스 파일 경로 설정
         self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), db_name)
         self.connection = None
+        self.storage_profile = resolve_storage_profile(storage_profile)
+        self.log_sink = None  # 감사 로그 백그라운드 writer (Component.log_sink.AsyncLogSink)
+        # 커넥션 풀 설정 (풀은 이벤트 루프 안에서 처음 사용할 때 생성)
+        self.pool_size = pool_size
+        self.health_check_interval = health_check_interval
+        self._pool = None
+        self._opened = 0
+        self._idle_since = {}
+        self.pool_metrics = {
+            "leases": 0,        # 커넥션 대여 횟수
+            "opened": 0,        # 새로 연 커넥션 수
+            "discarded": 0,     # 헬스체크 실패 등으로 버린 커넥션 수
+            "waits": 0,         # 빈 커넥션이 없어 대기한 횟수
+            "wait_time": 0.0,   # 대기한 총 시간(초)
+            "max_wait": 0.0,    # 가장 오래 대기한 시간(초)
+        }
 
     async def connect(self):
         if not self.connection:
             self.connection = await aiosqlite.connect(self.db_path)
+            await apply_storage_profile(self.connection, self.storage_profile)
         return self.connection
     async def __aenter__(self):
         self.connection = await self.connect()
         return self.connection
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """단일 커넥션과 풀에 있는 모든 커넥션 종료"""
         if self.connection:
             await self.connection.close()
-            
+            self.connection = None
+        if self._pool is not None:
+            while not self._pool.empty():
+                conn = self._pool.get_nowait()
+                if conn is not None:
+                    await self._discard(conn, count=False, replace=False)
+
+    async def _open_connection(self):
+        """풀에 넣을 새 커넥션 생성"""
+        conn = await aiosqlite.connect(self.db_path)
+        try:
+            await apply_storage_profile(conn, self.storage_profile)
+        except Exception:
+            await conn.close()
+            raise
+        self.pool_metrics["opened"] += 1
+        return conn
+
+    async def _discard(self, conn, count=True, replace=True):
+        """커넥션을 닫고 풀에서 제거 (대기 중인 요청이 새로 열 수 있도록 빈 자리 표시를 넣음)"""
+        self._opened -= 1
+        self._idle_since.pop(conn, None)
+        if count:
+            self.pool_metrics["discarded"] += 1
+        if replace and self._pool is not None:
+            self._pool.put_nowait(None)
+        try:
+            await conn.close()
+        except Exception as e:
+            logger.warning("Error closing pooled connection: %s", e)
+
+    async def _is_healthy(self, conn):
+        """오래 쉬고 있던 커넥션은 사용 전에 살아있는지 확인"""
+        idle_since = self._idle_since.pop(conn, None)
+        if idle_since is not None and time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    async def _acquire(self):
+        """풀에서 커넥션 대여 (없으면 풀 크기까지 새로 열고, 가득 차면 반납될 때까지 대기)"""
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+        while True:
+            if self._pool.empty() and self._opened < self.pool_size:
+                self._opened += 1
+                try:
+                    conn = await self._open_connection()
+                except Exception:
+                    self._opened -= 1
+                    raise
+            else:
+                if self._pool.empty():
+                    started = time.perf_counter()
+                    conn = await self._pool.get()
+                    waited = time.perf_counter() - started
+                    self.pool_metrics["waits"] += 1
+                    self.pool_metrics["wait_time"] += waited
+                    self.pool_metrics["max_wait"] = max(self.pool_metrics["max_wait"], waited)
+                else:
+                    conn = self._pool.get_nowait()
+                if conn is None:
+                    # 버려진 커넥션의 빈 자리: 다음 반복에서 새 커넥션을 연다
+                    continue
+                if not await self._is_healthy(conn):
+                    await self._discard(conn)
+                    continue
+            self.pool_metrics["leases"] += 1
+            return conn
+
+    def _release(self, conn):
+        """사용이 끝난 커넥션을 풀에 반납"""
+        self._idle_since[conn] = time.monotonic()
+        self._pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def lease(self):
+        """풀에서 커넥션을 빌려 쓰고 반납 (예외가 나면 트랜잭션을 되돌리고, 실패하면 버림)"""
+        conn = await self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                await asyncio.shield(conn.rollback())
+            except BaseException:
+                await self._discard(conn)
+                raise
+            self._release(conn)
+            raise
+        else:
+            self._release(conn)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """커넥션 하나를 고정해서 BEGIN IMMEDIATE ~ COMMIT 으로 묶음 (예외가 나면 lease 에서 롤백)"""
+        async with self.lease() as conn:
+            await conn.execute("BEGIN IMMEDIATE")
+            tx = Transaction(self, conn)
+            yield tx
+            started = time.perf_counter()
+            await conn.commit()
+            record_query(started)  # 커밋(fsync)도 DB 시간에 포함
+        # 커밋된 트랜잭션의 감사 로그만 writer 로 전달
+        for entry in tx.pending_logs:
+            await self.log_sink.submit(*entry)
+
+    def get_pool_stats(self):
+        """풀 상태와 대기 지표 반환"""
+        idle = len(self._idle_since)
+        return {
+            "size": self.pool_size,
+            "open": self._opened,
+            "idle": idle,
+            "in_use": self._opened - idle,
+            **self.pool_metrics,
+        }
+
     async def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
         """쿼리 실행 및 결과 반환"""
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(query, params or [])
-                    if fetch_one:
-                        return await cursor.fetchone()
-                    if fetch_all:
-                        return await cursor.fetchall()
-                    await conn.commit()
+            async with self.lease() as conn:
+                started = time.perf_counter()
+                try:
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(query, params or [])
+                        if fetch_one:
+                            return await cursor.fetchone()
+                        if fetch_all:
+                            return await cursor.fetchall()
+                        await conn.commit()
+                finally:
+                    record_query(started)
         except Exception as e:
-            print(f"Error executing query: {e}")
+            logger.error("Error executing query: %s", e)
+
+
+# 스키마 마이그레이션: (버전, 설명, 쿼리 목록)
+# 버전 순서대로 한 번씩만 적용되며, 각 쿼리는 다시 실행해도 안전하게(IF NOT EXISTS) 작성한다.
+# 이미 배포된 마이그레이션은 수정하지 말고 새 버전을 뒤에 추가할 것.
+MIGRATIONS = [
+    (1, "좌석 조회 인덱스 (event_id, seat_number)", [
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_seats_event_seat ON seats(event_id, seat_number)",
+    ]),
+    (2, "예약 조회 인덱스 (user_id, event_id) / (event_id, seat_number)", [
+        "CREATE INDEX IF NOT EXISTS idx_reservations_user_event ON reservations(user_id, event_id)",
+        "CREATE INDEX IF NOT EXISTS idx_reservations_event_seat ON reservations(event_id, seat_number)",
+    ]),
+    (3, "대기자 순서 인덱스 (event_id, id)", [
+        "CREATE INDEX IF NOT EXISTS idx_waitlist_event ON waitlist(event_id, id)",
+    ]),
+    (4, "사용자 로그 인덱스 (user_id, timestamp)", [
+        "CREATE INDEX IF NOT EXISTS idx_logs_user_time ON logs(user_id, timestamp)",
+    ]),
+    (5, "이벤트 목록 버전 (events 가 바뀔 때마다 트리거로 증가)", [
+        '''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        ''',
+        # 테이블을 지우고 다시 만들어도 버전이 뒤로 가지 않도록 현재 시각으로 시작
+        "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, CAST(strftime('%s', 'now') AS INTEGER))",
+        "CREATE TRIGGER IF NOT EXISTS trg_events_insert_version AFTER INSERT ON events "
+        "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+        "CREATE TRIGGER IF NOT EXISTS trg_events_update_version AFTER UPDATE ON events "
+        "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+        "CREATE TRIGGER IF NOT EXISTS trg_events_delete_version AFTER DELETE ON events "
+        "BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END",
+    ]),
+    (6, "이벤트별 좌석 상태 비트맵", [
+        '''
+        CREATE TABLE IF NOT EXISTS seat_bitmaps (
+            event_id INTEGER PRIMARY KEY,
+            bitmap BLOB NOT NULL,  -- Component.seat_cache.SeatBitmap.to_bytes() 형식
+            FOREIGN KEY(event_id) REFERENCES events(id)
+        )
+        ''',
+    ]),
+    (7, "이벤트별 공연장 좌석 배치", [
+        '''
+        CREATE TABLE IF NOT EXISTS venue_layouts (
+            event_id INTEGER PRIMARY KEY,
+            layout TEXT NOT NULL,  -- Component.venue_layout.VenueLayout.to_json() 형식
+            FOREIGN KEY(event_id) REFERENCES events(id)
+        )
+        ''',
+    ]),
+    (8, "대기자 중복 제거 및 (event_id, user_id) 유니크 인덱스", [
+        # 같은 사용자가 여러 번 등록된 경우 가장 먼저 등록한 것만 남김
+        "DELETE FROM waitlist WHERE id NOT IN (SELECT MIN(id) FROM waitlist GROUP BY event_id, user_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_waitlist_event_user ON waitlist(event_id, user_id)",
+    ]),
+    (9, "사용자 로그를 이벤트별로 조회하는 인덱스 (user_id, event_id, timestamp)", [
+        "CREATE INDEX IF NOT EXISTS idx_logs_user_event_time ON logs(user_id, event_id, timestamp)",
+    ]),
+    (10, "이벤트 목록 조건 검색 인덱스 (날짜, 이름, 남은 티켓이 있는 이벤트의 날짜)", [
+        "CREATE INDEX IF NOT EXISTS idx_events_date ON events(date)",
+        "CREATE INDEX IF NOT EXISTS idx_events_name ON events(name)",
+        "CREATE INDEX IF NOT EXISTS idx_events_available_date ON events(date) WHERE available_tickets > 0",
+    ]),
+]
+
+
+async def apply_migrations(conn):
+    """schema_version 기준으로 아직 적용되지 않은 마이그레이션을 순서대로 적용"""
+    await conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    await conn.commit()
+    async with conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version") as cursor:
+        current_version = (await cursor.fetchone())[0]
+
+    applied = []
+    for version, description, statements in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version <= current_version:
+            continue
+        # 마이그레이션 하나는 버전 기록까지 하나의 트랜잭션으로 적용
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in statements:
+                await conn.execute(statement)
+            await conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        applied.append(version)
+    return applied
 
 
 # 데이터베이스 초기화
-async def initialize_database():
+async def initialize_database(db_name="event_system.db", storage_profile=None):
     """데이터베이스 초기화"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(base_dir, "event_system.db")
-
-    connector = AsyncDatabaseConnector(db_name=db_path)
+    connector = AsyncDatabaseConnector(db_name=db_name, storage_profile=storage_profile)
     async with connector as conn:
         async with conn.cursor() as cursor:
             # 병렬로 쿼리 실행
@@ -106,5 +460,10 @@ async def initialize_database():
             # 병렬 실행 및 완료 대기
             await asyncio.gather(*tasks)
             await conn.commit()
+
+        # 테이블 생성 후 인덱스 등 스키마 변경 적용
+        applied = await apply_migrations(conn)
+        if applied:
+            logger.info("마이그레이션 적용 완료: %s", applied)
         
 
@@ -1,6 +1,18 @@
 import asyncio
+import os
+import sys
 from db import initialize_database, AsyncDatabaseConnector
 
+# 프로젝트 루트의 Component 모듈 사용 (python DB/manage.py 로 실행되는 경우)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.seat_cache import SeatBitmap
+from Component.venue_layout import VenueLayout
+from protocol import FrameDecoder, encode_frame
+
+# 실행 중인 서버 주소 (이벤트를 바꾼 뒤 캐시 새로고침 요청용)
+SERVER_HOST = os.environ.get("EVENT_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("EVENT_SERVER_PORT", "5000"))
+
 
 class manage(AsyncDatabaseConnector):
     async def drop_all_tables(self):
@@ -28,6 +40,9 @@ class manage(AsyncDatabaseConnector):
             )
             if existing_table:
                 await self.execute_query(f"DROP TABLE IF EXISTS {table_name}")
+                # 테이블과 함께 인덱스/트리거도 지워지므로, 다음 초기화 때 마이그레이션을 처음부터 다시 적용
+                if table_name != "schema_version":
+                    await self.execute_query("DELETE FROM schema_version")
                 print(f"테이블 '{table_name}'이 삭제되었습니다.")
             else:
                 print(f"테이블 '{table_name}'이 존재하지 않습니다.")
@@ -58,8 +73,12 @@ class manage(AsyncDatabaseConnector):
         except Exception as e:
             print(f"Error while creating event '{name}': {e}")
         
-    async def update_event(self, event_id, name=None, description=None, date=None, available_tickets=None):
-        """이벤트 내용 수정"""
+    async def update_event(self, event_id, name=None, description=None, date=None):
+        """이벤트 내용 수정
+
+        잔여 티켓 수는 좌석 상태에서 계산하므로 여기서 바꾸지 않는다 (서버가 좌석 비트맵 기준으로 다시 덮어씀).
+        좌석을 늘리고 대기자를 자동 예약하려면 set_venue_layout 으로 좌석을 추가할 것.
+        """
         try:
             # 수정할 이벤트가 존재하는지 확인
             existing_event = await self.execute_query(
@@ -84,9 +103,6 @@ class manage(AsyncDatabaseConnector):
             if date:
                 fields.append("date = ?")
                 params.append(date)
-            if available_tickets is not None:
-                fields.append("available_tickets = ?")
-                params.append(available_tickets)
 
             if not fields:
                 raise ValueError("수정할 내용이 제공되지 않았습니다.")
@@ -96,10 +112,79 @@ class manage(AsyncDatabaseConnector):
             query = f"UPDATE events SET {', '.join(fields)} WHERE id = ?"
             await self.execute_query(query, params)
             print(f"이벤트 ID {event_id}가 성공적으로 수정되었습니다.")
+            await self.notify_server(event_id)
             
         except Exception as e:
             print(f"Error while updating event '{event_id}': {e}")
         
+    async def set_venue_layout(self, event_id, spec):
+        """이벤트 좌석 배치 등록 (배치에 있는데 아직 없는 좌석은 새로 추가)"""
+        try:
+            existing_event = await self.execute_query(
+                "SELECT id FROM events WHERE id = ?",
+                (event_id,),
+                fetch_one=True
+            )
+            if not existing_event:
+                print(f"이벤트 ID {event_id}는 존재하지 않습니다.")
+                return
+
+            layout = VenueLayout.from_spec(spec)
+            async with self.transaction() as tx:
+                await tx.execute_many(
+                    "INSERT OR IGNORE INTO seats (event_id, seat_number, status) VALUES (?, ?, '예약 가능')",
+                    [(event_id, seat) for seat in layout.seat_numbers()]
+                )
+                await tx.execute_query(
+                    "INSERT OR REPLACE INTO venue_layouts (event_id, layout) VALUES (?, ?)",
+                    (event_id, layout.to_json())
+                )
+                # 좌석 수가 바뀌었으므로 저장된 좌석 비트맵도 seats 기준으로 다시 만들어 저장
+                seats = await tx.execute_query(
+                    "SELECT seat_number, status FROM seats WHERE event_id = ? ORDER BY id",
+                    (event_id,),
+                    fetch_all=True
+                )
+                bitmap = SeatBitmap.from_seats(seats)
+                await tx.execute_query(
+                    "INSERT OR REPLACE INTO seat_bitmaps (event_id, bitmap) VALUES (?, ?)",
+                    (event_id, bitmap.to_bytes())
+                )
+                # 잔여 티켓 수를 실제 좌석 기준으로 맞춤
+                await tx.execute_query(
+                    "UPDATE events SET available_tickets = ? WHERE id = ?",
+                    (bitmap.available(), event_id)
+                )
+            print(f"이벤트 ID {event_id}의 좌석 배치가 등록되었습니다. (좌석 {len(layout.seat_numbers())}개)")
+            await self.notify_server(event_id)
+        except Exception as e:
+            print(f"Error while setting venue layout for event '{event_id}': {e}")
+
+    async def notify_server(self, event_id, timeout=3.0):
+        """실행 중인 서버에 이벤트 새로고침 요청 (캐시를 다시 읽고, 좌석이 늘어 빈 좌석이 생겼으면 그만큼 대기자 자동 예약,
+        서버가 꺼져 있으면 생략)"""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(SERVER_HOST, SERVER_PORT), timeout)
+        except (OSError, asyncio.TimeoutError):
+            print("실행 중인 서버가 없어 새로고침 요청을 생략합니다. (서버 시작 시 DB 에서 읽음)")
+            return
+        try:
+            writer.write(encode_frame(f"refresh_event {event_id}"))
+            await writer.drain()
+            decoder = FrameDecoder()
+            messages = []
+            while not messages:
+                data = await asyncio.wait_for(reader.read(65536), timeout)
+                if not data:
+                    break
+                messages = decoder.feed(data)
+            for message in messages:
+                print(f"서버: {message.removeprefix('response:')}")
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"서버에 새로고침 요청을 보내지 못했습니다: {e}")
+        finally:
+            writer.close()
+
     async def get_event_reservations(self, event_id):
         """특정 이벤트의 예약자 목록 조회"""
         query = '''
@@ -128,6 +213,11 @@ class UserInputHandler:
         available_tickets = int(input("사용 가능한 티켓 수: "))
         return name, description, date, available_tickets
 
+    @staticmethod
+    def get_layout_spec():
+        print("형식: 구역:시작열-끝열:열당좌석수;... (예: 1층:A-J:30;2층:AA-AF:40)")
+        return input("좌석 배치: ")
+
     @staticmethod
     def get_event_id():
         return int(input("수정할 이벤트의 ID를 입력하세요: "))
@@ -141,12 +231,16 @@ class RequestData(manage):
     async def update_event_with_input(self):
         event_id = UserInputHandler.get_event_id()
         print("수정할 필드만 입력하고, 생략할 필드는 Enter를 누르세요.")
+        print("티켓 수를 늘리려면 '이벤트 좌석 배치 등록'으로 좌석을 추가하세요.")
         name = input("수정할 이름: ") or None
         description = input("수정할 설명: ") or None
         date = input("수정할 날짜 (YYYY-MM-DD): ") or None
-        available_tickets = input("수정할 티켓 수: ")
-        available_tickets = int(available_tickets) if available_tickets else None
-        await self.update_event(event_id, name, description, date, available_tickets)
+        await self.update_event(event_id, name, description, date)
+
+    async def set_venue_layout_with_input(self):
+        event_id = UserInputHandler.get_event_id()
+        spec = UserInputHandler.get_layout_spec()
+        await self.set_venue_layout(event_id, spec)
 
 async def first_data():
     """초기 이벤트 데이터 삽입"""
@@ -199,6 +293,7 @@ if __name__ == "__main__":
             print("3. 새로운 이벤트 생성")
             print("4. 이벤트 내용 수정")
             print("5. 이벤트 예약자 목록 조회")
+            print("6. 이벤트 좌석 배치 등록")
 
             choice = input("Enter your choice: ")
 
@@ -216,6 +311,8 @@ if __name__ == "__main__":
             elif choice == "5":
                 event_id = int(input("예약자 목록을 확인할 이벤트 ID: "))
                 await system.get_event_reservations(event_id)
+            elif choice == "6":
+                await system.set_venue_layout_with_input()
             else:
                 print("올바른 번호를 입력하세요.")
 
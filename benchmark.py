@@ -0,0 +1,385 @@
+import abc
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from DB.db import AsyncDatabaseConnector, initialize_database
+from Component.event_service import AsyncEventService
+from Component.user_service import AsyncUserService
+from Component.log_sink import AsyncLogSink, log_timestamp
+from loadtest import percentile, seat_layout, seed_event
+
+# 벤치마크 결과 파일 형식 버전 (필드가 바뀌면 증가)
+RESULT_FORMAT = 1
+
+
+def summarize(samples, params, setup_s):
+    """호출별 소요 시간(초) 목록을 결과 항목으로 정리"""
+    values = sorted(samples)
+    total = sum(values)
+    return {
+        "params": params,
+        "setup_s": setup_s,
+        "ops": len(values),
+        "total_s": total,
+        "ops_per_s": len(values) / total if total else 0.0,
+        "mean_ms": total / len(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000 if values else 0.0,
+    }
+
+
+def bench_event(conn, event_id, seat_numbers, reserved_by=()):
+    """벤치마크용 이벤트 생성 (좌석 배치는 저장하지 않고 좌석 번호로 만듦)"""
+    seed_event(conn, event_id, f"벤치마크{event_id}", seat_numbers, reserved_by)
+
+
+class Bench(abc.ABC):
+    """시나리오 하나: 임시 DB 를 채우고(seed), 서비스 메서드를 직접 호출해 시간을 잼(run)"""
+    name = None
+
+    def __init__(self, scale):
+        self.scale = scale
+
+    def size(self, value):
+        return max(1, int(value * self.scale))
+
+    def params(self):
+        return {}
+
+    @abc.abstractmethod
+    def seed(self, conn):
+        """임시 DB 채우기"""
+
+    @abc.abstractmethod
+    async def run(self, event_service, user_service):
+        """호출별 소요 시간(초) 목록 반환"""
+
+
+async def timed_calls(calls, expected):
+    """코루틴을 하나씩 실행하며 소요 시간 측정 (응답이 expected 로 시작하지 않으면 실패한 호출까지 재는 셈이므로 중단)"""
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        response = await call()
+        samples.append(time.perf_counter() - started)
+        if not response.startswith(expected):
+            raise RuntimeError(f"예상과 다른 응답: {response!r} (기대: {expected!r})")
+    return samples
+
+
+class ReserveEmpty(Bench):
+    """비어있는 이벤트에 예약"""
+    name = "reserve_empty"
+
+    def params(self):
+        return {"seats": self.size(1000), "reservations": self.size(200)}
+
+    def seed(self, conn):
+        self.seats = seat_layout(self.params()["seats"]).seat_numbers()
+        bench_event(conn, 1, self.seats)
+
+    async def run(self, event_service, user_service):
+        count = self.params()["reservations"]
+        return await timed_calls(
+            ((lambda n=n: event_service.reserve_ticket(f"user{n}", 1, self.seats[n])) for n in range(count)),
+            "티켓 예약 성공"
+        )
+
+
+class ReserveNearlyFull(Bench):
+    """남은 좌석이 얼마 없는 이벤트에 예약 (기존 예약이 많은 상태)"""
+    name = "reserve_nearly_full"
+
+    def params(self):
+        return {"seats": self.size(10000), "reservations": self.size(200)}
+
+    def seed(self, conn):
+        params = self.params()
+        self.seats = seat_layout(params["seats"]).seat_numbers()
+        self.free = self.seats[-params["reservations"]:]
+        taken = self.seats[:-params["reservations"]]
+        bench_event(conn, 1, self.seats, [(f"holder{n}", seat) for n, seat in enumerate(taken)])
+
+    async def run(self, event_service, user_service):
+        return await timed_calls(
+            ((lambda n=n, seat=seat: event_service.reserve_ticket(f"user{n}", 1, seat))
+             for n, seat in enumerate(self.free)),
+            "티켓 예약 성공"
+        )
+
+
+class ReserveGroup(Bench):
+    """여러 좌석 단체 예약 (reserve_tickets)"""
+    name = "reserve_group"
+
+    def params(self):
+        return {"seats": self.size(1200), "groups": self.size(200), "group_size": 6}
+
+    def seed(self, conn):
+        self.seats = seat_layout(self.params()["seats"]).seat_numbers()
+        bench_event(conn, 1, self.seats)
+
+    async def run(self, event_service, user_service):
+        params = self.params()
+        size = params["group_size"]
+        groups = [",".join(self.seats[n * size:(n + 1) * size]) for n in range(params["groups"])]
+        return await timed_calls(
+            ((lambda n=n, group=group: event_service.reserve_tickets(f"user{n}", 1, group))
+             for n, group in enumerate(groups) if group),
+            "티켓 "
+        )
+
+
+class CancelDeepWaitlist(Bench):
+    """대기자가 많이 쌓인 매진 이벤트에서 취소 (취소마다 대기자 자동 예약)"""
+    name = "cancel_deep_waitlist"
+
+    def params(self):
+        return {"cancels": self.size(200), "waitlist": self.size(10000)}
+
+    def seed(self, conn):
+        params = self.params()
+        seats = seat_layout(params["cancels"]).seat_numbers()[:params["cancels"]]
+        self.holders = [f"holder{n}" for n in range(len(seats))]
+        bench_event(conn, 1, seats, list(zip(self.holders, seats)))
+        conn.executemany(
+            "INSERT INTO waitlist (user_id, event_id, event_name) VALUES (?, 1, '벤치마크1')",
+            [(f"waiter{n}",) for n in range(params["waitlist"])]
+        )
+
+    async def run(self, event_service, user_service):
+        return await timed_calls(
+            ((lambda user=user: event_service.cancel_reservation(user, 1)) for user in self.holders),
+            "Reservation canceled"
+        )
+
+
+class ReservationsForUser(Bench):
+    """예약이 많은 사용자의 예약 내역 조회"""
+    name = "reservations_for_user"
+
+    def params(self):
+        return {"reservations": self.size(10000), "events": self.size(100), "repeat": 20}
+
+    def seed(self, conn):
+        params = self.params()
+        per_event = (params["reservations"] + params["events"] - 1) // params["events"]
+        seats = seat_layout(per_event).seat_numbers()[:per_event]
+        remaining = params["reservations"]
+        for event_id in range(1, params["events"] + 1):
+            mine = seats[:min(per_event, remaining)]
+            remaining -= len(mine)
+            bench_event(conn, event_id, seats, [("heavy", seat) for seat in mine])
+
+    async def run(self, event_service, user_service):
+        return await timed_calls(
+            ((lambda: event_service.get_all_reservations_for_user("heavy")) for _ in range(self.params()["repeat"])),
+            "사용자 heavy의 예약 내역"
+        )
+
+
+class UserLogs(Bench):
+    """로그가 많이 쌓인 DB 에서 사용자 로그 조회"""
+    name = "user_logs"
+
+    def params(self):
+        return {"rows": self.size(1000000), "users": self.size(1000), "repeat": 20}
+
+    def seed(self, conn):
+        params = self.params()
+        timestamp = log_timestamp()
+        conn.executemany(
+            "INSERT INTO logs (user_id, action, event_id, timestamp) VALUES (?, ?, ?, ?)",
+            ((f"user{n % params['users']}", "벤치마크 로그", 1, timestamp) for n in range(params["rows"]))
+        )
+
+    async def run(self, event_service, user_service):
+        return await timed_calls(
+            ((lambda: event_service.get_user_logs("user0")) for _ in range(self.params()["repeat"])),
+            "User ID: user0"
+        )
+
+
+class UserLogsStream(UserLogs):
+    """사용자 로그 전체를 stream 모드로 끝까지 받기"""
+    name = "user_logs_stream"
+
+    async def run(self, event_service, user_service):
+        async def drain():
+            first = None
+            async for chunk in await event_service.get_user_logs("user0", "stream"):
+                first = first or chunk
+            return first
+        return await timed_calls((drain for _ in range(self.params()["repeat"])), "User ID: user0")
+
+
+class RegisterLogin(Bench):
+    """회원가입 후 로그인"""
+    name = "register_login"
+
+    def params(self):
+        return {"users": self.size(200)}
+
+    def seed(self, conn):
+        pass
+
+    async def run(self, event_service, user_service):
+        count = self.params()["users"]
+        samples = await timed_calls(
+            ((lambda n=n: user_service.register_user(f"user{n}", f"pw{n}")) for n in range(count)),
+            "User 'user"
+        )
+        samples += await timed_calls(
+            ((lambda n=n: user_service.login(f"user{n}", f"pw{n}")) for n in range(count)),
+            "user"
+        )
+        return samples
+
+
+class ReserveDuringLoginBurst(Bench):
+    """로그인이 몰리는 동안 예약 (비밀번호 해시가 이벤트 루프를 막으면 예약 지연이 커짐, reserve_empty 와 비교)"""
+    name = "reserve_login_burst"
+
+    def params(self):
+        return {"seats": self.size(1000), "reservations": self.size(200), "logins": self.size(200)}
+
+    def seed(self, conn):
+        params = self.params()
+        self.seats = seat_layout(params["seats"]).seat_numbers()
+        bench_event(conn, 1, self.seats)
+        # 평문 비밀번호로 넣어서 로그인마다 다시 해시하게 함
+        conn.executemany(
+            "INSERT INTO users (userid, password) VALUES (?, ?)",
+            [(f"burst{n}", f"pw{n}") for n in range(params["logins"])]
+        )
+
+    async def run(self, event_service, user_service):
+        burst = asyncio.gather(
+            *(user_service.login(f"burst{n}", f"pw{n}") for n in range(self.params()["logins"]))
+        )
+        samples = await timed_calls(
+            ((lambda n=n: event_service.reserve_ticket(f"user{n}", 1, self.seats[n]))
+             for n in range(self.params()["reservations"])),
+            "티켓 예약 성공"
+        )
+        await burst
+        return samples
+
+
+SCENARIOS = [ReserveEmpty, ReserveNearlyFull, ReserveGroup, CancelDeepWaitlist, ReservationsForUser, UserLogs, UserLogsStream, RegisterLogin,
+             ReserveDuringLoginBurst]
+
+
+async def run_scenario(bench, args):
+    """시나리오마다 새 임시 DB 에서 실행"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        started = time.perf_counter()
+        await initialize_database(db_name=db_path, storage_profile=args.profile)
+        conn = sqlite3.connect(db_path)
+        with conn:
+            bench.seed(conn)
+        conn.close()
+        setup_s = time.perf_counter() - started
+
+        connector = AsyncDatabaseConnector(db_name=db_path, storage_profile=args.profile)
+        log_sink = None
+        if args.log_sink:
+            # 서버와 같은 구성: 감사 로그는 백그라운드 writer 가 모아서 기록
+            log_sink = AsyncLogSink(connector)
+            connector.log_sink = log_sink
+            log_sink.start()
+        clients = {}
+        event_service = AsyncEventService(connector, clients)
+        user_service = AsyncUserService(connector, clients)
+        try:
+            samples = await bench.run(event_service, user_service)
+        finally:
+            user_service.hasher.close()
+            if log_sink is not None:
+                await log_sink.close()
+            await connector.close()
+    return summarize(samples, bench.params(), setup_s)
+
+
+def compare(results, baseline, threshold):
+    """기준 결과와 p50 을 비교해서 threshold 비율 이상 느려진 시나리오 목록 반환"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None or before["params"] != result["params"] or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        result["baseline_p50_ms"] = before["p50_ms"]
+        result["change"] = ratio - 1
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results, regressions):
+    print(f"{'scenario':<24}{'ops':>8}{'ops/s':>10}{'p50ms':>10}{'p95ms':>10}{'p99ms':>10}{'maxms':>10}{'change':>9}")
+    for name, r in results.items():
+        change = f"{r['change']:+.0%}" if "change" in r else "-"
+        mark = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<24}{r['ops']:>8}{r['ops_per_s']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}{change:>9}{mark}")
+
+
+async def main(args):
+    selected = [cls for cls in SCENARIOS if not args.only or cls.name in args.only]
+    results = {}
+    for cls in selected:
+        bench = cls(args.scale)
+        print(f"{bench.name} 실행 중... {bench.params()}")
+        results[bench.name] = await run_scenario(bench, args)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    print_results(results, regressions)
+
+    if args.output:
+        report = {
+            "format": RESULT_FORMAT,
+            "created_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "profile": args.profile,
+            "log_sink": args.log_sink,
+            "scale": args.scale,
+            "scenarios": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if regressions:
+        print(f"기준보다 {args.threshold:.0%} 이상 느려진 시나리오: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="이벤트/사용자 서비스 마이크로 벤치마크")
+    parser.add_argument("--only", type=lambda value: value.split(","), default=None,
+                        help="실행할 시나리오 (쉼표로 구분): " + ", ".join(cls.name for cls in SCENARIOS))
+    parser.add_argument("--scale", type=float, default=1.0, help="데이터 크기 배율 (빠른 확인은 0.01 등)")
+    parser.add_argument("--profile", default=None, help="저장소 프로필 (durable/throughput)")
+    parser.add_argument("--log-sink", action=argparse.BooleanOptionalAction, default=True,
+                        help="서버처럼 감사 로그를 백그라운드 writer 로 기록")
+    parser.add_argument("--output", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 p50 증가 비율")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,7 +1,9 @@
 import asyncio
+import itertools
 from prompt_toolkit import PromptSession
 from prompt_toolkit.patch_stdout import patch_stdout
 import subprocess 
+from protocol import FrameDecoder, attach_request_id, encode_frame, split_request_id
 
 class EventClient:
     def __init__(self, host='127.0.0.1', port=5000):
@@ -10,8 +12,12 @@ class EventClient:
         self.reader = None
         self.writer = None
         self.login_user = None
-        self.session = PromptSession()
-        self.queue = asyncio.Queue()  # 수신 데이터를 관리할 큐
+        self.session_token = None  # 로그인할 때 받은 세션 토큰 (명령에 사용자 ID 대신 @토큰 으로 보냄)
+        self.pending = {}  # 요청 ID -> 응답을 기다리는 future
+        self.streams = {}  # 요청 ID -> chunk 를 받는 큐 (stream 요청)
+        self.request_ids = itertools.count(1)
+        self.catalog_version = None  # 마지막으로 받은 이벤트 목록 버전
+        self.catalog_text = None
 
     async def connect(self):
         if self.writer is not None:
@@ -27,43 +33,111 @@ class EventClient:
     async def send(self, data):
         """서버로 요청 전송"""
         try:
-            self.writer.write(data.encode('utf-8'))
+            self.writer.write(encode_frame(data))
             await self.writer.drain()
         except Exception as e:
             print(f"메시지 전송 중 오류 발생: {e}")
 
     async def receive(self):
         """서버로부터 메시지 수신 (중앙 루프)"""
+        decoder = FrameDecoder()
         try:
             while True:
-                data = await self.reader.read(1024)
+                data = await self.reader.read(65536)
                 if not data:
                     print("\n서버 연결이 끊어졌습니다.")
+                    self.fail_pending(ConnectionError("서버 연결이 끊어졌습니다."))
                     break
-                msg = data.decode('utf-8')
-                # 명령 응답(response:)과 알림(notify:) 구분
-                if msg.startswith("response:"):
-                    # response: 이후 내용만 queue에 넣음
-                    await self.queue.put(msg[len("response:"):].strip())
-                elif msg.startswith("notify:"):
-                    # notify: 이후 내용은 별도 처리(알림 출력용)
-                    # 알림 출력용 큐나 별도 처리를 위한 구조 필요
-                    # 여기서는 간단히 알림을 바로 출력 (prompt_toolkit 상태에서는 print 사용 주의)
-                    print(f"[서버 알림]: {msg[len('notify:'):].strip()}")
-                else:
-                    # 구분자가 없으면 일단 응답으로 처리
-                    await self.queue.put(msg.strip())
+                # 한 번의 read 에 여러 메시지가 붙어 오거나 하나가 나뉘어 올 수 있음
+                for msg in decoder.feed(data):
+                    await self.dispatch(msg)
         except Exception as e:
             print(f"메시지 수신 중 오류 발생: {e}")
+            self.fail_pending(e)
+
+    async def dispatch(self, msg):
+        """수신한 메시지 하나를 응답/알림으로 구분해서 처리"""
+        request_id, msg = split_request_id(msg)
+        # 명령 응답(response:)과 알림(notify:) 구분
+        if msg.startswith("notify:"):
+            self.on_notify(msg[len('notify:'):].strip())
+            return
+        if msg.startswith("chunk:"):
+            queue = self.streams.get(request_id)
+            if queue is not None:
+                queue.put_nowait(msg[len("chunk:"):])
+            return
+        if msg.startswith("response:"):
+            msg = msg[len("response:"):]
+        # 응답은 요청 ID 로 기다리던 요청을 찾아서 전달 (순서와 무관)
+        future = self.pending.pop(request_id, None)
+        if future is None:
+            print(f"요청 ID를 알 수 없는 응답: {msg.strip()}")
+        elif not future.done():
+            future.set_result(msg.strip())
 
-    async def get_response(self):
-        """큐에서 서버 응답 가져오기"""
+    def on_notify(self, message):
+        """서버 알림 처리 (prompt_toolkit 상태에서는 print 사용 주의)"""
+        print(f"[서버 알림]: {message}")
+
+    async def request(self, command):
+        """요청 ID 를 붙여 명령을 보내고 해당 응답을 기다림 (여러 요청을 동시에 보낼 수 있음)"""
+        request_id = str(next(self.request_ids))
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
         try:
-            response = await self.queue.get()  # 큐에서 데이터 가져오기
-            return response
-        except Exception as e:
-            print(f"응답 처리 중 오류 발생: {e}")
-            
+            self.writer.write(encode_frame(attach_request_id(request_id, command)))
+            await self.writer.drain()
+            return await future
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def request_stream(self, command):
+        """stream 명령을 보내고 chunk 를 받는 대로 하나씩 내보냄 (마지막 응답이 오면 끝)"""
+        request_id = str(next(self.request_ids))
+        future = asyncio.get_running_loop().create_future()
+        queue = asyncio.Queue()
+        self.pending[request_id] = future
+        self.streams[request_id] = queue
+        try:
+            self.writer.write(encode_frame(attach_request_id(request_id, command)))
+            await self.writer.drain()
+            while True:
+                chunk = asyncio.ensure_future(queue.get())
+                await asyncio.wait({chunk, future}, return_when=asyncio.FIRST_COMPLETED)
+                if not chunk.done():
+                    chunk.cancel()
+                    break
+                yield chunk.result()
+            # 응답보다 먼저 도착한 chunk 가 큐에 남아 있을 수 있음
+            while not queue.empty():
+                yield queue.get_nowait()
+            response = future.result()
+            if not response.startswith("end:"):
+                yield response  # 스트림 대신 온 오류 메시지
+        finally:
+            self.pending.pop(request_id, None)
+            self.streams.pop(request_id, None)
+
+    async def fetch_events(self):
+        """이벤트 목록 조회 (가지고 있는 목록이 최신이면 서버는 목록 대신 not modified 만 보냄)"""
+        response = await self.request(f"view_events {self.catalog_version or 0}")
+        if response.startswith("not modified:"):
+            return self.catalog_text
+        if response.startswith("version:"):
+            header, _, body = response.partition("\n")
+            self.catalog_version = header[len("version:"):]
+            self.catalog_text = body
+            return body
+        return response
+
+    def fail_pending(self, exc):
+        """연결이 끊기면 응답을 기다리던 요청을 모두 실패 처리"""
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
     async def close(self):
         """연결 종료"""
         if self.writer:
@@ -75,6 +149,7 @@ class EventClient:
 class ViewClient(EventClient):
     def __init__(self):
         super().__init__()
+        self.session = PromptSession()  # 터미널 입력은 대화형 클라이언트에서만 사용
 
     async def register(self):
         """회원가입 요청 처리"""
@@ -102,8 +177,7 @@ class ViewClient(EventClient):
 
                 # 비밀번호가 정상적으로 입력되었을 때만 서버로 요청
                 command = f"register {name} {password}"
-                await self.send(command)
-                response = await self.get_response()  # 큐에서 응답 가져오기
+                response = await self.request(command)
 
                 if "already exists" in response:
                     print("이미 회원가입하셨습니다.")  # 이미 회원가입된 경우 처리
@@ -138,13 +212,14 @@ class ViewClient(EventClient):
                     break  # 비밀번호 입력 창에서 '0'을 누르면 아이디 입력 창으로 돌아감
                 
                 command = f"login {userid} {password}"
-                await self.send(command)
-                response = await self.get_response()  # 큐에서 응답 가져오기
+                response = await self.request(command)
                 
-                if response == "로그인 실패":
+                if response == "로그인 실패" or response.startswith("Error"):
                     print(response)
                 else:
-                    self.login_user = response
+                    # 응답: "사용자 세션토큰" (토큰이 없으면 사용자 ID 로 요청)
+                    self.login_user, _, token = response.partition(" ")
+                    self.session_token = token or None
                     print("로그인 성공")
                     break
             if self.login_user:  # 로그인 성공 시 빠져나옴
@@ -155,54 +230,71 @@ class ViewClient(EventClient):
         if not self.login_user:
             print("로그인 중이 아닌데")
             return
-        command = f"logout {self.login_user}"
-        await self.send(command)
-        response = await self.get_response()  # 큐에서 응답 가져오기
+        command = f"logout {self.credential()}"
+        response = await self.request(command)
         if response:
             print(response)
             self.login_user = None  # 클라이언트 상태 업데이트
+            self.session_token = None
             
-    async def view_events(self):
-        """이벤트 목록 조회"""
-        command = "view_events"
-        await self.send(command)
-        response = await self.get_response()  # 큐에서 응답 가져오기
+    def credential(self):
+        """명령에 보낼 사용자 (세션 토큰이 있으면 @토큰)"""
+        return f"@{self.session_token}" if self.session_token else self.login_user
+
+    async def check_waitlist_position(self):
+        """대기 순번 조회"""
+        event_id = (await self.session.prompt_async("대기 중인 이벤트 ID 입력: ")).strip()
+        if not event_id:
+            print("이벤트 ID는 비워둘 수 없습니다.")
+            return
+        response = await self.request(f"waitlist_position {self.credential()} {event_id}")
         print(response)
-        await self.session.prompt_async("메뉴로 돌아가려면 [Enter]")
-        
+
     async def view_seat_availability(self):
         """이벤트 좌석 현황 조회"""
         event_id = await self.session.prompt_async("event_id 입력: ")
         event_id = event_id.strip()
         command = f"view_seat {event_id}"
-        await self.send(command)
-        response = await self.get_response()  # 큐에서 응답 가져오기
+        response = await self.request(command)
         print(response)
         
     async def check_reservation_status(self):
         """예약 현황 조회"""
-        command = f"check_reservation_status {self.login_user}"
-        await self.send(command)
-        response = await self.get_response()  # 큐에서 응답 가져오기
+        command = f"check_reservation_status {self.credential()}"
+        response = await self.request(command)
         print(response)      
           
     async def view_events(self):
-        """이벤트 목록 조회"""
-        command = "view_events"
-        await self.send(command)
-        response = await self.get_response()  # 큐에서 응답 가져오기
-        print(response)  # 서버에서 받은 응답 출력
+        """이벤트 목록 조회 (검색 조건을 입력하면 조건에 맞는 이벤트를 페이지 단위로 조회)"""
+        conditions = (await self.session.prompt_async(
+            "검색 조건 (전체 목록은 Enter, 예: available since=2025-05-01 name=오페라): "
+        )).strip()
+        if not conditions:
+            response = await self.fetch_events()
+            print(response)  # 서버에서 받은 응답 출력
+            return
+        command = f"view_events {conditions}"
+        while True:
+            response = await self.request(command)
+            body, _, cursor = response.rpartition("\nnext:")
+            if not _:
+                print(response)
+                return
+            print(body)
+            if (await self.session.prompt_async("다음 페이지는 [Enter], 그만 보려면 q: ")).strip().lower() == "q":
+                return
+            command = f"view_events {conditions} cursor={cursor}"
 
     async def check_log(self):
-        """알림 확인"""
+        """알림 확인 (서버가 페이지 단위로 보내는 기록을 받는 대로 출력)"""
+        event_id = (await self.session.prompt_async("이벤트 ID (전체는 Enter): ")).strip()
         # 로그인한 사용자의 ID를 기반으로 알림 요청
-        command = f"check_log {self.login_user}"
-        await self.send(command)
-        
-        # 서버에서 받은 응답 처리
-        response = await self.get_response()  # 큐에서 응답 가져오기
+        command = f"check_log {self.credential()} stream"
+        if event_id:
+            command += f" event={event_id}"
         print(f"사용자 기록:\n")
-        print(response)  # 서버에서 받은 응답 출력
+        async for chunk in self.request_stream(command):
+            print(chunk)
         await self.session.prompt_async("메뉴로 돌아가려면 [Enter]")
              
     async def reserve_ticket(self):
@@ -214,8 +306,7 @@ class ViewClient(EventClient):
                 print("이벤트 ID는 비워둘 수 없습니다. 다시 입력하세요.")  # 수정됨
                 continue    
             command = f"view_seat {event_id}"
-            await self.send(command)
-            response = await self.get_response()  # 큐에서 응답 가져오기
+            response = await self.request(command)
             if response == "이벤트를 잘못 선택하셨습니다.":
                 print(response)
                 continue
@@ -226,10 +317,14 @@ class ViewClient(EventClient):
                 if not seat_number:
                     print("좌석 번호는 비워둘 수 없습니다. 다시 입력하세요.")  # 수정됨
                     continue
-                command = f"reserve_ticket {self.login_user} {event_id} {seat_number}"  # 좌석 번호를 포함한 명령어 전송
-                await self.send(command)
-                response = await self.get_response()  # 큐에서 응답 가져오기
-                if response == "티켓 예약 성공" or response == "대기자로 갔어":
+                seat_number = seat_number.replace(" ", "")
+                if "," in seat_number:
+                    # 여러 좌석은 한 번에 예약 (모두 예약되거나 하나도 예약되지 않음)
+                    command = f"reserve_tickets {self.credential()} {event_id} {seat_number}"
+                else:
+                    command = f"reserve_ticket {self.credential()} {event_id} {seat_number}"  # 좌석 번호를 포함한 명령어 전송
+                response = await self.request(command)
+                if response.endswith("예약 성공") or response.startswith(("대기자로 갔어", "이미 대기 중")):
                     check_reserve = True
                     print(response)
                     break
@@ -239,64 +334,33 @@ class ViewClient(EventClient):
                 break
 
     async def transfer_ticket(self):
-        """티켓 양도"""
+        """티켓 양도 (이벤트/좌석/받는 사용자를 한 번에 검사한 뒤 양도: 요청 2번)"""
         while True:
-            while True:
-                event_id = await self.session.prompt_async("양도할 이벤트 ID 입력: ")
-                event_id = event_id.strip()
-                if not event_id:
-                    print("이벤트 ID는 공백일 수 없습니다. 다시 입력하세요.")
-                    continue
-
-                # 서버에서 이벤트 ID 유효성 검사
-                command = f"validate_event {event_id}"
-                await self.send(command)
-                response = await self.get_response()
-                if response != "유효한 이벤트 ID입니다.":
-                    print(response)
-                    continue
-                break
-
-            while True:
-                seat_number = await self.session.prompt_async("양도할 좌석 번호 입력 (예: A1): ")
-                seat_number = seat_number.strip()
-                if not seat_number:
-                    print("좌석 번호는 공백일 수 없습니다. 다시 입력하세요.")
-                    continue
-
-                # 서버에서 좌석 번호 유효성 검사
-                command = f"validate_seat {event_id} {seat_number}"
-                await self.send(command)
-                response = await self.get_response()
-                if response != "유효한 좌석 번호입니다.":
-                    print(response)
-                    continue
-                break
+            event_id = await self.prompt_required("양도할 이벤트 ID 입력: ", "이벤트 ID는 공백일 수 없습니다. 다시 입력하세요.")
+            seat_number = await self.prompt_required("양도할 좌석 번호 입력 (예: A1): ", "좌석 번호는 공백일 수 없습니다. 다시 입력하세요.")
+            target_user_id = await self.prompt_required("양도받을 사용자 ID 입력: ", "양도받을 사용자 ID는 공백일 수 없습니다. 다시 입력하세요.")
 
-            while True:
-                target_user_id = await self.session.prompt_async("양도받을 사용자 ID 입력: ")
-                target_user_id = target_user_id.strip()
-                if not target_user_id:
-                    print("양도받을 사용자 ID는 공백일 수 없습니다. 다시 입력하세요.")
-                    continue
-
-                # 서버에서 사용자 ID 유효성 검사
-                command = f"validate_user {target_user_id}"
-                await self.send(command)
-                response = await self.get_response()
-                if response != "유효한 사용자 ID입니다.":
-                    print(response)
-                    continue
-                break
+            # 서버에서 이벤트 ID, 좌석 번호, 사용자 ID 유효성을 한 번에 검사
+            response = await self.request(f"validate event={event_id} seat={seat_number} user={target_user_id}")
+            if response != "유효합니다.":
+                print(response)
+                continue
 
-            command = f"transfer_ticket {self.login_user} {event_id} {seat_number} {target_user_id}"
-            await self.send(command)
-            response = await self.get_response()
+            command = f"transfer_ticket {self.credential()} {event_id} {seat_number} {target_user_id}"
+            response = await self.request(command)
             if response == "양도하려는 티켓이 없거나 예약하지 않았습니다":
                 print(response)
                 continue
             break
 
+    async def prompt_required(self, message, empty_message):
+        """공백이 아닌 값을 입력받을 때까지 반복"""
+        while True:
+            value = (await self.session.prompt_async(message)).strip()
+            if value:
+                return value
+            print(empty_message)
+
         
     async def cancel_reserve(self):
         """이벤트 취소"""
@@ -305,9 +369,8 @@ class ViewClient(EventClient):
             if not event_id:
                 print("이벤트 ID는 비워둘 수 없습니다. 다시 입력하세요.")  # 수정됨
                 continue
-            command = f"cancel {self.login_user} {event_id}"
-            await self.send(command)
-            response = await self.get_response()  # 큐에서 응답 가져오기
+            command = f"cancel {self.credential()} {event_id}"
+            response = await self.request(command)
             print(response)
             break
             
@@ -337,6 +400,7 @@ class ViewClient(EventClient):
         print("5. 기록 확인")  # 알림 확인 선택지
         print("6. 예약 현황 조회")
         print("7. 티켓 양도")  # 로그인 후 메뉴에 티켓 양도 추가
+        print("8. 대기 순번 조회")
         print("9. 로그아웃")  # 로그아웃 선택지
         print("0. 종료")
 
@@ -359,6 +423,7 @@ class ViewClient(EventClient):
             "5": self.check_log,  # 알림 확인 처리
             "6": self.check_reservation_status,  # 예약 현황 조회 추가
             "7": self.transfer_ticket,  # 티켓 양도
+            "8": self.check_waitlist_position,  # 대기 순번 조회
             "9": self.logout,  # 로그아웃 처리
         }
         return await self._handle_action(actions, choice)  # 선택한 액션 처리
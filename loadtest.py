@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+from client import EventClient
+from server import SocketServer
+from DB.db import initialize_database
+from Component.passwords import DEFAULT_ITERATIONS
+from Component.seat_cache import SEAT_AVAILABLE, SEAT_RESERVED
+from Component.user_service import BUSY_REPLY
+from Component.venue_layout import VenueLayout, row_label
+
+# 좌석 배치도에서 예약 가능한 좌석 번호 추출
+AVAILABLE_SEAT = re.compile(r"(\w+)\(예약 가능\)")
+# 서버 쪽 실패로 보는 응답
+ERROR_MARKERS = ("Error", "에러", "TypeError", "인증이 필요")
+
+
+def percentile(sorted_values, pct):
+    """정렬된 값에서 백분위수 (nearest-rank, loadtest/benchmark 결과 집계용)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoadStats:
+    """명령별 지연 시간, 에러, 대기자 자동 예약 알림 집계"""
+    def __init__(self):
+        self.latencies = {}   # 명령 -> [초]
+        self.errors = {}      # 명령 -> 에러 수
+        self.promotions = 0   # 대기자 자동 예약 알림 수
+        self.started = None
+        self.finished = None
+
+    def record(self, command, elapsed, error=False):
+        self.latencies.setdefault(command, []).append(elapsed)
+        if error:
+            self.errors[command] = self.errors.get(command, 0) + 1
+
+    def report(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        total = sum(len(values) for values in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        commands = {}
+        for command, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            commands[command] = {
+                "count": len(values),
+                "errors": self.errors.get(command, 0),
+                "error_rate": self.errors.get(command, 0) / len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        return {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "errors": total_errors,
+            "error_rate": total_errors / total if total else 0.0,
+            "waitlist_promotions": self.promotions,
+            "commands": commands,
+        }
+
+
+class LoadClient(EventClient):
+    """EventClient 의 연결/송수신을 그대로 쓰고, 응답 시간을 기록하는 가상 사용자"""
+    def __init__(self, host, port, stats):
+        super().__init__(host, port)
+        self.stats = stats
+
+    def on_notify(self, message):
+        if "좌석이 확보" in message:
+            self.stats.promotions += 1
+
+    async def timed(self, command):
+        """명령 전송 후 응답까지 걸린 시간 기록"""
+        name = command.split(' ', 1)[0]
+        started = time.perf_counter()
+        try:
+            response = await self.request(command)
+        except Exception:
+            self.stats.record(name, time.perf_counter() - started, error=True)
+            return None
+        error = response is None or response.startswith(ERROR_MARKERS) or "에러" in response
+        self.stats.record(name, time.perf_counter() - started, error=error)
+        return response
+
+    async def timed_retry(self, command, attempts=30, delay=0.5):
+        """서버가 바쁘다고 응답하면 (비밀번호 해시 대기열이 가득 참) 잠시 후 다시 시도"""
+        for _ in range(attempts):
+            response = await self.timed(command)
+            if response != BUSY_REPLY:
+                break
+            await asyncio.sleep(delay)
+        return response
+
+
+async def run_user(args, user_no, stats, connect_limit, usernames):
+    """가상 사용자 한 명: register -> login -> (view_seat -> reserve_ticket -> cancel/transfer) 반복"""
+    rng = random.Random(args.seed + user_no)
+    client = LoadClient(args.host, args.port, stats)
+    async with connect_limit:
+        client.reader, client.writer = await asyncio.open_connection(args.host, args.port)
+    receiver = asyncio.create_task(client.receive())
+    userid = usernames[user_no]
+    try:
+        await client.timed_retry(f"register {userid} pw{user_no}")
+        await client.timed_retry(f"login {userid} pw{user_no}")
+        for _ in range(args.iterations):
+            event_id = rng.randint(1, args.events)
+            seat_map = await client.timed(f"view_seat {event_id}")
+            seats = AVAILABLE_SEAT.findall(seat_map or "")
+            # 빈 좌석이 없으면 아무 좌석이나 시도해서 대기자 등록
+            seat = rng.choice(seats) if seats else "A1"
+            response = await client.timed(f"reserve_ticket {userid} {event_id} {seat}")
+            if response != "티켓 예약 성공":
+                continue
+            roll = rng.random()
+            if roll < args.cancel_ratio:
+                await client.timed(f"cancel {userid} {event_id}")
+            elif roll < args.cancel_ratio + args.transfer_ratio:
+                target = usernames[rng.randrange(len(usernames))]
+                await client.timed(f"transfer_ticket {userid} {event_id} {seat} {target}")
+            if args.think_time:
+                await asyncio.sleep(rng.random() * args.think_time)
+    finally:
+        client.writer.close()
+        receiver.cancel()
+
+
+def seat_layout(seat_count):
+    """좌석 수에 맞는 배치 (열당 50석)"""
+    rows = max(1, (seat_count + 49) // 50)
+    return VenueLayout.from_spec(f"전체:A-{row_label(rows - 1)}:{min(seat_count, 50)}")
+
+
+def seed_event(conn, event_id, name, seat_numbers, reserved_by=(), layout=None):
+    """이벤트 하나와 좌석 생성 (sqlite3 연결 사용), reserved_by 의 (사용자, 좌석) 은 예약된 상태로 넣음"""
+    reserved = dict((seat, user) for user, seat in reserved_by)
+    conn.execute(
+        "INSERT INTO events (id, name, description, date, available_tickets) VALUES (?, ?, ?, ?, ?)",
+        (event_id, name, "load test", "2025-01-01", len(seat_numbers) - len(reserved))
+    )
+    conn.executemany(
+        "INSERT INTO seats (event_id, seat_number, status) VALUES (?, ?, ?)",
+        [(event_id, seat, SEAT_RESERVED if seat in reserved else SEAT_AVAILABLE) for seat in seat_numbers]
+    )
+    conn.executemany(
+        "INSERT INTO reservations (user_id, event_id, event_name, seat_number) VALUES (?, ?, ?, ?)",
+        [(user, event_id, name, seat) for seat, user in reserved.items()]
+    )
+    if layout is not None:
+        conn.execute("INSERT INTO venue_layouts (event_id, layout) VALUES (?, ?)", (event_id, layout.to_json()))
+
+
+async def seed_database(db_path, events, seats_per_event):
+    """임시 DB 에 스키마를 만들고 테스트용 이벤트와 좌석 생성"""
+    await initialize_database(db_name=db_path)
+    layout = seat_layout(seats_per_event)
+    seat_numbers = layout.seat_numbers()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        for event_no in range(1, events + 1):
+            seed_event(conn, event_no, f"부하테스트{event_no}", seat_numbers, layout=layout)
+    conn.close()
+
+
+async def main(args):
+    stats = LoadStats()
+    server_task = None
+    tmp_dir = None
+    if args.spawn:
+        # 임시 DB 로 같은 프로세스에서 서버 실행
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, "loadtest.db")
+        await seed_database(db_path, args.events, args.seats)
+        server = SocketServer(host=args.host, port=args.port, db_name=db_path, storage_profile=args.profile,
+                              password_iterations=args.password_iterations)
+        server_task = asyncio.create_task(server.start())
+        await server.ready.wait()
+
+    run_id = int(time.time())
+    usernames = [f"load{run_id}_{n}" for n in range(args.users)]
+    connect_limit = asyncio.Semaphore(args.connect_concurrency)
+    stats.started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_user(args, n, stats, connect_limit, usernames) for n in range(args.users)),
+        return_exceptions=True
+    )
+    stats.finished = time.perf_counter()
+    failed_users = [r for r in results if isinstance(r, Exception)]
+
+    if server_task:
+        server_task.cancel()
+        await asyncio.gather(server_task, return_exceptions=True)
+        tmp_dir.cleanup()
+
+    report = stats.report()
+    report["users"] = args.users
+    report["failed_users"] = len(failed_users)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def print_report(report):
+    print("\n===== 부하 테스트 결과 =====")
+    print(f"사용자 {report['users']}명 (실패 {report['failed_users']}), 요청 {report['requests']}건, "
+          f"{report['elapsed_s']:.2f}초, {report['throughput_rps']:.1f} req/s")
+    print(f"에러 {report['errors']}건 ({report['error_rate']:.2%}), 대기자 자동 예약 {report['waitlist_promotions']}건")
+    print(f"{'command':<18}{'count':>8}{'err%':>8}{'p50ms':>10}{'p95ms':>10}{'p99ms':>10}{'maxms':>10}")
+    for command, c in report["commands"].items():
+        print(f"{command:<18}{c['count']:>8}{c['error_rate']:>8.2%}{c['p50_ms']:>10.2f}"
+              f"{c['p95_ms']:>10.2f}{c['p99_ms']:>10.2f}{c['max_ms']:>10.2f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="이벤트 예약 서버 부하 테스트")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--spawn", action=argparse.BooleanOptionalAction, default=True,
+                        help="임시 DB 로 서버를 직접 띄움 (--no-spawn 이면 실행 중인 서버에 접속)")
+    parser.add_argument("--profile", default=None, help="--spawn 일 때 저장소 프로필 (durable/throughput)")
+    parser.add_argument("--password-iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="--spawn 일 때 비밀번호 해시 반복 횟수 (코어가 적은 환경에서 예약 부하만 볼 때 낮춤)")
+    parser.add_argument("--users", type=int, default=1000, help="동시 사용자 수 (열린 파일 수 제한 확인)")
+    parser.add_argument("--iterations", type=int, default=5, help="사용자당 예약 시도 횟수")
+    parser.add_argument("--events", type=int, default=3)
+    parser.add_argument("--seats", type=int, default=200, help="--spawn 일 때 이벤트당 좌석 수")
+    parser.add_argument("--cancel-ratio", type=float, default=0.3)
+    parser.add_argument("--transfer-ratio", type=float, default=0.1)
+    parser.add_argument("--think-time", type=float, default=0.0, help="예약 사이 최대 대기 시간(초)")
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="동시에 여는 연결 수")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="결과를 JSON 파일로 저장")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
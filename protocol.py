@@ -0,0 +1,87 @@
+import struct
+
+# 프레임 = 4바이트 길이(big-endian) + UTF-8 본문
+HEADER = struct.Struct("!I")
+# 길이 첫 바이트가 항상 0 이 되도록 16MB 미만으로 제한 → 레거시 텍스트 명령(영문자로 시작)과 구분 가능
+MAX_FRAME_SIZE = (1 << 24) - 1
+
+
+class ProtocolError(Exception):
+    """잘못된 프레임을 받았을 때 발생"""
+
+
+def encode_frame(message):
+    """문자열 메시지를 길이 접두 프레임으로 인코딩"""
+    data = message.encode('utf-8')
+    if len(data) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"프레임이 너무 큽니다: {len(data)} bytes")
+    return HEADER.pack(len(data)) + data
+
+
+def attach_request_id(request_id, message):
+    """메시지 앞에 요청 ID 를 붙임 (예: "#12 view_seat 1")"""
+    return f"#{request_id} {message}"
+
+
+def split_request_id(message):
+    """메시지에서 요청 ID 를 분리해서 (요청 ID, 본문) 반환 (ID 가 없으면 None)"""
+    if message.startswith("#"):
+        head, _, body = message.partition(" ")
+        if len(head) > 1:
+            return head[1:], body
+    return None, message
+
+
+def is_framed(data):
+    """연결의 첫 데이터로 프레임 프로토콜 클라이언트인지 판별"""
+    return data[:1] == b"\x00"
+
+
+class FrameDecoder:
+    """스트림으로 들어오는 바이트를 완성된 메시지 단위로 잘라주는 디코더"""
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """받은 바이트를 추가하고 완성된 메시지 목록 반환 (남은 조각은 다음 feed 까지 보관)"""
+        self._buffer += data
+        messages = []
+        offset = 0
+        buffer_length = len(self._buffer)
+        while buffer_length - offset >= HEADER.size:
+            (length,) = HEADER.unpack_from(self._buffer, offset)
+            if length > self.max_frame_size:
+                raise ProtocolError(f"프레임이 너무 큽니다: {length} bytes")
+            end = offset + HEADER.size + length
+            if end > buffer_length:
+                break
+            messages.append(self._buffer[offset + HEADER.size:end].decode('utf-8'))
+            offset = end
+        if offset:
+            del self._buffer[:offset]
+        return messages
+
+
+class MessageWriter:
+    """연결 하나로 메시지를 보내는 객체 (프레임/레거시 모드에 맞게 인코딩)"""
+    def __init__(self, writer, framed=True):
+        self.writer = writer
+        self.framed = framed
+        self.user_id = None  # 이 연결로 로그인한 사용자
+
+    def write(self, message):
+        """메시지를 버퍼에 기록 (drain 은 호출하지 않음)"""
+        if self.framed:
+            self.writer.write(encode_frame(message))
+        else:
+            # 레거시 클라이언트: 예전처럼 구분자 없이 그대로 전송
+            self.writer.write(message.encode('utf-8'))
+
+    async def send(self, message):
+        """메시지 전송 후 버퍼가 비워질 때까지 대기"""
+        self.write(message)
+        await self.writer.drain()
+
+    def get_extra_info(self, name, default=None):
+        return self.writer.get_extra_info(name, default)
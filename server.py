@@ -1,161 +1,470 @@
+import argparse
 import asyncio
+import inspect
+import ipaddress
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
 from DB.db import initialize_database, AsyncDatabaseConnector
-from Component.user_service import AsyncUserService
-from Component.event_service import AsyncEventService
+from Component.user_service import LOGIN_FAILED, AsyncUserService
+from Component.event_service import WAITLIST_JOINED, AsyncEventService
+from Component.log_sink import AsyncLogSink
+from Component.metrics import UNKNOWN_COMMAND, ServerMetrics, is_error_response
+from Component.notifier import Notifier
+from Component.bus import LocalBus
+from Component.passwords import DEFAULT_ITERATIONS, PasswordHasher
+from Component.log_config import LogSampler, kv, setup_logging, shutdown_logging
+from protocol import FrameDecoder, MessageWriter, ProtocolError, attach_request_id, is_framed, split_request_id
 import logging
 
-# 로그 설정
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("server.log"),
-        logging.StreamHandler()
-    ]
-)
-class SpecificFunctionFilter(logging.Filter):
-    """특정 함수의 로그만 필터링"""
-    def __init__(self, functions):
-        super().__init__()
-        self.functions = functions
-
-    def filter(self, record):
-        # 로그 메시지에 특정 함수 이름이 포함되어 있는지 확인
-        return any(func in record.msg for func in self.functions)
-# 필터 추가
-function_filter = SpecificFunctionFilter(functions=["[handle_waitlist]", "[cancel_reservation]"])
-for handler in logging.getLogger().handlers:
-    handler.addFilter(function_filter)
+logger = logging.getLogger("server")
+# 요청마다 남기는 로그는 EVENT_LOG_SAMPLE 번에 한 번만 (DEBUG 레벨일 때)
+LOG_SAMPLE_EVERY = int(os.environ.get("EVENT_LOG_SAMPLE", "100"))
+receive_sampler = LogSampler(LOG_SAMPLE_EVERY)
+command_sampler = LogSampler(LOG_SAMPLE_EVERY)
 
 
 clients = {}
+
+# 첫 번째 인자가 요청한 사용자인 명령: 사용자 ID 대신 @세션토큰 을 받거나, 이 연결로 로그인한 사용자여야 함
+AUTH_COMMANDS = {
+    'logout', 'check_log', 'reserve_ticket', 'reserve_tickets', 'cancel', 'transfer_ticket',
+    'check_reservation_status', 'waitlist_position',
+}
+AUTH_REQUIRED = "인증이 필요합니다. 다시 로그인해 주세요."
+
+
+def format_peer(addr):
+    """peername 을 host:port 문자열로"""
+    return f"{addr[0]}:{addr[1]}" if isinstance(addr, tuple) else str(addr)
+
+
+def is_loopback_peer(connection):
+    """같은 호스트에서 접속한 연결인지 확인 (관리자 명령 제한용)"""
+    peer = connection.get_extra_info('peername')
+    if not peer:
+        return False
+    try:
+        return ipaddress.ip_address(peer[0]).is_loopback
+    except ValueError:
+        return False
+
+
 class CommandHandler:
     """명령어 처리 클래스"""
-    def __init__(self, user_service, event_service):
+    def __init__(self, user_service, event_service, metrics=None):
         self.user_service = user_service
         self.event_service = event_service
+        self.metrics = metrics or ServerMetrics()
 
         # 명령어-처리 함수 매핑
         self.command_map = {
             'register': lambda args: self.user_service.register_user(*args),
             'login': lambda args: self.user_service.login(*args),
             'logout': lambda args: self.user_service.logout(*args),
-            'view_events': lambda args: self.event_service.get_all_events(*args),  # 수정
+            'view_events': lambda args: self.event_service.view_events(*args),  # 인자 없음, 캐시된 버전 또는 검색 조건
             'check_log': lambda args: self.event_service.get_user_logs(*args), # 알람확인
             'reserve_ticket': lambda args: self.event_service.reserve_ticket(*args),
+            'reserve_tickets': lambda args: self.event_service.reserve_tickets(*args),  # 단체 예약: 좌석을 쉼표로 구분
             'cancel': lambda args: self.event_service.cancel_reservation(*args),
             'view_seat': lambda args: self.event_service.get_seat_availability(args[0]),  # 좌석 조회 추가
             'transfer_ticket': lambda args: self.event_service.transfer_ticket(*args),
             'check_reservation_status': lambda args: self.event_service.get_all_reservations_for_user(*args),  # 예약 상태 조회 수정
             'validate_event': lambda args: self.event_service.validate_event(*args),
             'validate_seat': lambda args: self.event_service.validate_seat(*args),
-            'validate_user': lambda args: self.event_service.validate_user(*args)
+            'validate_user': lambda args: self.user_service.validate_user(*args),  # 메모리의 사용자 목록으로 확인
+            'validate': lambda args: self.event_service.validate(*args),  # event=/seat=/user= 를 한 번에 검사
+            'waitlist_position': lambda args: self.event_service.get_waitlist_position(*args),
+        }
+        # 관리자 명령: 서버와 같은 호스트에서 접속한 경우에만 실행
+        self.admin_map = {
+            'metrics': lambda args: self.metrics_command(args),
+            'refresh_event': lambda args: self.event_service.refresh_event(*args),  # 관리장에서 이벤트 수정 후 호출
         }
     
-    async def handle_command(self, data, writer):
+    async def handle_command(self, data, writer, request_id=None):
+        """명령 처리 (명령별 호출 수, 에러 수, 처리 시간, 쿼리 수를 기록)"""
+        command = data.strip().split(' ', 1)[0].lower()
+        known = command in self.command_map or command in self.admin_map
+        begun = self.metrics.begin(command if known else UNKNOWN_COMMAND)
+        response = await self.dispatch(data, writer, request_id)
+        error = not known or is_error_response(response[len("response:"):])
+        elapsed = self.metrics.end(begun, error=error)
+        if logger.isEnabledFor(logging.DEBUG) and command_sampler.hit():
+            logger.debug("command", extra=kv(command=command, ms=f"{elapsed * 1000:.2f}", error=error,
+                                             user=getattr(writer, "user_id", None)))
+        return response
+
+    async def metrics_command(self, args):
+        """지표 조회: metrics [text|json|prometheus]"""
+        output = args[0] if args else "text"
+        if output == "json":
+            return self.metrics.to_json()
+        if output == "prometheus":
+            return self.metrics.to_prometheus()
+        return self.metrics.format_text()
+
+    def authenticate(self, credential, writer):
+        """요청한 사용자 확인 (@토큰 이면 세션에서 찾고, 아니면 이 연결로 로그인한 사용자와 같아야 함)"""
+        if credential.startswith("@"):
+            user_id = self.user_service.resolve_session(credential[1:])
+            if user_id is not None and getattr(writer, "user_id", None) is None:
+                self.bind(writer, user_id)  # 다시 접속한 연결에서 토큰으로 세션을 이어감
+            return user_id
+        if credential == getattr(writer, "user_id", None):
+            return credential
+        return None
+
+    def bind(self, writer, user_id):
+        """연결을 사용자에 연결 (알림을 받을 수 있게 clients 에 등록)"""
+        clients[user_id] = writer
+        writer.user_id = user_id
+
+    def login_response(self, writer, user_id, response):
+        """로그인 결과를 연결 종류에 맞는 응답으로 (성공하면 clients 에 등록)"""
+        framed = getattr(writer, "framed", False)
+        if response == LOGIN_FAILED or response.startswith("Error"):
+            # 레거시 클라이언트는 정확히 "로그인 실패" 일 때만 실패로 처리함
+            return response if framed else LOGIN_FAILED
+        self.bind(writer, user_id)
+        if not framed:
+            # 레거시 클라이언트는 응답 전체를 사용자 ID 로 저장하므로 사용자 ID 만 보냄
+            return response
+        # 프레임 연결에는 "사용자 세션토큰" 으로 응답
+        return f"{response} {self.user_service.create_session(response)}"
+
+    def legacy_reserve_response(self, response):
+        """레거시 클라이언트용 예약 응답 (예전 클라이언트는 정확히 "대기자로 갔어" 일 때만 대기 등록 성공으로 처리함)"""
+        if response.startswith((WAITLIST_JOINED, "이미 대기 중")):
+            return WAITLIST_JOINED  # 대기 순번은 waitlist_position 으로 조회
+        return response
+
+    async def stream(self, writer, request_id, chunks):
+        """async generator 가 내보내는 문자열을 chunk: 메시지로 하나씩 전송하고 마지막 응답 반환
+
+        다음 페이지는 앞 chunk 를 소켓에 넘긴 뒤에 읽으므로 느린 클라이언트에게 결과가 쌓이지 않는다.
+        """
+        if not getattr(writer, "framed", False):
+            # 레거시 연결은 메시지 경계가 없어서 여러 메시지를 구분할 수 없음
+            await chunks.aclose()
+            return "response:stream 은 프레임 연결에서만 사용할 수 있습니다."
+        sent = 0
+        try:
+            async for chunk in chunks:
+                message = f"chunk:{chunk}"
+                await writer.send(attach_request_id(request_id, message) if request_id is not None else message)
+                sent += 1
+        finally:
+            await chunks.aclose()
+        return f"response:end:{sent}"
+
+    async def dispatch(self, data, writer, request_id=None):
         try:
             commands = data.strip().split(' ')
             command = commands[0].lower()
 
+            if command in self.admin_map:
+                if not is_loopback_peer(writer):
+                    return "response:관리자 명령은 서버와 같은 호스트에서만 실행할 수 있습니다."
+                return f"response:{await self.admin_map[command](commands[1:])}"
             if command in self.command_map:
-                # view_events는 인자가 없으니 [] 전달
-                args = commands[1:] if command != 'view_events' else []
+                args = commands[1:]
+                if command in AUTH_COMMANDS and args:
+                    user_id = self.authenticate(args[0], writer)
+                    if user_id is None:
+                        return f"response:{AUTH_REQUIRED}"
+                    args[0] = user_id
                 response = await self.command_map[command](args)
+                if inspect.isasyncgen(response):
+                    return await self.stream(writer, request_id, response)
+
+                if command == "login":
+                    response = self.login_response(writer, commands[1], response)
+                elif command == "reserve_ticket" and not getattr(writer, "framed", False):
+                    response = self.legacy_reserve_response(response)
+                elif command == "logout":
+                    writer.user_id = None
 
                 # 여기서 response: 접두어를 붙여줌
-                response = f"response:{response}"
-                
-                # 로그인 성공 시 clients에 등록하는 로직도 그대로
-                if command == "login" and response != "response:로그인 실패":
-                    clients[commands[1]] = writer
-                
-                return response
+                return f"response:{response}"
             else:
                 return "response:client와 event_service 실행 함수가 달라"
         except TypeError:
             return "response:TypeError"
-        except Exception as e:
-            print(f"Unexpected error in handle_command: {e}")
+        except Exception:
+            logger.exception("handle_command 처리 중 예외", extra=kv(data=data))
             return "response:그냥 에러"
 
 class SocketServer:
     """소켓 서버 클래스"""
-    def __init__(self, host='127.0.0.1', port=5000):
+    def __init__(self, host='127.0.0.1', port=5000, storage_profile=None, max_inflight=32, db_name="event_system.db",
+                 metrics_file=None, metrics_interval=15.0, worker_id=0, workers=1, bus_dir=None,
+                 password_iterations=DEFAULT_ITERATIONS):
         self.host = host
         self.port = port
-        self.db_connector = AsyncDatabaseConnector()
-        self.user_service = AsyncUserService(self.db_connector,clients)
-        self.event_service = AsyncEventService(self.db_connector,clients)
-        self.command_handler = CommandHandler(self.user_service, self.event_service)
+        self.db_name = db_name
+        # 워커가 여러 개면 같은 포트를 SO_REUSEPORT 로 나눠 받고, 워커끼리는 bus_dir 의 Unix 소켓으로 통신
+        self.worker_id = worker_id
+        self.workers = workers
+        self.bus = LocalBus(bus_dir, worker_id, workers) if workers > 1 else None
+        self.ready = asyncio.Event()  # 접속을 받을 준비가 되면 set
+        self.max_inflight = max_inflight  # 연결 하나에서 동시에 실행할 수 있는 요청 수
+        self.storage_profile = storage_profile  # None 이면 EVENT_DB_PROFILE 환경변수 또는 "durable"
+        self.db_connector = AsyncDatabaseConnector(db_name=db_name, storage_profile=storage_profile)
+        # 감사 로그는 백그라운드 writer 가 모아서 기록
+        self.log_sink = AsyncLogSink(self.db_connector)
+        self.db_connector.log_sink = self.log_sink
+        # 알림은 연결별 큐에 넣고 연결마다 따로 전송 (느린 클라이언트가 예약 처리를 막지 않음)
+        self.notifier = Notifier(clients, bus=self.bus)
+        # 비밀번호 해시는 크기가 정해진 스레드 풀에서 (로그인이 몰려도 예약 명령이 기다리지 않음)
+        self.password_hasher = PasswordHasher(iterations=password_iterations)
+        self.user_service = AsyncUserService(self.db_connector,clients, hasher=self.password_hasher)
+        self.event_service = AsyncEventService(self.db_connector,clients, self.notifier, shared=self.bus is not None,
+                                               user_directory=self.user_service.directory)
+        if self.bus is not None:
+            # 다른 워커에 접속한 사용자에게 온 알림, 다른 워커가 바꾼 이벤트의 캐시 갱신
+            self.bus.subscribe("notify", self.notifier.deliver_local)
+            self.bus.subscribe("event_changed", self.event_service.apply_remote_change)
+            self.bus.subscribe("user_registered", self.user_service.directory.add)
+            self.user_service.on_register = lambda userid: self.bus.publish("user_registered", user_id=userid)
+            self.event_service.on_change = lambda event_id, full: self.bus.publish(
+                "event_changed", event_id=event_id, full=full
+            )
+        # 지표: 명령별 통계와 다른 컴포넌트의 상태
+        self.metrics = ServerMetrics()
+        self.metrics.add_gauges("db_pool", self.db_connector.get_pool_stats)
+        self.metrics.add_gauges("log_sink", lambda: {
+            **self.log_sink.metrics, "queued": self.log_sink.queue.qsize() if self.log_sink.queue else 0
+        })
+        self.metrics.add_gauges("event_locks", lambda: {"active": len(self.event_service.locks)})
+        self.metrics.add_gauges("notifier", self.notifier.get_stats)
+        self.metrics.add_gauges("sessions", lambda: {"logged_in": len(clients), **self.user_service.sessions.get_stats()})
+        self.metrics.add_gauges("user_directory", self.user_service.directory.get_stats)
+        self.metrics.add_gauges("passwords", self.password_hasher.get_stats)
+        if self.bus is not None:
+            self.metrics.add_gauges("bus", self.bus.get_stats)
+        # 지정하면 Prometheus 텍스트 형식으로 주기적으로 저장 (환경변수 EVENT_METRICS_FILE 로도 지정 가능)
+        self.metrics_file = metrics_file or os.environ.get("EVENT_METRICS_FILE")
+        if self.metrics_file and workers > 1:
+            self.metrics_file = f"{self.metrics_file}.{worker_id}"  # 워커마다 따로 저장
+        self.metrics_interval = metrics_interval
+        self.command_handler = CommandHandler(self.user_service, self.event_service, self.metrics)
     
+    async def process_message(self, message, connection, request_id=None):
+        """명령 하나를 처리하고 응답 전송 (요청 ID 가 있으면 응답에도 같은 ID 를 붙임)"""
+        try:
+            # 명령어 처리
+            response = await self.command_handler.handle_command(message, connection, request_id)
+        except Exception as e:
+            logger.exception("요청 처리 실패", extra=kv(peer=format_peer(connection.get_extra_info('peername'))))
+            response = f"Error: {e}"
+        if request_id is not None:
+            response = attach_request_id(request_id, response)
+        await connection.send(response)
+
     async def handle_client(self, reader, writer):
         """클라이언트 요청 처리"""
-        addr = writer.get_extra_info('peername')
-        current_user = None
-        print(f"Connected to {addr}")
+        addr = format_peer(writer.get_extra_info('peername'))
+        connection = None  # 첫 데이터를 보고 프레임/레거시 모드 결정
+        decoder = FrameDecoder()
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()  # 실행 중인 요청 ID 요청들
+        logger.info("connected", extra=kv(peer=addr))
+        self.metrics.connection_opened()
+
+        def request_done(task):
+            tasks.discard(task)
+            inflight.release()
 
         try:
             while True:
                 try:
-                    data = await reader.read(1024)
+                    data = await reader.read(65536 if connection and connection.framed else 1024)
                     if not data:  # 클라이언트 연결 종료
-                        print(f"Connection closed by client: {addr}")
+                        logger.debug("connection closed by client", extra=kv(peer=addr))
                         break
 
-                    message = data.decode('utf-8').strip()
-                    print(f"Received: {message} from {addr}")
+                    if connection is None:
+                        connection = MessageWriter(writer, framed=is_framed(data))
 
-                    # 명령어 처리
-                    response = await self.command_handler.handle_command(message,writer)
-                    writer.write(response.encode('utf-8'))
-                    await writer.drain()
-                    
-                    if message.startswith("login"):
-                        current_user = message.split(' ')[1]
+                    if connection.framed:
+                        # 한 번에 여러 메시지가 오거나 메시지가 나뉘어 올 수 있음
+                        messages = decoder.feed(data)
+                    else:
+                        # 레거시 클라이언트: read 한 번이 메시지 하나
+                        messages = [data.decode('utf-8')]
+                    if logger.isEnabledFor(logging.DEBUG) and receive_sampler.hit():
+                        logger.debug("received", extra=kv(peer=addr, messages=len(messages), bytes=len(data)))
 
+                    for message in messages:
+                        request_id, message = split_request_id(message.strip())
+                        if request_id is None:
+                            # 요청 ID 가 없으면 예전처럼 하나씩 순서대로 처리
+                            await self.process_message(message, connection)
+                            continue
+                        # 요청 ID 가 있으면 동시에 실행하고 끝나는 순서대로 응답
+                        # (max_inflight 에 도달하면 하나가 끝날 때까지 다음 메시지를 읽지 않음)
+                        await inflight.acquire()
+                        task = asyncio.create_task(self.process_message(message, connection, request_id))
+                        tasks.add(task)
+                        task.add_done_callback(request_done)
+
+                except ProtocolError as e:
+                    # 프레임이 깨지면 이후 스트림을 해석할 수 없으므로 연결 종료
+                    logger.warning("protocol error", extra=kv(peer=addr, error=e))
+                    break
                 except Exception as e:
-                    print(f"Error handling request from {addr}: {e}")
-                    writer.write(f"Error: {e}".encode('utf-8'))
-                    await writer.drain()
+                    logger.exception("요청 처리 실패", extra=kv(peer=addr))
+                    if connection:
+                        await connection.send(f"Error: {e}")
 
         except asyncio.CancelledError:
             # 클라이언트 연결 강제 종료 처리
-            print(f"Client connection cancelled: {addr}")
-        except Exception as e:
-            print(f"Unexpected error with client {addr}: {e}")
+            logger.debug("client connection cancelled", extra=kv(peer=addr))
+        except Exception:
+            logger.exception("클라이언트 처리 중 예외", extra=kv(peer=addr))
         finally:
             # 연결 종료 시 자원 정리
-            if current_user and current_user in clients:
+            for task in list(tasks):
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            current_user = connection.user_id if connection else None
+            if current_user and clients.get(current_user) is connection:
                 del clients[current_user]
-            print(f"Disconnected from {addr}")
+            if connection:
+                await self.notifier.close(connection)  # 보내지 못한 알림 정리
+            self.metrics.connection_closed()
+            logger.info("disconnected", extra=kv(peer=addr, user=current_user))
             writer.close()
             await writer.wait_closed()
 
 
     async def start(self):
         """서버 시작"""
+        metrics_task = None
         try:
-            await initialize_database()  # 데이터베이스 초기화
-            print("Database initialized")
+            if self.workers == 1:
+                # 워커가 여러 개면 launcher 가 워커를 띄우기 전에 한 번만 초기화
+                await initialize_database(db_name=self.db_name, storage_profile=self.storage_profile)  # 데이터베이스 초기화
+                logger.info("database initialized", extra=kv(db=self.db_name))
+            if self.bus is not None:
+                await self.bus.start()
+            await self.user_service.load_directory()  # 이후 회원가입/사용자 확인은 메모리에서
+            self.log_sink.start()
+            if self.metrics_file:
+                metrics_task = asyncio.create_task(
+                    self.metrics.dump_periodically(self.metrics_file, self.metrics_interval)
+                )
 
             # 서버 시작
-            server = await asyncio.start_server(self.handle_client, self.host, self.port)
-            print(f"Server started on {self.host}:{self.port}")
+            server = await asyncio.start_server(self.handle_client, self.host, self.port, reuse_port=self.workers > 1)
+            self.ready.set()
+            logger.info("server started", extra=kv(host=self.host, port=self.port, worker=self.worker_id))
 
             async with server:
                 await server.serve_forever()
         except asyncio.CancelledError:
             # asyncio.CancelledError 처리
-            print("\nServer shutting down gracefully (CancelledError).")
+            logger.info("server shutting down (cancelled)")
         except KeyboardInterrupt:
             # Ctrl+C로 서버 종료 시 처리
-            print("\nServer interrupted by user (KeyboardInterrupt). Shutting down...")
-        except Exception as e:
+            logger.info("server interrupted by user")
+        except Exception:
             # 서버 초기화 및 실행 중 발생한 예외 처리
-            print(f"Error starting server: {e}")
+            logger.exception("server error")
         finally:
-            print("Server shutting down. Goodbye!")
+            if metrics_task:
+                metrics_task.cancel()
+                self.metrics.write_prometheus(self.metrics_file)  # 종료 시점 지표 저장
+            if self.bus is not None:
+                await self.bus.close()
+            self.password_hasher.close()
+            await self.log_sink.close()  # 남은 감사 로그 기록
+            await self.db_connector.close()  # 커넥션 풀 정리
+            logger.info("server stopped")
+
+
+def interrupt_once(signum, frame):
+    """launcher 용: 첫 SIGINT/SIGTERM 은 KeyboardInterrupt 로, 워커를 정리하는 동안 들어오는 시그널은 무시"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+
+async def serve_until_signal(server):
+    """SIGINT/SIGTERM 을 받으면 서버 작업을 한 번만 취소 (Ctrl+C 와 launcher 의 terminate 가 둘 다 와도 정리는 끝까지)"""
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def stop():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: None)
+        task.cancel()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+    await server.start()
+
+
+def run_worker(options, worker_id=0, bus_dir=None):
+    """워커 프로세스 하나 실행 (워커가 하나면 예전처럼 이 프로세스에서 바로 실행)"""
+    # 워커마다 로그 파일을 따로 씀 (모듈별 레벨은 EVENT_LOG_LEVELS 환경변수로 조정)
+    setup_logging(log_file="server.log" if options.workers == 1 else f"server-{worker_id}.log")
+    try:
+        server = SocketServer(
+            options.host, options.port, storage_profile=options.profile, db_name=options.db,
+            worker_id=worker_id, workers=options.workers, bus_dir=bus_dir
+        )
+        asyncio.run(serve_until_signal(server))
+    finally:
+        shutdown_logging()
+
+
+def run_workers(options):
+    """DB 를 한 번 초기화하고 워커 프로세스 N 개를 띄움 (모두 같은 포트에서 접속을 받음)"""
+    signal.signal(signal.SIGINT, interrupt_once)
+    signal.signal(signal.SIGTERM, interrupt_once)
+    asyncio.run(initialize_database(db_name=options.db, storage_profile=options.profile))
+    bus_dir = tempfile.mkdtemp(prefix="event-bus-")
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(options, worker_id, bus_dir), name=f"worker-{worker_id}")
+        for worker_id in range(options.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()  # 10초 안에 끝나지 않은 워커는 강제 종료
+                process.join()
+        shutil.rmtree(bus_dir, ignore_errors=True)
+
 
 if __name__ == "__main__":
-    server = SocketServer()
-    asyncio.run(server.start())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="이벤트 예약 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("EVENT_WORKERS", "1")),
+                        help="같은 포트를 나눠 받을 워커 프로세스 수 (SO_REUSEPORT, 기본 1)")
+    parser.add_argument("--profile", default=None, help="저장 프로필 (기본: EVENT_DB_PROFILE 또는 durable)")
+    parser.add_argument("--db", default="event_system.db", help="DB 파일 이름 (DB 디렉터리 기준)")
+    options = parser.parse_args()
+    if options.workers > 1:
+        run_workers(options)
+    else:
+        run_worker(options)
\ No newline at end of file
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DB"))
+from DB.db import MIGRATIONS, AsyncDatabaseConnector, apply_migrations, initialize_database
+from manage import manage
+
+
+class ConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "test.db")
+        await initialize_database(self.db_path)
+        self.db_connector = AsyncDatabaseConnector(db_name=self.db_path, pool_size=2)
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def test_reuses_released_connection(self):
+        for _ in range(3):
+            async with self.db_connector.lease() as conn:
+                await conn.execute("SELECT 1")
+        stats = self.db_connector.get_pool_stats()
+        self.assertEqual(stats["opened"], 1)
+        self.assertEqual(stats["leases"], 3)
+        self.assertEqual(stats["idle"], 1)
+
+    async def test_waits_when_pool_is_full(self):
+        release = asyncio.Event()
+
+        async def hold():
+            async with self.db_connector.lease():
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(self.db_connector.execute_query("SELECT 1", fetch_one=True))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiter.done())  # 풀 크기(2)만큼 빌려간 상태라 반납될 때까지 대기
+        release.set()
+        self.assertEqual(await waiter, (1,))
+        await asyncio.gather(*holders)
+        stats = self.db_connector.get_pool_stats()
+        self.assertEqual(stats["opened"], 2)
+        self.assertEqual(stats["waits"], 1)
+
+    async def test_lease_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            async with self.db_connector.lease() as conn:
+                await conn.execute("INSERT INTO users (userid, password) VALUES ('ghost', 'x')")
+                raise RuntimeError("중간에 실패")
+        row = await self.db_connector.execute_query(
+            "SELECT COUNT(*) FROM users WHERE userid = 'ghost'", fetch_one=True
+        )
+        self.assertEqual(row, (0,))
+        self.assertEqual(self.db_connector.get_pool_stats()["open"], 1)  # 롤백한 커넥션은 버리지 않고 반납
+
+
+class TransactionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "test.db")
+        await initialize_database(self.db_path)
+        self.db_connector = AsyncDatabaseConnector(db_name=self.db_path)
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def count_users(self):
+        row = await self.db_connector.execute_query("SELECT COUNT(*) FROM users", fetch_one=True)
+        return row[0]
+
+    async def test_commits_all_statements(self):
+        async with self.db_connector.transaction() as tx:
+            inserted = await tx.execute_many(
+                "INSERT INTO users (userid, password) VALUES (?, ?)", [("a", "x"), ("b", "x")]
+            )
+        self.assertEqual(inserted, 2)
+        self.assertEqual(await self.count_users(), 2)
+
+    async def test_rolls_back_all_statements_on_error(self):
+        with self.assertRaises(RuntimeError):
+            async with self.db_connector.transaction() as tx:
+                await tx.execute_query("INSERT INTO users (userid, password) VALUES ('a', 'x')")
+                raise RuntimeError("중간에 실패")
+        self.assertEqual(await self.count_users(), 0)
+
+    async def test_database_error_propagates(self):
+        # 커넥터의 execute_query 와 달리 트랜잭션 안의 에러는 삼키지 않고 롤백되도록 그대로 전달
+        await self.db_connector.execute_query("INSERT INTO users (userid, password) VALUES ('a', 'x')")
+        with self.assertRaises(sqlite3.IntegrityError):
+            async with self.db_connector.transaction() as tx:
+                await tx.execute_query("INSERT INTO users (userid, password) VALUES ('b', 'x')")
+                await tx.execute_query("INSERT INTO users (userid, password) VALUES ('a', 'x')")
+        self.assertEqual(await self.count_users(), 1)
+
+
+class MigrationTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "test.db")
+        await initialize_database(self.db_path)
+        self.db_connector = manage(db_name=self.db_path)
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def schema_names(self, kind):
+        rows = await self.db_connector.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = ?", (kind,), fetch_all=True
+        )
+        return {name for name, in rows}
+
+    async def test_applies_every_version_once(self):
+        row = await self.db_connector.execute_query("SELECT MAX(version) FROM schema_version", fetch_one=True)
+        self.assertEqual(row, (max(version for version, _, _ in MIGRATIONS),))
+        async with self.db_connector.lease() as conn:
+            self.assertEqual(await apply_migrations(conn), [])
+
+    async def test_reapplies_after_drop_table(self):
+        # 테이블을 지우면 그 테이블의 인덱스/트리거도 사라지므로 다시 초기화할 때 복구돼야 함
+        await self.db_connector.drop_table("events")
+        self.assertNotIn("idx_events_name", await self.schema_names("index"))
+        await initialize_database(self.db_path)
+        self.assertIn("idx_events_name", await self.schema_names("index"))
+        self.assertIn("trg_events_insert_version", await self.schema_names("trigger"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DB.db import AsyncDatabaseConnector
+from Component.event_service import (
+    CHECK_LOG_USAGE, VIEW_EVENTS_USAGE, AsyncEventService, decode_cursor, encode_cursor
+)
+from loadtest import seed_database
+
+
+class CancelReservationTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, "test.db")
+        await seed_database(db_path, 1, 2)
+        self.db_connector = AsyncDatabaseConnector(db_name=db_path)
+        self.event_service = AsyncEventService(self.db_connector, {})
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def test_cancel_releases_seat(self):
+        self.assertEqual(await self.event_service.reserve_ticket("alice", "1", "A1"), "티켓 예약 성공")
+        self.assertEqual(
+            await self.event_service.cancel_reservation("alice", "1"), "Reservation canceled for user alice on event 1"
+        )
+        self.assertEqual(await self.event_service.reserve_ticket("bob", "1", "A1"), "티켓 예약 성공")
+
+    async def test_cancel_when_event_row_is_gone(self):
+        self.assertEqual(await self.event_service.reserve_ticket("alice", "1", "A1"), "티켓 예약 성공")
+        await self.db_connector.execute_query("DELETE FROM events WHERE id = 1")
+        self.assertEqual(await self.event_service.cancel_reservation("alice", "1"), "이벤트 1를 찾을 수 없습니다.")
+        # 롤백되어 예약은 그대로 남아 있음
+        row = await self.db_connector.execute_query(
+            "SELECT COUNT(*) FROM reservations WHERE user_id = 'alice'", fetch_one=True
+        )
+        self.assertEqual(row, (1,))
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip(self):
+        # 정렬 키에 구분자(|)나 한글이 들어가도 마지막 | 로 나눔
+        for key in ("2025-01-01 10:00:00", "a|b", "오페라"):
+            cursor = encode_cursor(key, 42)
+            self.assertNotIn(" ", cursor)
+            self.assertEqual(decode_cursor(cursor), (key, 42))
+
+    def test_invalid_cursor(self):
+        for cursor in ("!!!", "한글", encode_cursor("2025-01-01", "x")):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class UserLogPagingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, "test.db")
+        await seed_database(db_path, 1, 1)
+        self.db_connector = AsyncDatabaseConnector(db_name=db_path)
+        self.event_service = AsyncEventService(self.db_connector, {})
+        # 같은 시각의 로그가 페이지 경계에 걸쳐도 id 순서로 이어져야 함
+        rows = [("alice", f"로그{n}", 1 if n % 2 else 2, "2025-01-01 10:00:00") for n in range(5)]
+        rows.append(("alice", "로그5", 1, "2025-01-02 09:00:00"))
+        for row in rows:
+            await self.db_connector.execute_query(
+                "INSERT INTO logs (user_id, action, event_id, timestamp) VALUES (?, ?, ?, ?)", row
+            )
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def read_all(self, *options):
+        actions, cursor = [], None
+        while True:
+            response = await self.event_service.get_user_logs(
+                "alice", *options, *([f"cursor={cursor}"] if cursor else [])
+            )
+            body, _, cursor = response.rpartition("\nnext:")
+            if not _:
+                body = response
+            actions += [line.split("Action: ")[1].split(",")[0] for line in body.splitlines()]
+            if not _:
+                return actions
+
+    async def test_pages_follow_cursor(self):
+        self.assertEqual(await self.read_all("limit=2"), [f"로그{n}" for n in range(6)])
+
+    async def test_filters(self):
+        self.assertEqual(await self.read_all("limit=2", "event=1"), ["로그1", "로그3", "로그5"])
+        self.assertEqual(await self.read_all("since=2025-01-02"), ["로그5"])
+        self.assertEqual(await self.read_all("until=2025-01-02", "limit=10"), [f"로그{n}" for n in range(5)])
+
+    async def test_invalid_options(self):
+        for option in ("limit=0", "cursor=!!!", "since=어제", "page=2"):
+            self.assertEqual(await self.event_service.get_user_logs("alice", option), CHECK_LOG_USAGE)
+
+
+class EventQueryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, "test.db")
+        await seed_database(db_path, 0, 1)
+        self.db_connector = AsyncDatabaseConnector(db_name=db_path)
+        self.event_service = AsyncEventService(self.db_connector, {})
+        events = [
+            ("오페라 갈라", "2025-05-01", 10),
+            ("오페라 유령", "2025-05-01", 0),
+            ("오케스트라", "2025-05-03", 5),
+            ("뮤지컬", "2025-06-01", 3),
+        ]
+        for name, date, tickets in events:
+            await self.db_connector.execute_query(
+                "INSERT INTO events (name, description, date, available_tickets) VALUES (?, '', ?, ?)",
+                (name, date, tickets)
+            )
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def read_all(self, *options):
+        names, cursor = [], None
+        while True:
+            response = await self.event_service.view_events(*options, *([f"cursor={cursor}"] if cursor else []))
+            body, _, cursor = response.rpartition("\nnext:")
+            if not _:
+                body = response
+            names += [line.split("Name: ")[1].split(",")[0] for line in body.splitlines() if "Name: " in line]
+            if not _:
+                return names
+
+    async def test_pages_follow_cursor(self):
+        # 같은 날짜의 이벤트가 페이지 경계에 걸쳐도 id 순서로 이어져야 함
+        self.assertEqual(await self.read_all("limit=1"), ["오페라 갈라", "오페라 유령", "오케스트라", "뮤지컬"])
+
+    async def test_filters(self):
+        self.assertEqual(await self.read_all("name=오페라"), ["오페라 갈라", "오페라 유령"])
+        self.assertEqual(await self.read_all("name=오페라", "available"), ["오페라 갈라"])
+        self.assertEqual(await self.read_all("available", "limit=1"), ["오페라 갈라", "오케스트라", "뮤지컬"])
+        self.assertEqual(await self.read_all("since=2025-05-02", "until=2025-06-01"), ["오케스트라"])
+        self.assertEqual(await self.event_service.view_events("name=발레"), "No events available.")
+
+    async def test_invalid_options(self):
+        for option in ("limit=0", "cursor=!!!", "since=내일", "sort=name"):
+            self.assertEqual(await self.event_service.view_events(option), VIEW_EVENTS_USAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
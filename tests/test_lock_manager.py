@@ -0,0 +1,52 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.lock_manager import EventLockManager
+
+
+class EventLockManagerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_unused_lock_is_removed(self):
+        locks = EventLockManager()
+        async with locks.hold("1"):
+            self.assertEqual(len(locks), 1)
+        self.assertEqual(len(locks), 0)
+
+    async def test_same_lock_for_normalized_ids(self):
+        locks = EventLockManager()
+        async with locks.hold("01"):
+            async with locks.hold(" 2 "):
+                self.assertEqual(len(locks), 2)
+        self.assertEqual(list(locks.stats), ["1", "2"])
+
+    async def test_lock_kept_while_waiting(self):
+        locks = EventLockManager()
+        order = []
+
+        async def worker(name):
+            async with locks.hold(1):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(worker("a"), worker("b"))
+        self.assertEqual(order, ["a", "b"])
+        self.assertEqual(len(locks), 0)
+        stat = locks.get_stats()["events"]["1"]
+        self.assertEqual(stat["acquired"], 2)
+        self.assertEqual(stat["contended"], 1)
+        self.assertEqual(stat["max_queue"], 1)
+
+    async def test_stats_evict_least_recently_used(self):
+        locks = EventLockManager(max_stats=2)
+        for event_id in ("1", "2", "1", "3"):
+            async with locks.hold(event_id):
+                pass
+        # "2" 가 가장 오래 안 쓰였으므로 삭제됨
+        self.assertEqual(list(locks.stats), ["1", "3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
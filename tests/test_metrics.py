@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.metrics import LATENCY_BUCKETS, Histogram, ServerMetrics, is_error_response
+
+
+class ErrorResponseTest(unittest.TestCase):
+    def test_prefixes(self):
+        self.assertTrue(is_error_response("Error: Registration failed"))
+        self.assertTrue(is_error_response("티켓 예약 최고 에러"))
+        self.assertTrue(is_error_response("인증이 필요합니다."))
+
+    def test_error_word_inside_reply(self):
+        # 이벤트 이름에 "에러" 가 들어 있어도 정상 응답
+        self.assertFalse(is_error_response("1: 에러 없는 콘서트 2024-01-01 (남은 티켓 3)"))
+        self.assertFalse(is_error_response("티켓 예약 성공"))
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantile(self):
+        histogram = Histogram()
+        for value in (0.0001, 0.002, 0.002, 0.3):
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.5), 0.0025)
+        self.assertEqual(histogram.quantile(1.0), 0.5)
+
+    def test_quantile_in_overflow_bucket(self):
+        histogram = Histogram()
+        histogram.observe(60.0)
+        self.assertEqual(histogram.quantile(0.99), LATENCY_BUCKETS[-1])
+        self.assertEqual(histogram.cumulative()[-1], (float("inf"), 1))
+
+    def test_json_is_valid_with_slow_command(self):
+        metrics = ServerMetrics()
+        metrics.end(metrics.begin("view_events"))
+        metrics.command("view_events").latency.observe(60.0)
+        # 표준 JSON 에 없는 Infinity 가 나오면 안 됨
+        json.loads(metrics.to_json(), parse_constant=lambda name: self.fail(f"{name} in JSON"))
+
+
+if __name__ == "__main__":
+    unittest.main()
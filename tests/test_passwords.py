@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DB.db import AsyncDatabaseConnector, initialize_database
+from Component.passwords import PasswordHasher, is_hashed
+from Component.user_service import LOGIN_FAILED, AsyncUserService
+
+ITERATIONS = 1000  # 테스트가 느려지지 않도록 작은 값 사용
+
+
+class PasswordHasherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hasher = PasswordHasher(max_workers=1, iterations=ITERATIONS)
+
+    async def asyncTearDown(self):
+        self.hasher.close()
+
+    async def test_hash_and_verify(self):
+        stored = await self.hasher.hash("pw")
+        self.assertTrue(is_hashed(stored))
+        self.assertEqual(await self.hasher.verify("pw", stored), (True, False))
+        self.assertEqual(await self.hasher.verify("wrong", stored), (False, False))
+
+    async def test_needs_rehash(self):
+        # 평문으로 저장된 예전 값, 반복 횟수가 바뀐 값은 다시 해시해야 함
+        self.assertEqual(await self.hasher.verify("pw", "pw"), (True, True))
+        old = await PasswordHasher(max_workers=1, iterations=ITERATIONS // 2).hash("pw")
+        self.assertEqual(await self.hasher.verify("pw", old), (True, True))
+
+    async def test_dummy_hash_never_matches(self):
+        self.assertEqual(await self.hasher.verify("", self.hasher.dummy_hash), (False, False))
+
+
+class LoginRehashTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, "test.db")
+        await initialize_database(db_path)
+        self.db_connector = AsyncDatabaseConnector(db_name=db_path)
+        # 예전 버전으로 가입해서 평문으로 저장된 사용자
+        await self.db_connector.execute_query("INSERT INTO users (userid, password) VALUES ('alice', 'pw')")
+
+    async def asyncTearDown(self):
+        self.user_service.hasher.close()
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def stored_password(self):
+        row = await self.db_connector.execute_query(
+            "SELECT password FROM users WHERE userid = 'alice'", fetch_one=True
+        )
+        return row[0]
+
+    async def test_login_rehashes_plaintext(self):
+        self.user_service = AsyncUserService(self.db_connector, {}, hasher=PasswordHasher(iterations=ITERATIONS))
+        self.assertEqual(await self.user_service.login("alice", "pw"), "alice")
+        self.assertTrue(is_hashed(await self.stored_password()))
+        self.assertEqual(self.user_service.hasher.metrics["rehashed"], 1)
+        self.assertEqual(await self.user_service.login("alice", "pw"), "alice")
+        self.assertEqual(await self.user_service.login("alice", "wrong"), LOGIN_FAILED)
+
+    async def test_busy_rehash_keeps_login(self):
+        # 대기열이 가득 차서 다시 해시하지 못해도 비밀번호는 이미 확인됐으므로 로그인 성공
+        self.user_service = AsyncUserService(
+            self.db_connector, {}, hasher=PasswordHasher(max_pending=0, iterations=ITERATIONS)
+        )
+        self.assertEqual(await self.user_service.login("alice", "pw"), "alice")
+        self.assertEqual(await self.stored_password(), "pw")
+        self.assertEqual(self.user_service.hasher.metrics["rehashed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
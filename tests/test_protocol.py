@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from protocol import FrameDecoder, ProtocolError, attach_request_id, encode_frame, is_framed, split_request_id
+
+
+class FrameDecoderTest(unittest.TestCase):
+    def test_several_frames_in_one_read(self):
+        decoder = FrameDecoder()
+        data = encode_frame("login alice pw") + encode_frame("view_seat 1")
+        self.assertEqual(decoder.feed(data), ["login alice pw", "view_seat 1"])
+
+    def test_frame_split_across_reads(self):
+        # 한글은 여러 바이트라 중간에 잘려도 프레임이 완성된 뒤에만 디코딩해야 함
+        decoder = FrameDecoder()
+        data = encode_frame("대기자로 갔어")
+        for i in range(len(data) - 1):
+            self.assertEqual(decoder.feed(data[i:i + 1]), [])
+        self.assertEqual(decoder.feed(data[-1:]), ["대기자로 갔어"])
+
+    def test_keeps_remainder_for_next_feed(self):
+        decoder = FrameDecoder()
+        data = encode_frame("first") + encode_frame("second")
+        self.assertEqual(decoder.feed(data[:-3]), ["first"])
+        self.assertEqual(decoder.feed(data[-3:]), ["second"])
+
+    def test_empty_frame(self):
+        self.assertEqual(FrameDecoder().feed(encode_frame("")), [""])
+
+    def test_rejects_oversized_frame(self):
+        decoder = FrameDecoder(max_frame_size=4)
+        with self.assertRaises(ProtocolError):
+            decoder.feed(encode_frame("too long"))
+
+    def test_framed_detection(self):
+        self.assertTrue(is_framed(encode_frame("login alice pw")))
+        self.assertFalse(is_framed(b"login alice pw"))  # 레거시 텍스트 명령
+
+
+class RequestIdTest(unittest.TestCase):
+    def test_round_trip(self):
+        message = attach_request_id("12", "reserve_ticket alice 1 A1")
+        self.assertEqual(split_request_id(message), ("12", "reserve_ticket alice 1 A1"))
+
+    def test_without_request_id(self):
+        self.assertEqual(split_request_id("view_seat 1"), (None, "view_seat 1"))
+
+    def test_bare_hash_is_not_request_id(self):
+        self.assertEqual(split_request_id("# view_seat 1"), (None, "# view_seat 1"))
+
+    def test_request_id_without_body(self):
+        self.assertEqual(split_request_id("#7"), ("7", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
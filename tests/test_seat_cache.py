@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.seat_cache import SEAT_AVAILABLE, SEAT_RESERVED, SeatBitmap, SeatMapCache
+
+
+class SeatBitmapTest(unittest.TestCase):
+    def test_round_trip(self):
+        bitmap = SeatBitmap(10)  # 바이트 경계를 넘는 좌석 수
+        for index in (0, 7, 9):
+            self.assertTrue(bitmap.reserve(index))
+        restored = SeatBitmap.from_bytes(bitmap.to_bytes())
+        self.assertEqual(restored.size, 10)
+        self.assertEqual([i for i in range(10) if restored.is_reserved(i)], [0, 7, 9])
+        self.assertEqual(restored.available(), 7)
+
+    def test_reserve_and_release_keep_count(self):
+        bitmap = SeatBitmap(3)
+        self.assertTrue(bitmap.reserve(1))
+        self.assertFalse(bitmap.reserve(1))
+        self.assertEqual(bitmap.reserved, 1)
+        self.assertTrue(bitmap.release(1))
+        self.assertFalse(bitmap.release(1))
+        self.assertEqual(bitmap.reserved, 0)
+
+    def test_rejects_invalid_data(self):
+        data = SeatBitmap(9).to_bytes()
+        with self.assertRaises(ValueError):
+            SeatBitmap.from_bytes(b"XXXX" + data[4:])  # 매직 불일치
+        with self.assertRaises(ValueError):
+            SeatBitmap.from_bytes(data[:-1])  # 좌석 수와 비트 길이 불일치
+
+    def test_from_seats(self):
+        bitmap = SeatBitmap.from_seats([("A1", SEAT_RESERVED), ("A2", SEAT_AVAILABLE), ("A3", SEAT_RESERVED)])
+        self.assertEqual([bitmap.is_reserved(i) for i in range(3)], [True, False, True])
+
+
+class SeatMapCacheTest(unittest.TestCase):
+    def test_snapshot_with_other_size_is_rebuilt(self):
+        # 좌석이 추가돼 저장된 비트맵과 좌석 수가 다르면 seats 테이블 기준으로 다시 만듦
+        seats = [("A1", SEAT_RESERVED), ("A2", SEAT_AVAILABLE), ("A3", SEAT_AVAILABLE)]
+        seat_state = SeatMapCache().put("1", seats, snapshot=SeatBitmap(2).to_bytes())
+        self.assertEqual(seat_state.bitmap.size, 3)
+        self.assertEqual(seat_state.status("A1"), SEAT_RESERVED)
+        self.assertEqual(seat_state.available(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import CommandHandler
+
+
+class LegacyResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = CommandHandler(user_service=None, event_service=None)
+
+    def test_waitlist_reply_without_position(self):
+        # 예전 클라이언트는 정확히 "대기자로 갔어" 일 때만 대기 등록 성공으로 처리함
+        self.assertEqual(self.handler.legacy_reserve_response("대기자로 갔어 (대기 순번 3)"), "대기자로 갔어")
+        self.assertEqual(self.handler.legacy_reserve_response("이미 대기 중이야 (대기 순번 1)"), "대기자로 갔어")
+
+    def test_other_replies_unchanged(self):
+        self.assertEqual(self.handler.legacy_reserve_response("티켓 예약 성공"), "티켓 예약 성공")
+        self.assertEqual(self.handler.legacy_reserve_response("A1 자리는 예약돼있어"), "A1 자리는 예약돼있어")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.session import SessionStore, UserDirectory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sessions = SessionStore(ttl=10.0, clock=self.clock)
+
+    def test_resolve_and_unknown_token(self):
+        token = self.sessions.create("alice")
+        self.assertEqual(self.sessions.resolve(token), "alice")
+        self.assertIsNone(self.sessions.resolve("없는 토큰"))
+        self.assertEqual(self.sessions.get_stats()["rejected"], 1)
+
+    def test_expires_after_ttl(self):
+        token = self.sessions.create("alice")
+        self.clock.now = 10.0
+        self.assertIsNone(self.sessions.resolve(token))
+        self.assertEqual(len(self.sessions), 0)
+        self.assertEqual(self.sessions.get_stats()["expired"], 1)
+
+    def test_resolve_extends_expiry(self):
+        old = self.sessions.create("alice")
+        self.clock.now = 5.0
+        new = self.sessions.create("bob")
+        self.clock.now = 9.0
+        self.assertEqual(self.sessions.resolve(old), "alice")  # 만료 시각이 19 로 연장
+        self.clock.now = 16.0
+        self.assertIsNone(self.sessions.resolve(new))
+        self.assertEqual(self.sessions.resolve(old), "alice")
+
+    def test_revoke_user(self):
+        first = self.sessions.create("alice")
+        second = self.sessions.create("alice")
+        other = self.sessions.create("bob")
+        self.sessions.revoke_user("alice")
+        self.assertIsNone(self.sessions.resolve(first))
+        self.assertIsNone(self.sessions.resolve(second))
+        self.assertEqual(self.sessions.resolve(other), "bob")
+
+
+class UserDirectoryTest(unittest.TestCase):
+    def test_lookup(self):
+        directory = UserDirectory(expected_users=10)
+        self.assertIsNone(directory.lookup("alice"))  # 읽기 전에는 판단할 수 없음
+        directory.load(["alice"])
+        self.assertTrue(directory.lookup("alice"))
+        self.assertFalse(directory.lookup("nobody"))
+        directory.add("bob")
+        self.assertTrue(directory.lookup("bob"))
+
+    def test_bloom_pass_without_user_is_unknown(self):
+        # 다른 워커에서 방금 가입한 경우 등: Bloom filter 는 통과했지만 집합에 없으면 DB 로 확인하도록 None
+        directory = UserDirectory(expected_users=10)
+        directory.load([])
+        directory.bloom.add("carol")
+        self.assertIsNone(directory.lookup("carol"))
+        self.assertEqual(directory.get_stats()["false_positives"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Component.seat_cache import SEAT_AVAILABLE, SEAT_RESERVED, SeatMapCache
+from Component.venue_layout import VenueLayout
+
+
+class DefaultLayoutTest(unittest.TestCase):
+    def test_same_as_old_seat_map(self):
+        # 배치 정보가 없는 이벤트는 예전 3x3 좌석 현황과 같은 방향 (번호가 줄, 영문이 칸)
+        seats = [(seat, SEAT_RESERVED if seat == "B1" else SEAT_AVAILABLE)
+                 for seat in ("A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3")]
+        self.assertEqual(
+            SeatMapCache().put("1", seats).render(),
+            "Event 1 Seat Availability:\n"
+            "A1(예약 가능) | B1(예약 불가능) | C1(예약 가능)\n"
+            "A2(예약 가능) | B2(예약 가능) | C2(예약 가능)\n"
+            "A3(예약 가능) | B3(예약 가능) | C3(예약 가능)\n"
+        )
+
+    def test_missing_seat_is_empty(self):
+        seat_state = SeatMapCache().put("1", [("A1", SEAT_AVAILABLE), ("B2", SEAT_AVAILABLE)])
+        self.assertEqual(
+            seat_state.render(),
+            "Event 1 Seat Availability:\nA1(예약 가능) | Empty\nEmpty | B2(예약 가능)\n"
+        )
+
+
+class LayoutSpecTest(unittest.TestCase):
+    def test_from_spec(self):
+        layout = VenueLayout.from_spec("1층:A-B:2;2층:AA:1")
+        self.assertEqual(layout.seat_numbers(), ["A1", "A2", "B1", "B2", "AA1"])
+        self.assertEqual(VenueLayout.from_json(layout.to_json()).sections, layout.sections)
+
+    def test_rejects_overlap(self):
+        with self.assertRaises(ValueError):
+            VenueLayout.from_spec("1층:A-B:2;2층:B:3")
+
+
+if __name__ == "__main__":
+    unittest.main()
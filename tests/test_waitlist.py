@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트의 모듈 사용 (python -m pytest / python -m unittest 로 실행되는 경우)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DB.db import AsyncDatabaseConnector
+from Component.event_service import AsyncEventService
+from Component.waitlist import EventWaitlist
+from loadtest import seed_database
+
+
+class EventWaitlistTest(unittest.TestCase):
+    def test_rows_with_numeric_user_id(self):
+        # waitlist.user_id 는 INTEGER 열이라 숫자 ID 는 int 로 읽힘
+        waitlist = EventWaitlist([(1, 123), (2, "bob")])
+        self.assertEqual(waitlist.position("123"), 1)
+        self.assertEqual(waitlist.position("bob"), 2)
+        self.assertEqual(waitlist.append("123"), 1)
+        self.assertEqual(len(waitlist), 2)
+
+
+class WaitlistReloadTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp.name, "test.db")
+        await seed_database(db_path, 1, 1)  # 좌석 1개짜리 이벤트 1개
+        self.db_connector = AsyncDatabaseConnector(db_name=db_path)
+        self.event_service = AsyncEventService(self.db_connector, {})
+
+    async def asyncTearDown(self):
+        await self.db_connector.close()
+        self.tmp.cleanup()
+
+    async def test_numeric_user_id_after_reload(self):
+        self.assertEqual(await self.event_service.reserve_ticket("alice", "1", "A1"), "티켓 예약 성공")
+        self.assertEqual(await self.event_service.reserve_ticket("123", "1", "A1"), "대기자로 갔어 (대기 순번 1)")
+        # 캐시를 버리고 waitlist 테이블에서 다시 읽어도 같은 사용자로 인식해야 함
+        self.event_service.waitlists.invalidate("1")
+        self.assertEqual(await self.event_service.reserve_ticket("123", "1", "A1"), "이미 대기 중이야 (대기 순번 1)")
+        self.event_service.waitlists.invalidate("1")
+        self.assertEqual(await self.event_service.get_waitlist_position("123", "1"), "대기 순번 1 / 전체 1")
+
+
+if __name__ == "__main__":
+    unittest.main()